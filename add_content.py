@@ -3,10 +3,38 @@
 """
 أداة سطر الأوامر لإضافة محتوى جديد لمنصة ديوان الانفراد
 CLI Tool for Adding New Content to Diwan Al-Infirad Platform
+
+بدون أوامر تعرض القائمة التفاعلية. الأوامر (للاستخدام في السكربتات):
+    python3 add_content.py import terms.csv [--dry-run] [--upsert] [--workers 4]
+    python3 add_content.py validate [articles.jsonl ...]  # بدون ملفات: المحتوى المخزن
+    python3 add_content.py rebuild [--force] [--workers 4]
+    python3 add_content.py stats [--json]
+    python3 add_content.py serve [--port 8000] [--dist]   # خادم التطوير
+    python3 add_content.py sync postgresql://user@host/diwan [--full]
+    python3 add_content.py sync sync.sql [--copy]        # ملف لـ psql -f
+
+import يقرأ ملفات CSV أو JSONL سطراً سطراً (انظر content_import): يتحقق
+من جميع السجلات أولاً ولا يكتب شيئاً إذا وُجد خطأ، ثم يحفظها على دفعات
+ويبني الصفحات المتأثرة مرة واحدة في النهاية. الأوامر تعيد 1 عند وجود أخطاء.
+
+--profile ملف: قياس زمن كل مرحلة وحجم ما كُتب (انظر content_metrics)،
+ثم كتابة تتبع JSON، أو ملف cProfile إذا انتهى الاسم بـ .prof:
+    python3 add_content.py --profile trace.json
+    python3 add_content.py --profile build.prof serve
 """
 
 from content_manager import ContentManager, CATEGORIES
+from content_import import FORMATS, detect_kind, read_records
+from content_metrics import metrics, setup_logging
+from content_storage import KINDS, STORAGE_BACKENDS
+from itertools import chain
+import argparse
+import json
 import sys
+import time
+
+# عدد أخطاء التحقق المعروضة (البقية تُعد فقط)
+SHOWN_ERRORS = 20
 
 def print_categories():
     """عرض المجالات العلمية المتاحة"""
@@ -153,6 +181,17 @@ def show_stats():
     print(f"  المقالات: {stats['articles_count']}")
     print("="*50)
 
+def rebuild_site_interactive():
+    """إعادة إنشاء جميع صفحات المحتوى"""
+    print("\n🏗️ إعادة بناء جميع الصفحات")
+    print("="*50)
+    
+    workers = input("⚙️  عدد العمليات المتوازية (اضغط Enter لاستخدام جميع الأنوية): ").strip()
+    
+    manager = ContentManager()
+    report = manager.rebuild_all(workers=int(workers) if workers else None)
+    print(f"\n🎉 تمت إعادة بناء {report['rebuilt']} صفحة في {report['seconds']:.2f} ثانية")
+
 def main():
     """القائمة الرئيسية"""
     print("\n" + "="*50)
@@ -165,7 +204,8 @@ def main():
         print("  2. إضافة مقال جديد")
         print("  3. عرض الإحصائيات")
         print("  4. عرض المجالات المتاحة")
-        print("  5. خروج")
+        print("  5. إعادة بناء جميع الصفحات")
+        print("  6. خروج")
         
         choice = input("\n👉 اختر رقم الخيار: ").strip()
         
@@ -178,14 +218,222 @@ def main():
         elif choice == '4':
             print_categories()
         elif choice == '5':
+            rebuild_site_interactive()
+        elif choice == '6':
             print("\n👋 شكراً لاستخدامك نظام إدارة المحتوى!")
             break
         else:
             print("\n❌ خيار غير صحيح. حاول مرة أخرى.")
 
+def import_sources(files, kind=None, format=None):
+    """
+    تجميع ملفات الاستيراد حسب النوع: {النوع: [(الملف، السجلات)]}
+    
+    النوع من --kind أو من أول سجل في كل ملف، ويُعاد ذلك السجل إلى بداية
+    السجلات فلا يُقرأ أي ملف أكثر من مرة.
+    """
+    sources = {}
+    for filepath in files:
+        rows = read_records(filepath, format)
+        first = next(rows, None)
+        if first is None:
+            continue
+        file_kind = kind or (detect_kind(first[1]) if isinstance(first[1], dict) else None)
+        if file_kind is None:
+            raise ValueError(f"تعذر تحديد نوع المحتوى في {filepath}: استخدم --kind")
+        sources.setdefault(file_kind, []).append((filepath, chain([first], rows)))
+    return sources
+
+def labeled_rows(files, counts):
+    """سجلات عدة ملفات مع موقع كل سجل (الملف:السطر)، مع عدها في counts"""
+    for filepath, rows in files:
+        for number, record in rows:
+            counts['rows'] += 1
+            yield f"{filepath}:{number}", record
+
+def validate_files(manager, args):
+    """التحقق من ملفات الاستيراد؛ يعيد عدد الأخطاء"""
+    errors = 0
+    for kind, files in import_sources(args.files, args.kind, args.format).items():
+        started = time.perf_counter()
+        counts = {'rows': 0}
+        # ملفات النوع الواحد تُتحقق معاً لكشف العناوين المكررة بينها
+        rows = labeled_rows(files, counts)
+        for location, message in manager.validate_records(kind, rows, upsert=args.upsert):
+            if errors < SHOWN_ERRORS:
+                print(f"   ❌ {location}: {message}")
+            errors += 1
+        elapsed = time.perf_counter() - started
+        print(f"🔎 التحقق ({kind}): {counts['rows']} سجل في {elapsed:.2f} ثانية "
+              f"({counts['rows'] / elapsed if elapsed > 0 else 0:.0f} سجل/ثانية)")
+    if errors > SHOWN_ERRORS:
+        print(f"   ... و {errors - SHOWN_ERRORS} خطأ آخر")
+    return errors
+
+def command_import(args):
+    manager = ContentManager(args.base_dir, storage=args.storage)
+    errors = validate_files(manager, args)
+    if errors:
+        print(f"❌ {errors} خطأ: لم يُستورد أي سجل")
+        return 1
+    if args.dry_run:
+        print("✅ جميع السجلات صالحة (--dry-run: لم يُكتب شيء)")
+        return 0
+    
+    started = time.perf_counter()
+    total = 0
+    for kind, files in import_sources(args.files, args.kind, args.format).items():
+        records = (record for _, rows in files for _, record in rows)
+        report = manager.import_records(kind, records, upsert=args.upsert, batch_size=args.batch_size)
+        total += report['count']
+    manager.build(workers=args.workers, publish=not args.no_publish)
+    elapsed = time.perf_counter() - started
+    print(f"🎉 تم استيراد {total} سجل في {elapsed:.2f} ثانية "
+          f"({total / elapsed if elapsed > 0 else 0:.0f} سجل/ثانية شاملاً بناء الصفحات)")
+    return 0
+
+def command_validate(args):
+    manager = ContentManager(args.base_dir, storage=args.storage)
+    if args.files:
+        errors = validate_files(manager, args)
+    else:
+        errors = 0
+        for kind, slug, message in manager.validate_content():
+            if errors < SHOWN_ERRORS:
+                print(f"   ❌ {kind}/{slug}: {message}")
+            errors += 1
+        if errors > SHOWN_ERRORS:
+            print(f"   ... و {errors - SHOWN_ERRORS} خطأ آخر")
+    print(f"❌ {errors} خطأ" if errors else "✅ لا توجد أخطاء")
+    return 1 if errors else 0
+
+def command_rebuild(args):
+    manager = ContentManager(args.base_dir, storage=args.storage)
+    if args.force:
+        manager.rebuild_all(workers=args.workers, publish=not args.no_publish)
+    else:
+        manager.build(workers=args.workers or 1, publish=not args.no_publish)
+    return 0
+
+def command_stats(args):
+    stats = ContentManager(args.base_dir, storage=args.storage).get_stats()
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+        return 0
+    print(f"📚 المجالات العلمية: {stats['categories_count']}")
+    print(f"📖 المصطلحات: {stats['terms_count']}")
+    print(f"📰 المقالات: {stats['articles_count']}")
+    for category, counts in stats['categories'].items():
+        print(f"   {CATEGORIES[category]['ar']:<10} {counts['terms']:>7} مصطلح  {counts['articles']:>7} مقال")
+    return 0
+
+def command_serve(args):
+    from dev_server import serve
+    serve(base_dir=args.base_dir, port=args.port, host=args.host, storage=args.storage, dist=args.dist)
+    return 0
+
+def command_sync(args):
+    manager = ContentManager(args.base_dir, storage=args.storage)
+    manager.sync_database(args.target, full=args.full, batch_size=args.batch_size, copy=args.copy)
+    return 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="نظام إدارة محتوى ديوان الانفراد")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="قياس المراحل وكتابة تتبع JSON (أو cProfile إذا انتهى الاسم بـ .prof)")
+    commands = parser.add_subparsers(dest='command')
+    
+    # خيارات مشتركة بين جميع الأوامر
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--storage', default='json', choices=STORAGE_BACKENDS)
+    common.add_argument('--base-dir', default='.', help="مجلد الموقع (الافتراضي: المجلد الحالي)")
+    
+    sources = argparse.ArgumentParser(add_help=False)
+    sources.add_argument('--kind', choices=KINDS, help="نوع المحتوى (الافتراضي: من حقول أول سجل)")
+    sources.add_argument('--format', choices=FORMATS, help="صيغة الملفات (الافتراضي: من الامتداد)")
+    sources.add_argument('--upsert', action='store_true', help="تحديث السجلات الموجودة بنفس العنوان")
+    
+    importer = commands.add_parser('import', parents=[common, sources],
+                                   help="استيراد مصطلحات أو مقالات من ملفات CSV أو JSONL")
+    importer.add_argument('files', nargs='+')
+    importer.add_argument('--dry-run', action='store_true', help="التحقق فقط دون كتابة أي شيء")
+    importer.add_argument('--workers', type=int, default=1, help="عدد عمليات إنشاء الصفحات")
+    importer.add_argument('--batch-size', type=int, default=1000, help="عدد السجلات المحفوظة في كل دفعة")
+    importer.add_argument('--no-publish', action='store_true', help="تخطي مرحلة النشر في dist/")
+    
+    validate = commands.add_parser('validate', parents=[common, sources],
+                                   help="التحقق من ملفات استيراد، أو من المحتوى المخزن بدون ملفات")
+    validate.add_argument('files', nargs='*')
+    
+    rebuild = commands.add_parser('rebuild', parents=[common], help="بناء الصفحات التي تغيرت (أو جميعها)")
+    rebuild.add_argument('--force', action='store_true', help="إعادة بناء جميع الصفحات")
+    rebuild.add_argument('--workers', type=int, help="عدد العمليات (الافتراضي مع --force: عدد الأنوية)")
+    rebuild.add_argument('--no-publish', action='store_true', help="تخطي مرحلة النشر في dist/")
+    
+    stats = commands.add_parser('stats', parents=[common], help="عرض إحصائيات المحتوى")
+    stats.add_argument('--json', action='store_true', help="الإحصائيات بصيغة JSON")
+    
+    serve = commands.add_parser('serve', parents=[common],
+                                help="خادم التطوير مع إعادة البناء والتحميل التلقائي")
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--dist', action='store_true', help="خدمة dist/ مع مرحلة النشر بعد كل تغيير")
+    
+    sync = commands.add_parser('sync', parents=[common],
+                               help="مزامنة المحتوى المتغير مع قاعدة بيانات الخادم الخلفي")
+    sync.add_argument('target', help="postgresql://...، sqlite:///ملف أو ملف .sql")
+    sync.add_argument('--full', action='store_true', help="إرسال جميع الصفوف وليس المتغيرة فقط")
+    sync.add_argument('--batch-size', type=int, default=1000, help="عدد الصفوف في كل دفعة")
+    sync.add_argument('--copy', action='store_true', help="مع ملف .sql: البيانات بصيغة COPY في ملف .copy")
+    return parser.parse_args(argv)
+
+COMMANDS = {
+    'import': command_import,
+    'validate': command_validate,
+    'rebuild': command_rebuild,
+    'stats': command_stats,
+    'serve': command_serve,
+    'sync': command_sync,
+}
+
+def run(args):
+    """تنفيذ الأمر؛ يعيد رمز الخروج"""
+    if args.command is None:
+        main()
+        return 0
+    return COMMANDS[args.command](args)
+
+def run_profiled(args):
+    """تشغيل الأمر مع قياس المراحل، ثم طباعة الملخص وكتابة ملف --profile"""
+    metrics.enable()
+    profiler = None
+    if args.profile.endswith('.prof'):
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        return run(args)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        else:
+            metrics.dump(args.profile)
+        print("\n⏱️ زمن المراحل:")
+        for line in metrics.summary():
+            print(line)
+        counters = metrics.counters
+        print(f"   المكتوب: {counters['files_written']} ملف ({counters['bytes_written'] / 1024:.1f} ك.ب)")
+        print(f"💾 ملف القياس: {args.profile}")
+
 if __name__ == "__main__":
+    args = parse_args()
+    setup_logging()
     try:
-        main()
+        sys.exit(run_profiled(args) if args.profile else run(args))
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
     except KeyboardInterrupt:
         print("\n\n👋 تم إيقاف البرنامج")
         sys.exit(0)
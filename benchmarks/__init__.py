@@ -0,0 +1,8 @@
+"""
+قياسات أداء منصة ديوان الانفراد
+Benchmarks for Diwan Al-Infirad Platform
+
+    python3 benchmarks/bench_scale.py      # ContentManager عند 1k و 10k و 100k سجل
+    python3 benchmarks/bench_search.py     # فهرس البحث
+    python3 benchmarks/bench_templates.py  # إنشاء الصفحات
+"""
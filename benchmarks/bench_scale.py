@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس أداء ContentManager عند أحجام كبيرة من المحتوى
+Benchmark: ContentManager at 1k, 10k and 100k terms/articles
+
+    python3 benchmarks/bench_scale.py [--sizes 1000 10000 100000] [--storage json]
+                                      [--output نتائج.json] [--compare نتائج-سابقة.json]
+
+لكل حجم يُنشأ موقع مؤقت بالصفحات المكتوبة يدوياً، ثم تُقاس المراحل:
+    bulk_import  استيراد المصطلحات والمقالات (add_terms_bulk / add_articles_bulk)
+    add_term     إضافات فردية للمصطلحات فوق المجموعة الكاملة
+    render       إعادة إنشاء جميع صفحات المصطلحات والمقالات
+    search_index بناء فهرس البحث (أول استدعاء لـ search())
+    get_stats    قراءة الإحصائيات
+
+ولكل مرحلة الزمن وأعلى ذاكرة للعملية (RSS) بعدها. النتائج تُكتب بصيغة
+JSON في benchmarks/results/<النسخة>.json، و --compare يطبع نسبة كل قياس
+إلى نتيجة سابقة.
+"""
+
+import argparse
+import contextlib
+import json
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import generate_articles, generate_terms
+from content_manager import ContentManager
+
+# الصفحات المكتوبة يدوياً التي يحدّثها ContentManager
+SITE_PAGES = ('index.html', 'categories.html', 'terms-list.html', 'articles.html', 'category-*.html')
+
+# عدد المقالات نسبة إلى المصطلحات
+ARTICLES_RATIO = 10
+# عدد الإضافات الفردية المقاسة فوق المجموعة الكاملة
+SINGLE_ADDS = 5
+
+
+def peak_rss_mb():
+    """أعلى ذاكرة استخدمتها العملية حتى الآن (ميغابايت)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS يعيدها بالبايت و Linux بالكيلوبايت
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def prepare_site(base_dir):
+    for pattern in SITE_PAGES:
+        for page in ROOT.glob(pattern):
+            shutil.copy(page, base_dir / page.name)
+    for filename in ('search-manual.json',):
+        source = ROOT / 'data' / filename
+        if source.exists():
+            (base_dir / 'data').mkdir(exist_ok=True)
+            shutil.copy(source, base_dir / 'data' / filename)
+    (base_dir / 'images').mkdir(exist_ok=True)
+
+
+class Stages:
+    """تسجيل زمن وذاكرة كل مرحلة (رسائل ContentManager لا تظهر لأن logging غير مهيأ هنا)"""
+    
+    def __init__(self):
+        self.results = {}
+    
+    @contextlib.contextmanager
+    def measure(self, name, operations=None):
+        started = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - started
+        result = {'seconds': round(seconds, 4), 'peak_rss_mb': round(peak_rss_mb(), 1)}
+        if operations:
+            result['ops_per_sec'] = round(operations / seconds, 1)
+        self.results[name] = result
+        print(f"   {name:<13} {seconds:>9.3f} ث   {result['peak_rss_mb']:>8.1f} م.ب"
+              + (f"   {result['ops_per_sec']:>10.1f} سجل/ث" if operations else ''))
+
+
+def bench(size, storage):
+    articles = max(1, size // ARTICLES_RATIO)
+    print(f"📏 {size} مصطلح و {articles} مقال (التخزين: {storage})")
+    stages = Stages()
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp)
+        prepare_site(base_dir)
+        manager = ContentManager(base_dir, storage=storage)
+        
+        with stages.measure('bulk_import', size + articles):
+            manager.add_terms_bulk(generate_terms(size))
+            manager.add_articles_bulk(generate_articles(articles))
+        
+        extra = list(generate_terms(SINGLE_ADDS, seed=1))
+        with stages.measure('add_term', SINGLE_ADDS):
+            for record in extra:
+                record['title_ar'] += ' (إضافة)'
+                manager.add_term(record)
+        
+        terms = manager.storage.load('terms')
+        records = manager.storage.load('articles')
+        with stages.measure('render', len(terms) + len(records)):
+            manager._render_records('terms', terms)
+            manager._render_records('articles', records)
+        
+        manager._search_index = None
+        with stages.measure('search_index', len(terms) + len(records)):
+            manager.search('الطاقة الشمسية')
+        
+        with stages.measure('get_stats'):
+            manager.get_stats()
+        manager.storage.close()
+    return {'size': size, 'articles': articles, 'storage': storage, 'stages': stages.results}
+
+
+def compare(results, baseline_file):
+    """طباعة نسبة كل قياس إلى النتيجة السابقة (> 1 يعني أبطأ)"""
+    baseline = json.loads(Path(baseline_file).read_text(encoding='utf-8'))
+    previous = {(run['size'], run['storage']): run for run in baseline['results']}
+    print(f"\n⚖️ مقارنة مع {baseline['revision']} (الزمن الحالي ÷ السابق):")
+    for run in results:
+        old = previous.get((run['size'], run['storage']))
+        if not old:
+            continue
+        for name, stage in run['stages'].items():
+            if name in old['stages'] and old['stages'][name]['seconds']:
+                ratio = stage['seconds'] / old['stages'][name]['seconds']
+                marker = '⚠️' if ratio > 1.2 else '  '
+                print(f"   {marker} {run['size']:>7} {name:<13} {ratio:.2f}×")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="قياس أداء ContentManager عند أحجام كبيرة")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--storage', default='json', choices=['json', 'journal', 'sqlite'])
+    parser.add_argument('--output', help="ملف النتائج (الافتراضي: benchmarks/results/<النسخة>.json)")
+    parser.add_argument('--compare', help="ملف نتائج سابق للمقارنة")
+    args = parser.parse_args()
+    
+    results = [bench(size, args.storage) for size in args.sizes]
+    report = {
+        'revision': revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    output = Path(args.output) if args.output else ROOT / 'benchmarks' / 'results' / f"{report['revision']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"💾 النتائج: {output}")
+    
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
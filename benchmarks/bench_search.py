@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس زمن بناء فهرس البحث وزمن الاستعلام
+Benchmark: SearchIndex build time and query latency at 10k and 100k documents
+
+    python3 benchmarks/bench_search.py [أحجام المجموعة...]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_manager import CATEGORIES
+from content_search import SearchIndex
+
+WORDS = (
+    'الطاقة الحركة الجاذبية الكتلة الذرة الخلية الحرارة الضوء الموجات الكهرباء '
+    'المغناطيسية التفاعل المركبات الأحماض القواعد المحلول البروتين الوراثة النبات '
+    'التمثيل الضوئي البيئة المناخ المحيطات الرياح الشمس المحركات الآلات الجسور '
+    'المواد التصميم القياس السرعة التسارع القوة الضغط الكثافة الحجم النواة الإلكترون'
+).split()
+
+QUERIES = ['الجاذبية', 'طاقة شمسية', 'التفاعل الكيميائي', 'الخلايا', 'سرعة الضوء', 'المحركات الكهربائية']
+
+
+def synthetic_term(i, rng):
+    def sentence(n):
+        return ' '.join(rng.choice(WORDS) for _ in range(n))
+    return {
+        'title_ar': f"{sentence(2)} {i}",
+        'title_en': f"Term {i}",
+        'category': rng.choice(list(CATEGORIES)),
+        'definition': sentence(25),
+        'explanation': sentence(60),
+        'examples': [{'title': sentence(3), 'content': sentence(30)} for _ in range(2)],
+        'slug': f"term-{i}",
+        'filename': f"term-{i}.html",
+    }
+
+
+def bench(size):
+    rng = random.Random(size)
+    records = [synthetic_term(i, rng) for i in range(size)]
+    
+    index = SearchIndex()
+    started = time.perf_counter()
+    for record in records:
+        index.add('terms', record)
+    build_seconds = time.perf_counter() - started
+    
+    latencies = []
+    for _ in range(5):
+        for query in QUERIES:
+            started = time.perf_counter()
+            index.search(query, limit=10)
+            latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    
+    started = time.perf_counter()
+    index.add('terms', synthetic_term(size, rng))
+    add_ms = (time.perf_counter() - started) * 1000
+    
+    print(f"{size:>7} مستند | البناء {build_seconds:.2f} ث | إضافة مستند {add_ms:.2f} مث | "
+          f"الاستعلام: الوسيط {latencies[len(latencies) // 2]:.1f} مث، "
+          f"p95 {latencies[int(len(latencies) * 0.95)]:.1f} مث")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        bench(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس سرعة إنشاء صفحات المصطلحات قبل وبعد طبقة القوالب
+Micro-benchmark: term page rendering, f-string vs precompiled templates
+
+    python3 benchmarks/bench_templates.py [عدد الصفحات]
+
+legacy_term_page نسخة من _create_term_page كما كانت قبل site_templates.py
+للمقارنة فقط.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_manager import ContentManager, CATEGORIES
+
+
+def legacy_term_page(base_dir, term_data):
+    """الطريقة السابقة: بناء الصفحة كاملة كنص f-string واحد ثم كتابته"""
+    category = CATEGORIES[term_data['category']]
+    
+    # بناء أمثلة التوضيح
+    examples_html = ""
+    for example in term_data.get('examples', []):
+        examples_html += f"""
+                        <h3 class="mt-4 mb-3">{example['title']}</h3>
+                        <p>{example['content']}</p>
+"""
+    
+    # صورة المصطلح
+    image_html = ""
+    if term_data.get('image'):
+        image_html = f"""
+                        <div class="term-image-large">
+                            <img src="images/{term_data['image']}" alt="{term_data['title_ar']}" class="img-fluid rounded">
+                        </div>
+"""
+    
+    html_content = f"""<!DOCTYPE html>
+<html lang="ar" dir="rtl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{term_data['title_ar']} - ديوان الانفراد</title>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.rtl.min.css">
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.2/css/all.min.css">
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Tajawal:wght@400;500;700;900&display=swap" rel="stylesheet">
+    <link rel="stylesheet" href="styles.css">
+</head>
+<body>
+    <!-- Header -->
+    <header class="bg-white shadow-sm sticky-top">
+        <nav class="navbar navbar-expand-lg">
+            <div class="container">
+                <a class="navbar-brand d-flex align-items-center" href="index.html">
+                    <img src="images/logos/logo_ar.PNG" alt="ديوان الانفراد" style="height: 50px;">
+                    <span class="fw-bold fs-3" style="color: #0a2351; margin-right: 120px;">ديوان الانفراد</span>
+                </a>
+                <button class="navbar-toggler" type="button" data-bs-toggle="collapse" data-bs-target="#navbarNav">
+                    <span class="navbar-toggler-icon"></span>
+                </button>
+                <div class="collapse navbar-collapse" id="navbarNav">
+                    <ul class="navbar-nav ms-auto">
+                        <li class="nav-item">
+                            <a class="nav-link" href="index.html">الرئيسية</a>
+                        </li>
+                        <li class="nav-item">
+                            <a class="nav-link" href="index.html#about">عن المنصة</a>
+                        </li>
+                        <li class="nav-item">
+                            <a class="nav-link" href="categories.html">المجالات العلمية</a>
+                        </li>
+                        <li class="nav-item">
+                            <a class="nav-link active" href="terms-list.html">المصطلحات</a>
+                        </li>
+                        <li class="nav-item">
+                            <a class="nav-link" href="articles.html">المقالات</a>
+                        </li>
+                    </ul>
+                    <div class="d-flex gap-2">
+                        <button class="btn btn-outline-primary" data-bs-toggle="modal" data-bs-target="#newsletterModal">
+                            <i class="fas fa-envelope"></i> انضم إلينا
+                        </button>
+                        <button class="btn btn-primary" data-bs-toggle="modal" data-bs-target="#knowledgeModal">
+                            <i class="fas fa-share-alt"></i> شارك معرفتك
+                        </button>
+                    </div>
+                </div>
+            </div>
+        </nav>
+    </header>
+
+    <!-- Term Header -->
+    <section class="term-page-header">
+        <div class="container">
+            <nav aria-label="breadcrumb">
+                <ol class="breadcrumb">
+                    <li class="breadcrumb-item"><a href="index.html" class="text-white">الرئيسية</a></li>
+                    <li class="breadcrumb-item"><a href="category-{term_data['category']}.html" class="text-white">{category['ar']}</a></li>
+                    <li class="breadcrumb-item active text-white-50" aria-current="page">{term_data['title_ar']}</li>
+                </ol>
+            </nav>
+            <div class="row align-items-center">
+                <div class="col-md-8">
+                    <span class="badge bg-light text-primary mb-2">{category['ar']}</span>
+                    <h1 class="term-page-title">{term_data['title_ar']}</h1>
+                </div>
+                <div class="col-md-4 text-md-end mt-3 mt-md-0">
+                    <button class="btn btn-light" onclick="copyPageLink()"><i class="fas fa-share-alt"></i> نسخ الرابط</button>
+                </div>
+            </div>
+        </div>
+    </section>
+
+    <!-- Term Content -->
+    <section class="py-5">
+        <div class="container">
+            <div class="row">
+                <div class="col-lg-8">
+                    <!-- Basic Definition -->
+                    <div class="term-section">
+                        <h2 class="term-section-title">التعريف العلمي</h2>
+                        <p>{term_data['definition']}</p>{image_html}
+                    </div>
+
+                    <!-- Detailed Explanation -->
+                    <div class="term-section">
+                        <h2 class="term-section-title">شرح مبسط</h2>
+                        <p>{term_data['explanation']}</p>
+                    </div>
+
+                    <!-- Examples and Illustrations -->
+                    <div class="term-section">
+                        <h2 class="term-section-title">أمثلة للتوضيح</h2>
+                        {examples_html}
+                    </div>
+                </div>
+
+                <div class="col-lg-4">
+                    <!-- Term Info Card -->
+                    <div class="term-section mb-4">
+                        <h3 class="term-section-title">معلومات المصطلح</h3>
+                        <table class="table">
+                            <tbody>
+                                <tr>
+                                    <th>المجال</th>
+                                    <td>{category['ar']}</td>
+                                </tr>
+                                <tr>
+                                    <th>تاريخ الإضافة</th>
+                                    <td>{term_data['date']}</td>
+                                </tr>
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </section>
+
+    <!-- Footer -->
+    <footer class="bg-dark text-white py-5">
+        <div class="container">
+            <div class="row">
+                <div class="col-md-4 mb-4">
+                    <h5 class="fw-bold mb-3">ديوان الانفراد</h5>
+                    <p>منصة علمية متخصصة في توحيد وتوثيق المصطلحات العلمية باللغة العربية</p>
+                </div>
+                <div class="col-md-4 mb-4">
+                    <h5 class="fw-bold mb-3">روابط سريعة</h5>
+                    <ul class="list-unstyled">
+                        <li><a href="index.html" class="text-white-50 text-decoration-none">الرئيسية</a></li>
+                        <li><a href="index.html#about" class="text-white-50 text-decoration-none">عن المنصة</a></li>
+                        <li><a href="categories.html" class="text-white-50 text-decoration-none">المجالات العلمية</a></li>
+                        <li><a href="terms-list.html" class="text-white-50 text-decoration-none">المصطلحات</a></li>
+                    </ul>
+                </div>
+                <div class="col-md-4 mb-4">
+                    <h5 class="fw-bold mb-3">تواصل معنا</h5>
+                    <p class="text-white-50">info@infiradeng.com</p>
+                </div>
+            </div>
+            <hr class="my-4 bg-white-50">
+            <div class="text-center">
+                <p class="mb-0">&copy; ٢٠٢٥ ديوان الانفراد. جميع الحقوق محفوظة.</p>
+            </div>
+        </div>
+    </footer>
+
+    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="script.js"></script>
+
+    <script>
+    function copyPageLink() {{
+        const url = window.location.href;
+        navigator.clipboard.writeText(url).then(function() {{
+            const btn = event.target.closest('button');
+            const originalHTML = btn.innerHTML;
+            btn.innerHTML = '<i class="fas fa-check"></i> تم النسخ!';
+            btn.classList.add('btn-success');
+            btn.classList.remove('btn-light');
+            
+            setTimeout(function() {{
+                btn.innerHTML = originalHTML;
+                btn.classList.remove('btn-success');
+                btn.classList.add('btn-light');
+            }}, 2000);
+        }}, function(err) {{
+            alert('فشل نسخ الرابط. الرجاء المحاولة مرة أخرى.');
+        }});
+    }}
+    </script>
+</body>
+</html>
+"""
+    
+    # حفظ الملف
+    filepath = base_dir / term_data['filename']
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+
+
+def sample_term(i):
+    return {
+        'title_ar': f'مصطلح تجريبي {i}',
+        'title_en': f'Sample Term {i}',
+        'category': list(CATEGORIES)[i % len(CATEGORIES)],
+        'definition': 'تعريف علمي دقيق للمصطلح يوضح معناه وحدوده واستخداماته. ' * 4,
+        'explanation': 'شرح مبسط يقرب الفكرة للقارئ غير المتخصص بأمثلة من الحياة اليومية. ' * 6,
+        'examples': [
+            {'title': f'مثال {n}', 'content': 'محتوى المثال الذي يوضح المصطلح بشكل عملي. ' * 3}
+            for n in range(3)
+        ],
+        'image': 'term-gravity.jpg',
+        'slug': f'sample-{i}',
+        'filename': f'term-sample-{i}.html',
+        'date': '٢٠٢٥/1/1',
+    }
+
+
+def measure(label, render, terms):
+    started = time.perf_counter()
+    for term in terms:
+        render(term)
+    elapsed = time.perf_counter() - started
+    rate = len(terms) / elapsed
+    print(f"{label:12} {len(terms)} صفحة في {elapsed:.3f} ثانية ({rate:,.0f} صفحة/ثانية)")
+    return rate
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    terms = [sample_term(i) for i in range(count)]
+    
+    # مجلد مستقل لكل طريقة حتى تُقاس كلتاهما على إنشاء ملفات جديدة
+    with tempfile.TemporaryDirectory() as legacy_dir, tempfile.TemporaryDirectory() as template_dir:
+        manager = ContentManager(template_dir, storage=None)
+        
+        before = measure('f-string', lambda term: legacy_term_page(Path(legacy_dir), term), terms)
+        after = measure('templates', manager._create_term_page, terms)
+    
+    print(f"التسريع: {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
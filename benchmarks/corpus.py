@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مولد مجموعة محتوى عربي اصطناعية للقياسات
+Synthetic Arabic Corpus Generator for Benchmarks
+
+ينتج مصطلحات ومقالات بصيغة add_term و add_article في جميع المجالات
+(CATEGORIES)، بعناوين فريدة ونصوص عربية من مفردات كل مجال، وأمثلة
+وأقسام بأطوال متفاوتة. الناتج حتمي لنفس البذرة (seed)، فتُقارن القياسات
+بين النسخ المختلفة على نفس المحتوى.
+
+    python3 benchmarks/corpus.py 1000 > terms.jsonl   # مصطلحات بصيغة JSONL
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_manager import CATEGORIES
+
+# مفردات كل مجال: أسماء تصلح عناوين، وكلمات تُبنى منها الجمل
+VOCABULARY = {
+    'physics': (
+        'الجاذبية الكتلة السرعة التسارع القوة الطاقة الحركة الموجة التردد الضوء الذرة النواة '
+        'الإلكترون البروتون النيوترون الزخم الضغط الكثافة الحرارة الاحتكاك المجال الشحنة الجهد التيار'
+    ),
+    'chemistry': (
+        'التفاعل المركب العنصر الحمض القاعدة المحلول التركيز الأكسدة الاختزال الرابطة الجزيء الأيون '
+        'المحفز التوازن الذوبان التبلور البلمرة التحليل الكهربائي التقطير الترسيب التعادل الملح النظير'
+    ),
+    'biology': (
+        'الخلية النواة الغشاء البروتين الإنزيم الوراثة الجين الكروموسوم التمثيل الضوئي التنفس '
+        'الانقسام الطفرة التكيف النسيج العضو الهرمون المناعة البكتيريا الفيروس الفطريات الكائن البيئة'
+    ),
+    'energy': (
+        'الطاقة الشمسية الرياح الكهرومائية الحرارية النووية الوقود البطارية التخزين الشبكة التوربين '
+        'المولد الكفاءة الانبعاثات الهيدروجين الكتلة الحيوية الألواح المحول الاستهلاك الترشيد'
+    ),
+    'engineering': (
+        'التصميم الهيكل الجسر المحرك الآلة الترس الرافعة الدائرة المقاومة المكثف الحساس المتحكم '
+        'الخرسانة الفولاذ الإنشاء القياس التحمل الإجهاد الانفعال النمذجة المحاكاة التصنيع الصيانة'
+    ),
+    'nature': (
+        'المناخ الطقس المحيط البحر النهر الصحراء الغابة الجبل البركان الزلزال التربة الصخور '
+        'المعادن التعرية الأمطار الرياح الغلاف الجوي النظام البيئي التنوع الحيوي الشعاب الأنهار الجليدية'
+    ),
+}
+
+ADJECTIVES = (
+    'الأساسي المتقدم الحديث التطبيقي النظري التجريبي الطبيعي الصناعي الكمي النسبي الحركي الساكن '
+    'الداخلي الخارجي الكلي الجزئي المتوسط الأقصى الأدنى المتغير الثابت المركب البسيط الدوري'
+).split()
+
+QUALIFIERS = (
+    'في الفضاء|في المختبر|في الطبيعة|في الصناعة|في الحياة اليومية|عند درجات الحرارة العالية|'
+    'في الأنظمة المغلقة|في المدن|في المحيطات|في الصحراء|عبر التاريخ|في المستقبل|في التعليم|'
+    'في الطب|في الزراعة|في البناء|في النقل|في الاتصالات|على المستوى الذري|على المستوى الكوني|'
+    'في الأجهزة المنزلية|في محطات التوليد|في البحث العلمي|في الوطن العربي|في المناهج الدراسية'
+).split('|')
+
+
+def _title_nouns():
+    """أسماء العناوين لكل مجال بدون تكرار بين المجالات (العناوين فريدة على مستوى الموقع)"""
+    seen = set()
+    nouns = {}
+    for category, words in VOCABULARY.items():
+        nouns[category] = [word for word in dict.fromkeys(words.split()) if word not in seen]
+        seen.update(nouns[category])
+    return nouns
+
+
+TITLE_NOUNS = _title_nouns()
+
+CONNECTORS = 'و ثم لذلك كما حيث بينما إذ أي مثل عند بسبب خلال من إلى على في عن مع'.split()
+ENGLISH = 'basic advanced modern applied theoretical experimental natural industrial quantum relative'.split()
+
+
+def unique_title(i, nouns):
+    """عنوان فريد للسجل رقم i (تركيب اسم وصفة ومقيد حسب أرقام i)"""
+    noun = nouns[i % len(nouns)]
+    i //= len(nouns)
+    adjective = ADJECTIVES[i % len(ADJECTIVES)]
+    i //= len(ADJECTIVES)
+    title = f"{noun} {adjective}"
+    if i:
+        title += f" {QUALIFIERS[i % len(QUALIFIERS)]}"
+        i //= len(QUALIFIERS)
+        if i:
+            # بعد استنفاد التراكيب (نحو 14 ألفاً في المجال الواحد)
+            title += f" ({i})"
+    return title
+
+
+def sentence(rng, words, length):
+    out = []
+    for _ in range(length):
+        out.append(rng.choice(CONNECTORS) if rng.random() < 0.2 else rng.choice(words))
+    return ' '.join(out) + '.'
+
+
+def paragraph(rng, words, sentences):
+    return ' '.join(sentence(rng, words, rng.randint(8, 18)) for _ in range(sentences))
+
+
+def _category_counters():
+    return {category: 0 for category in CATEGORIES}
+
+
+def generate_terms(count, seed=0):
+    """count مصطلحاً موزعة على جميع المجالات (generator)"""
+    rng = random.Random(f"terms-{seed}")
+    counters = _category_counters()
+    categories = list(CATEGORIES)
+    for _ in range(count):
+        category = rng.choice(categories)
+        words = VOCABULARY[category].split()
+        title = unique_title(counters[category], TITLE_NOUNS[category])
+        counters[category] += 1
+        yield {
+            'title_ar': title,
+            'title_en': f"{rng.choice(ENGLISH).title()} {CATEGORIES[category]['en']} {counters[category]}",
+            'category': category,
+            'definition': paragraph(rng, words, 2),
+            'explanation': paragraph(rng, words, rng.randint(3, 6)),
+            'examples': [{'title': sentence(rng, words, 3)[:-1], 'content': paragraph(rng, words, 2)}
+                         for _ in range(rng.randint(1, 3))],
+        }
+
+
+def generate_articles(count, seed=0):
+    """count مقالاً موزعة على جميع المجالات (generator)"""
+    rng = random.Random(f"articles-{seed}")
+    counters = _category_counters()
+    categories = list(CATEGORIES)
+    for _ in range(count):
+        category = rng.choice(categories)
+        words = VOCABULARY[category].split()
+        title = f"مقال: {unique_title(counters[category], TITLE_NOUNS[category])}"
+        counters[category] += 1
+        yield {
+            'title': title,
+            'category': category,
+            'intro': paragraph(rng, words, 3),
+            'sections': [{'title': sentence(rng, words, 4)[:-1], 'content': paragraph(rng, words, rng.randint(4, 8))}
+                         for _ in range(rng.randint(2, 5))],
+            'reading_time': rng.randint(3, 20),
+        }
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for record in generate_terms(count):
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+if __name__ == "__main__":
+    main()
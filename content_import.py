@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قراءة ملفات الاستيراد لمنصة ديوان الانفراد
+Streaming CSV/JSONL Readers for Content Import
+
+تُقرأ السجلات سطراً سطراً (generator) فلا يُحمَّل الملف كاملاً في الذاكرة
+مهما كان حجمه. يستخدمها أمر import في add_content.py.
+
+JSONL: سجل في كل سطر بنفس صيغة add_term / add_article.
+
+CSV (مثل التصدير من جداول البيانات): عمود لكل حقل، والخلايا الفارغة
+تُهمل. الأمثلة والأقسام إما عمود examples / sections بقيمة JSON، أو أعمدة
+مرقمة:
+    example_1_title, example_1_content, example_2_title, ...
+    section_1_title, section_1_content, ...
+"""
+
+import csv
+import json
+import re
+from itertools import islice
+from pathlib import Path
+
+from content_storage import TITLE_FIELDS
+
+FORMATS = ('csv', 'jsonl')
+
+# الحقول التي يحتاجها قالب صفحة كل نوع
+REQUIRED_FIELDS = {
+    'terms': ('title_ar', 'category', 'definition', 'explanation'),
+    'articles': ('title', 'category', 'intro'),
+}
+
+# الحقول المتكررة (قوائم عناصر لكل منها title و content)
+REPEATED_FIELDS = ('examples', 'sections')
+NUMBERED_COLUMN = re.compile(r'^(example|section)_(\d+)_(title|content)$')
+
+
+def detect_format(filepath):
+    """الصيغة من امتداد الملف (.csv أو .jsonl / .ndjson)"""
+    suffix = Path(filepath).suffix.lower()
+    if suffix == '.csv':
+        return 'csv'
+    if suffix in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"صيغة غير معروفة للملف {filepath}: استخدم --format csv أو jsonl")
+
+
+def detect_kind(record):
+    """نوع المحتوى من حقل العنوان في السجل (title_ar للمصطلحات، title للمقالات)"""
+    for kind, field in TITLE_FIELDS.items():
+        if field in record:
+            return kind
+    return None
+
+
+def csv_record(row):
+    """تحويل صف CSV إلى سجل: حذف الخلايا الفارغة وتجميع الأعمدة المرقمة"""
+    record = {}
+    numbered = {}
+    for column, value in row.items():
+        if column is None or value is None:
+            continue
+        column, value = column.strip(), value.strip()
+        if not value:
+            continue
+        match = NUMBERED_COLUMN.match(column)
+        if match:
+            prefix, number, part = match.groups()
+            numbered.setdefault(f"{prefix}s", {}).setdefault(int(number), {})[part] = value
+        elif column in REPEATED_FIELDS or column == 'keywords':
+            try:
+                record[column] = json.loads(value)
+            except ValueError:
+                raise ValueError(f"العمود {column}: قيمة JSON غير صالحة") from None
+        elif column == 'reading_time':
+            record[column] = int(value) if value.isdigit() else value
+        else:
+            record[column] = value
+    for field, items in numbered.items():
+        record.setdefault(field, [items[number] for number in sorted(items)])
+    return record
+
+
+def read_records(filepath, format=None):
+    """
+    سجلات ملف الاستيراد واحداً واحداً: (رقم السطر، السجل)
+
+    السطر الذي لا يمكن تحليله يُعاد مع استثنائه بدلاً من السجل، حتى
+    يستمر التحقق ويُبلَّغ عن جميع الأخطاء.
+    """
+    format = format or detect_format(filepath)
+    if format == 'jsonl':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    yield number, ValueError(f"JSON غير صالح: {e}")
+        return
+    
+    # utf-8-sig: Excel يضيف BOM في بداية ملفات CSV
+    with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            # رقم السطر الأخير للصف (الخلايا قد تمتد على عدة أسطر)
+            try:
+                yield reader.line_num, csv_record(row)
+            except ValueError as e:
+                yield reader.line_num, e
+
+
+def record_errors(kind, record, categories):
+    """أخطاء السجل قبل إضافته (حقول مفقودة، مجال غير معروف، أنواع خاطئة)"""
+    if not isinstance(record, dict):
+        return ["السجل ليس كائن JSON"]
+    errors = [f"الحقل {field} مفقود" for field in REQUIRED_FIELDS[kind]
+              if not isinstance(record.get(field), str) or not record[field].strip()]
+    category = record.get('category')
+    if category and category not in categories:
+        errors.append(f"المجال غير صحيح: {category}")
+    for field in REPEATED_FIELDS:
+        items = record.get(field)
+        if items is not None and not (isinstance(items, list) and
+                                      all(isinstance(item, dict) and 'title' in item and 'content' in item
+                                          for item in items)):
+            errors.append(f"الحقل {field} يجب أن يكون قائمة عناصر لكل منها title و content")
+    if 'reading_time' in record and not isinstance(record['reading_time'], int):
+        errors.append("الحقل reading_time يجب أن يكون عدداً صحيحاً")
+    return errors
+
+
+def batched(iterable, size):
+    """تقسيم iterable إلى قوائم بحجم size على الأكثر (دون قراءته كاملاً)"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
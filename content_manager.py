@@ -6,14 +6,46 @@ Content Management System for Diwan Al-Infirad Platform
 
 هذا السكريبت يقوم بإنشاء صفحات المصطلحات والمقالات تلقائياً
 ويحدث الإحصائيات والروابط في جميع الصفحات ذات الصلة
+
+الرسائل تُكتب عبر logging (تعرضها أدوات سطر الأوامر بـ setup_logging)، وزمن
+كل مرحلة وحجم ما كُتب يُقاس عند تفعيل content_metrics.metrics.
 """
 
 import os
+import copy
+import functools
 import json
+import logging
 import re
+import time
+import hashlib
+import heapq
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+from content_import import batched, record_errors
+from content_metrics import metrics
+from content_storage import (
+    KINDS, TITLE_FIELDS, FileLock, JsonFileCache, SlugIndex, Spool, atomic_open, create_storage, file_signature,
+    iso_date, iter_jsonl,
+)
+from site_templates import TERM_PAGE, ARTICLE_PAGE, RELATED_LINK, RELATED_SECTION
+from content_search import SearchIndex, build_search_data, merge_entries
+from content_sync import sync_content
+from site_assets import (
+    data_references, duplicate_groups, missing, reference_graph, rewrite_references, scan_assets,
+    size_of, unreferenced,
+)
+from site_images import picture_html, process_images
+from site_minify import publish, savings_by_type
+from site_related import related_content, related_links
+from site_listings import listing_entries, page_filename, sort_entries, write_listing
+from site_sitemap import FEED_SIZE, SITE_URL, STATIC_PAGES, write_feed, write_sitemap
+from site_stats import apply_change, count, empty_stats, latest_from_records, patch_stats, stat_values, strip_stats
+
+logger = logging.getLogger(__name__)
+
 # المجالات العلمية المتاحة
 CATEGORIES = {
     'physics': {'ar': 'الفيزياء', 'en': 'Physics', 'color': 'primary'},
@@ -24,32 +56,86 @@ CATEGORIES = {
     'nature': {'ar': 'الطبيعة', 'en': 'Nature', 'color': 'secondary'}
 }
 
+# رقم إصدار قوالب الصفحات: يجب زيادته عند أي تعديل على site_templates.py
+# أو _create_term_page / _create_article_page حتى يعيد build() إنشاء جميع الصفحات
+TEMPLATE_VERSION = 4
+
+# بادئة اسم الملف لكل نوع محتوى
+PAGE_PREFIXES = {'terms': 'term', 'articles': 'article'}
+
+
+def _exclusive(method):
+    """تنفيذ الدالة والقفل بين العمليات مأخوذ (دورة القراءة والتعديل والحفظ كاملة)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class ContentManager:
-    def __init__(self, base_dir='.'):
+    def __init__(self, base_dir='.', storage='json', compact_every=1000):
+        """
+        storage: نمط التخزين - 'json' (الافتراضي) أو 'journal' أو 'sqlite'
+        compact_every: عدد العمليات في السجل قبل الضغط التلقائي (نمط journal)
+        """
         self.base_dir = Path(base_dir)
-        self.terms_file = self.base_dir / 'data' / 'terms.json'
-        self.articles_file = self.base_dir / 'data' / 'articles.json'
-        self._ensure_data_dir()
-        
-    def _ensure_data_dir(self):
-        """إنشاء مجلد البيانات إذا لم يكن موجوداً"""
-        data_dir = self.base_dir / 'data'
-        data_dir.mkdir(exist_ok=True)
-        
-        if not self.terms_file.exists():
-            self._save_json(self.terms_file, [])
-        if not self.articles_file.exists():
-            self._save_json(self.articles_file, [])
+        self.data_dir = self.base_dir / 'data'
+        self.terms_file = self.data_dir / 'terms.json'
+        self.articles_file = self.data_dir / 'articles.json'
+        # نسخ محللة من ملفات JSON تُستخدم ما دام الملف لم يتغير على القرص
+        self.cache = JsonFileCache()
+        # storage=None ينشئ مديراً للعرض فقط دون تخزين (تستخدمه عمليات البناء المتوازي)
+        self.storage = None
+        if storage:
+            self.storage = create_storage(storage, self.data_dir, CATEGORIES,
+                                          compact_every=compact_every, cache=self.cache)
+        self.manifest_file = self.data_dir / 'build-manifest.json'
+        self.slug_index_file = self.data_dir / 'slug-index.json'
+        self.listing_manifest_file = self.data_dir / 'listing-manifest.json'
+        self.stats_file = self.data_dir / 'stats.json'
+        self.images_dir = self.base_dir / 'images'
+        self.image_manifest_file = self.data_dir / 'image-manifest.json'
+        self.dist_manifest_file = self.data_dir / 'dist-manifest.json'
+        self.sitemap_manifest_file = self.data_dir / 'sitemap-manifest.json'
+        # المحتوى ذو الصلة لكل سجل مع بصمة حقوله (site_related)
+        self.related_file = self.data_dir / 'related.json'
+        # العنوان المطلق للموقع المنشور في sitemap.xml و feed.xml
+        self.site_url = SITE_URL
+        self.search_data_file = self.base_dir / 'search-data.json'
+        # مدخلات بحث مكتوبة يدوياً لصفحات لا يديرها ContentManager
+        self.search_manual_file = self.data_dir / 'search-manual.json'
+        # بصمات آخر مزامنة مع كل قاعدة بيانات (content_sync)
+        self.sync_state_file = self.data_dir / 'sync-state.json'
+        # فهرس البحث يُبنى عند أول استدعاء لـ search() ثم يُحدَّث تدريجياً
+        self._search_index = None
+        # قفل الكتابة بين العمليات، والإضافات المنتظرة للحفظ المجمع
+        self.lock = FileLock(self.data_dir / '.lock')
+        self.spool = Spool(self.data_dir / 'spool')
     
     def _load_json(self, filepath):
-        """تحميل ملف JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """تحميل ملف JSON (من الذاكرة المؤقتة إن لم يتغير الملف)"""
+        return self.cache.load_json(filepath)
     
     def _save_json(self, filepath, data):
         """حفظ ملف JSON"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self.cache.save_json(filepath, data)
+    
+    def cache_stats(self):
+        """عدد مرات القراءة من الذاكرة المؤقتة (hits) ومن القرص (misses)"""
+        return self.cache.stats()
+    
+    def _find_record(self, kind, slug):
+        """البحث عن سجل بالـ slug"""
+        record = self.storage.find(kind, slug)
+        if record is None:
+            raise ValueError(f"لا يوجد محتوى بالمعرف: {slug}")
+        return record
+    
+    @_exclusive
+    def compact(self):
+        """ضغط التخزين (كتابة لقطة وتفريغ السجل في نمط journal)"""
+        self.storage.compact()
     
     def _slugify(self, text):
         """تحويل النص العربي إلى slug مناسب لاسم الملف"""
@@ -63,7 +149,233 @@ class ContentManager:
         now = datetime.now()
         return f"٢٠٢٥/{now.month}/{now.day}"
     
-    def add_term(self, term_data):
+    # ------------------------------------------------------------------
+    # فهرس slug
+    #
+    # data/slug-index.json يربط كل slug بعنوان سجله. العنوان نفسه يعني
+    # سجلاً مكرراً (خطأ، أو تحديث في نمط upsert)، وعنوان مختلف بنفس
+    # الـ slug يعني تصادماً فيُضاف رقم: slug-2، slug-3، ...
+    # ------------------------------------------------------------------
+    
+    def _load_slug_index(self):
+        """تحميل فهرس slug، أو بناؤه من التخزين إذا لم يوجد"""
+        if self.slug_index_file.exists():
+            return SlugIndex(self._load_json(self.slug_index_file))
+        return self.rebuild_slug_index()
+    
+    @metrics.timed('slug_index')
+    def _save_slug_index(self, slugs):
+        self._save_json(self.slug_index_file, slugs.entries)
+    
+    def _read_slug_index(self):
+        """
+        نسخة من فهرس slug للقراءة فقط
+        
+        لا تُكتب في data/ ولا تُعدل الذاكرة المؤقتة: إذا لم يوجد الملف يُبنى
+        الفهرس من التخزين في الذاكرة فقط.
+        """
+        if self.slug_index_file.exists():
+            return SlugIndex(dict(self._load_json(self.slug_index_file)))
+        return self._scan_slugs()
+    
+    def _scan_slugs(self):
+        """فهرس slug من المحتوى المخزن"""
+        slugs = SlugIndex()
+        for kind in KINDS:
+            for record in self.storage.load(kind):
+                if not slugs.add(kind, record['slug'], record[TITLE_FIELDS[kind]]):
+                    logger.warning("⚠️ slug مكرر في %s: %s", kind, record['slug'])
+        return slugs
+    
+    @metrics.timed('slug_index')
+    @_exclusive
+    def rebuild_slug_index(self):
+        """إعادة بناء data/slug-index.json من المحتوى المخزن"""
+        slugs = self._scan_slugs()
+        self._save_slug_index(slugs)
+        return slugs
+    
+    def _assign_slug(self, kind, title, slugs, upsert=False):
+        """
+        اختيار slug لعنوان جديد
+        
+        يعيد (slug, موجود) حيث موجود=True إذا كان العنوان مضافاً من قبل.
+        يتجنب أيضاً أسماء صفحات موجودة على القرص لا يديرها ContentManager.
+        """
+        base = self._slugify(title)
+        slug, number = base, 1
+        while True:
+            existing = slugs.get(kind, slug)
+            if existing is None:
+                if not (self.base_dir / f"{PAGE_PREFIXES[kind]}-{slug}.html").exists():
+                    slugs.add(kind, slug, title)
+                    return slug, False
+            elif existing == title:
+                if not upsert:
+                    raise ValueError(f"المحتوى «{title}» موجود مسبقاً بالمعرف: {slug}")
+                return slug, True
+            number += 1
+            slug = f"{base}-{number}"
+    
+    def _set_slug_title(self, kind, slug, title):
+        """تحديث عنوان slug بعد تعديل السجل"""
+        slugs = self._load_slug_index()
+        if slugs.get(kind, slug) != title:
+            slugs.set_title(kind, slug, title)
+            self._save_slug_index(slugs)
+    
+    def _release_slug(self, kind, slug):
+        """تحرير slug بعد حذف السجل"""
+        slugs = self._load_slug_index()
+        slugs.discard(kind, slug)
+        self._save_slug_index(slugs)
+    
+    def _prepare_term(self, term_data, slugs, date=None, upsert=False):
+        """
+        التحقق من بيانات المصطلح وإضافة slug واسم الملف والتاريخ
+        
+        يعيد (السجل، موجود). السجل الموجود مسبقاً (في نمط upsert) يحتفظ
+        بتاريخ إضافته الأصلي.
+        """
+        # التحقق من صحة البيانات
+        if term_data['category'] not in CATEGORIES:
+            raise ValueError(f"المجال غير صحيح. المجالات المتاحة: {list(CATEGORIES.keys())}")
+        
+        # إنشاء slug لاسم الملف
+        slug, exists = self._assign_slug('terms', term_data['title_ar'], slugs, upsert)
+        
+        # إضافة معلومات إضافية
+        term_data['slug'] = slug
+        term_data['filename'] = f"term-{slug}.html"
+        if not exists:
+            term_data['date'] = date or self._get_current_date()
+        return term_data, exists
+    
+    def _prepare_article(self, article_data, slugs, date=None, upsert=False):
+        """التحقق من بيانات المقال وإضافة slug واسم الملف والتاريخ (مثل _prepare_term)"""
+        # التحقق من صحة البيانات
+        if article_data['category'] not in CATEGORIES:
+            raise ValueError(f"المجال غير صحيح. المجالات المتاحة: {list(CATEGORIES.keys())}")
+        
+        # إنشاء slug لاسم الملف
+        slug, exists = self._assign_slug('articles', article_data['title'], slugs, upsert)
+        
+        # إضافة معلومات إضافية
+        article_data['slug'] = slug
+        article_data['filename'] = f"article-{slug}.html"
+        if not exists:
+            article_data['date'] = date or self._get_current_date()
+        return article_data, exists
+    
+    @metrics.timed('prepare')
+    def _prepare_bulk(self, kind, records, prepare, upsert=False, start=1, errors=None):
+        """
+        التحقق من جميع السجلات قبل كتابة أي شيء، مع تحديد رقم السجل المعطوب
+        
+        يعيد (السجلات الجديدة، السجلات الموجودة بعد دمج التعديلات، فهرس slug).
+        العنوان المكرر داخل الدفعة نفسها في نمط upsert يستبدل الظهور السابق.
+        start: رقم أول سجل في رسائل الخطأ (للدفعات المتتالية من ملف واحد).
+        errors: قاموس تُسجل فيه أخطاء السجلات {الرقم: الرسالة} مع تخطيها،
+        بدلاً من رفض الدفعة كاملة (يستخدمه الحفظ المجمع).
+        """
+        date = self._get_current_date()
+        slugs = self._load_slug_index()
+        new, changes = [], {}
+        positions = {}
+        for number, record in enumerate(records, start=start):
+            try:
+                record, exists = prepare(record, slugs, date, upsert)
+            except (KeyError, ValueError) as e:
+                message = f"الحقل {e} مفقود" if isinstance(e, KeyError) else str(e)
+                if errors is None:
+                    raise ValueError(f"السجل رقم {number}: {message}") from e
+                errors[number] = message
+                continue
+            slug = record['slug']
+            if not exists:
+                positions[slug] = len(new)
+                new.append(record)
+            elif slug in positions:
+                new[positions[slug]] = {**new[positions[slug]], **record}
+            else:
+                changes[slug] = {**changes.get(slug, {}), **record}
+        
+        updated = []
+        if changes:
+            for old in self.storage.load(kind):
+                if old['slug'] in changes:
+                    updated.append((old, {**old, **changes.pop(old['slug'])}))
+        return new, updated, slugs
+    
+    def _report_throughput(self, label, count, started):
+        """تسجيل معدل الإدخال وإرجاع ملخص العملية"""
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed > 0 else float(count)
+        logger.info("⚡ %s: %d في %.2f ثانية (%.0f سجل/ثانية)", label, count, elapsed, rate)
+        return {'count': count, 'seconds': elapsed, 'rate': rate}
+    
+    # ------------------------------------------------------------------
+    # الحفظ المجمع
+    #
+    # add_term و add_article تكتبان الإضافة تذكرةً في data/spool/ ثم
+    # تنتظران القفل. أول عملية تحصل عليه تحفظ جميع التذاكر المنتظرة (من
+    # كل المحررين) بكتابة واحدة لملف البيانات وتحديث واحد للقوائم
+    # والإحصائيات، والعمليات التالية تجد نتائجها جاهزة دون كتابة شيء.
+    # ------------------------------------------------------------------
+    
+    def _group_commit(self, kind, record):
+        """
+        حفظ إضافة واحدة مع الإضافات المنتظرة من العمليات الأخرى
+        
+        يعيد اسم ملف الصفحة ويضيف slug واسم الملف والتاريخ إلى record كما
+        في الإضافة المباشرة. خطأ السجل (عنوان مكرر، حقل مفقود) يُرفع
+        ValueError دون أن يؤثر على بقية التذاكر.
+        """
+        ticket = self.spool.submit(kind, record)
+        with self.lock:
+            if self.spool.is_pending(ticket):
+                try:
+                    self._commit_spool()
+                except BaseException:
+                    # تذاكر العمليات الأخرى تبقى لتعيد محاولتها بنفسها
+                    self.spool.cancel(ticket)
+                    raise
+        result = self.spool.take_result(ticket)
+        if 'error' in result:
+            raise ValueError(result['error'])
+        record.update(result['record'])
+        return record['filename']
+    
+    @metrics.timed('group_commit')
+    def _commit_spool(self):
+        """حفظ جميع التذاكر المنتظرة، دفعة واحدة لكل نوع (والقفل مأخوذ)"""
+        tickets = self.spool.pending()
+        results = {}
+        for kind, apply in (('terms', self._apply_terms), ('articles', self._apply_articles)):
+            group = []
+            for ticket, entry in tickets:
+                if entry['kind'] != kind:
+                    continue
+                errors = record_errors(kind, entry['record'], CATEGORIES)
+                if errors:
+                    results[ticket] = {'error': '، '.join(errors)}
+                else:
+                    group.append((ticket, entry['record']))
+            if not group:
+                continue
+            
+            prepare = self._prepare_term if kind == 'terms' else self._prepare_article
+            errors = {}
+            new, _, slugs = self._prepare_bulk(kind, [record for _, record in group], prepare, errors=errors)
+            apply(new, [], slugs)
+            for number, (ticket, record) in enumerate(group, start=1):
+                results[ticket] = {'error': errors[number]} if number in errors else {'record': record}
+        self.spool.finish(results)
+        if len(results) > 1:
+            logger.info("🧺 حفظ مجمع: %d إضافة في عملية كتابة واحدة", len(results))
+    
+    @metrics.timed('add_term')
+    def add_term(self, term_data, upsert=False):
         """
         إضافة مصطلح جديد
         
@@ -79,38 +391,24 @@ class ContentManager:
             ],
             'image': 'term-example.jpg'  # اختياري
         }
-        """
-        # التحقق من صحة البيانات
-        if term_data['category'] not in CATEGORIES:
-            raise ValueError(f"المجال غير صحيح. المجالات المتاحة: {list(CATEGORIES.keys())}")
         
-        # إنشاء slug لاسم الملف
-        slug = self._slugify(term_data['title_ar'])
-        filename = f"term-{slug}.html"
-        
-        # إضافة معلومات إضافية
-        term_data['slug'] = slug
-        term_data['filename'] = filename
-        term_data['date'] = self._get_current_date()
-        
-        # حفظ البيانات
-        terms = self._load_json(self.terms_file)
-        terms.append(term_data)
-        self._save_json(self.terms_file, terms)
-        
-        # إنشاء صفحة HTML
-        self._create_term_page(term_data)
-        
-        # تحديث الصفحات ذات الصلة
-        self._update_category_page(term_data['category'])
-        self._update_terms_list_page()
-        self._update_homepage_stats()
+        إذا كان العنوان مضافاً من قبل يُرفع ValueError، إلا مع upsert=True
+        فيُحدَّث المصطلح الموجود بدلاً من ذلك. الإضافات المتزامنة من عدة
+        عمليات تُحفظ معاً (انظر _group_commit).
+        """
+        if upsert:
+            with self.lock:
+                slug, exists = self._assign_slug('terms', term_data['title_ar'], self._load_slug_index(), upsert)
+                if exists:
+                    return self.update_term(slug, term_data)
+        filename = self._group_commit('terms', term_data)
         
-        print(f"✅ تم إضافة المصطلح: {term_data['title_ar']}")
-        print(f"📄 الملف: {filename}")
+        logger.info("✅ تم إضافة المصطلح: %s", term_data['title_ar'])
+        logger.info("📄 الملف: %s", filename)
         return filename
     
-    def add_article(self, article_data):
+    @metrics.timed('add_article')
+    def add_article(self, article_data, upsert=False):
         """
         إضافة مقال جديد
         
@@ -125,445 +423,985 @@ class ContentManager:
             'reading_time': 15,  # بالدقائق
             'image': 'article-example.jpg'  # اختياري
         }
+        
+        العنوان المكرر يرفع ValueError، إلا مع upsert=True فيُحدَّث المقال الموجود.
         """
-        # التحقق من صحة البيانات
-        if article_data['category'] not in CATEGORIES:
+        if upsert:
+            with self.lock:
+                slug, exists = self._assign_slug('articles', article_data['title'], self._load_slug_index(), upsert)
+                if exists:
+                    return self.update_article(slug, article_data)
+        filename = self._group_commit('articles', article_data)
+        
+        logger.info("✅ تم إضافة المقال: %s", article_data['title'])
+        logger.info("📄 الملف: %s", filename)
+        return filename
+    
+    def _apply_terms(self, new_terms, updated, slugs):
+        """حفظ مصطلحات محضرة بـ _prepare_bulk ثم إنشاء صفحاتها وتحديث الصفحات ذات الصلة"""
+        changed_terms = [term for _, term in updated]
+        
+        # حفظ البيانات مرة واحدة
+        with metrics.stage('storage'):
+            if new_terms:
+                self.storage.append('terms', new_terms)
+            if changed_terms:
+                self.storage.replace_many('terms', changed_terms)
+        self._save_slug_index(slugs)
+        self._index_records('terms', new_terms + changed_terms)
+        
+        # إنشاء صفحات HTML
+        images = sorted({term['image'] for term in new_terms + changed_terms if term.get('image')})
+        if images:
+            self.build_images(images)
+        for term_data in new_terms + changed_terms:
+            self._create_term_page(term_data)
+        
+        # تحديث الصفحات ذات الصلة مرة واحدة لكل مجال
+        if new_terms or changed_terms:
+            self._update_stats('terms', added=new_terms + changed_terms,
+                               removed=[old for old, _ in updated], new=new_terms)
+            categories = {term['category'] for term in new_terms}
+            for old, term in updated:
+                categories.update((old['category'], term['category']))
+            for category in sorted(categories):
+                self._update_category_page(category)
+            self._update_terms_list_page()
+            self._update_search_data()
+    
+    def _apply_articles(self, new_articles, updated, slugs):
+        """حفظ مقالات محضرة بـ _prepare_bulk ثم إنشاء صفحاتها وتحديث الصفحات ذات الصلة"""
+        changed_articles = [article for _, article in updated]
+        
+        # حفظ البيانات مرة واحدة
+        with metrics.stage('storage'):
+            if new_articles:
+                self.storage.append('articles', new_articles)
+            if changed_articles:
+                self.storage.replace_many('articles', changed_articles)
+        self._save_slug_index(slugs)
+        self._index_records('articles', new_articles + changed_articles)
+        
+        # إنشاء صفحات HTML
+        for article_data in new_articles + changed_articles:
+            self._create_article_page(article_data)
+        
+        # تحديث الصفحات ذات الصلة مرة واحدة
+        if new_articles or changed_articles:
+            self._update_stats('articles', added=new_articles + changed_articles,
+                               removed=[old for old, _ in updated], new=new_articles)
+            self._update_articles_list_page()
+            self._update_search_data()
+    
+    @metrics.timed('add_terms_bulk')
+    @_exclusive
+    def add_terms_bulk(self, records, upsert=False):
+        """
+        إضافة مجموعة من المصطلحات دفعة واحدة
+        
+        records: أي iterable أو generator من قواميس بنفس صيغة add_term،
+        مثل iter_jsonl('terms.jsonl'). يتم التحقق من جميع السجلات أولاً،
+        ثم يُكتب ملف البيانات مرة واحدة وتُحدث الصفحات ذات الصلة مرة واحدة
+        في النهاية بدلاً من مرة لكل مصطلح.
+        
+        upsert=True: المصطلحات الموجودة (بنفس العنوان) تُحدَّث بدلاً من رفض
+        الدفعة، فيمكن إعادة استيراد نفس الملف بعد تعديله.
+        
+        يعيد قاموساً فيه عدد السجلات (والمحدَّث منها) والزمن والمعدل وأسماء الملفات.
+        """
+        started = time.perf_counter()
+        new_terms, updated, slugs = self._prepare_bulk('terms', records, self._prepare_term, upsert)
+        self._apply_terms(new_terms, updated, slugs)
+        
+        changed_terms = [term for _, term in updated]
+        report = self._report_throughput("استيراد المصطلحات", len(new_terms) + len(changed_terms), started)
+        report['updated'] = len(changed_terms)
+        report['filenames'] = [term['filename'] for term in new_terms + changed_terms]
+        return report
+    
+    @metrics.timed('add_articles_bulk')
+    @_exclusive
+    def add_articles_bulk(self, records, upsert=False):
+        """
+        إضافة مجموعة من المقالات دفعة واحدة
+        
+        records: أي iterable أو generator من قواميس بنفس صيغة add_article.
+        upsert كما في add_terms_bulk.
+        يعيد قاموساً فيه عدد السجلات (والمحدَّث منها) والزمن والمعدل وأسماء الملفات.
+        """
+        started = time.perf_counter()
+        new_articles, updated, slugs = self._prepare_bulk('articles', records, self._prepare_article, upsert)
+        self._apply_articles(new_articles, updated, slugs)
+        
+        changed_articles = [article for _, article in updated]
+        report = self._report_throughput("استيراد المقالات", len(new_articles) + len(changed_articles), started)
+        report['updated'] = len(changed_articles)
+        report['filenames'] = [article['filename'] for article in new_articles + changed_articles]
+        return report
+    
+    def validate_records(self, kind, rows, upsert=False):
+        """
+        التحقق من سجلات قبل استيرادها دون كتابة أي شيء
+        
+        rows: أزواج (رقم السطر، السجل أو استثناء تحليله) كما يعيدها
+        content_import.read_records. يعيد أخطاء كل سطر واحداً واحداً:
+        (رقم السطر، الرسالة)، ويشمل ذلك العناوين الموجودة مسبقاً (إلا مع
+        upsert) والمكررة داخل الملف.
+        """
+        prepare = self._prepare_term if kind == 'terms' else self._prepare_article
+        date = self._get_current_date()
+        # نسخة في الذاكرة فقط: تُسجَّل فيها عناوين الملف لكشف التكرار داخله
+        slugs = self._read_slug_index()
+        with metrics.stage('validate'):
+            for number, record in rows:
+                if isinstance(record, Exception):
+                    yield number, str(record)
+                    continue
+                errors = record_errors(kind, record, CATEGORIES)
+                if not errors:
+                    try:
+                        prepare(dict(record), slugs, date, upsert)
+                    except ValueError as e:
+                        errors = [str(e)]
+                for error in errors:
+                    yield number, error
+    
+    def validate_content(self):
+        """
+        التحقق من المحتوى المخزن: الحقول، وتكرار slug، ووجود صفحة كل سجل
+        
+        يعيد الأخطاء واحداً واحداً: (النوع، slug، الرسالة).
+        """
+        slugs = SlugIndex()
+        for kind in KINDS:
+            for record in self.storage.load(kind):
+                slug = record.get('slug')
+                for error in record_errors(kind, record, CATEGORIES):
+                    yield kind, slug, error
+                if not slugs.add(kind, slug, record.get(TITLE_FIELDS[kind])):
+                    yield kind, slug, "slug مكرر"
+                if not (self.base_dir / record.get('filename', '')).is_file():
+                    yield kind, slug, f"الصفحة غير موجودة: {record.get('filename')}"
+    
+    @metrics.timed('import')
+    def import_records(self, kind, records, upsert=False, batch_size=1000):
+        """
+        حفظ سجلات في التخزين على دفعات دون إنشاء الصفحات
+        
+        records: أي iterable (مثل ملف يُقرأ سطراً سطراً)؛ لا يبقى في الذاكرة
+        إلا دفعة واحدة من batch_size سجل. الصفحات والقوائم والإحصائيات
+        تُحدَّث بعد ذلك مرة واحدة بـ build(). يعيد قاموساً فيه عدد السجلات
+        المضافة والمحدَّثة والزمن والمعدل.
+        """
+        prepare = self._prepare_term if kind == 'terms' else self._prepare_article
+        label = "استيراد المصطلحات" if kind == 'terms' else "استيراد المقالات"
+        started = time.perf_counter()
+        added = updated = 0
+        for batch in batched(records, batch_size):
+            # القفل لكل دفعة فقط، فلا ينتظر المحررون الآخرون انتهاء الملف كاملاً
+            with self.lock:
+                new, changed, slugs = self._prepare_bulk(kind, batch, prepare, upsert, start=added + updated + 1)
+                changed = [record for _, record in changed]
+                with metrics.stage('storage'):
+                    if new:
+                        self.storage.append(kind, new)
+                    if changed:
+                        self.storage.replace_many(kind, changed)
+                self._save_slug_index(slugs)
+            self._index_records(kind, new + changed)
+            added += len(new)
+            updated += len(changed)
+            elapsed = time.perf_counter() - started
+            logger.info("📥 %s: %d سجل (%.0f سجل/ثانية)", label, added + updated,
+                        (added + updated) / elapsed if elapsed > 0 else 0)
+        
+        report = self._report_throughput(label, added + updated, started)
+        report['added'] = added
+        report['updated'] = updated
+        return report
+    
+    @metrics.timed('sync')
+    def sync_database(self, target, full=False, batch_size=1000, copy=False):
+        """
+        مزامنة المحتوى مع جدول published_content في قاعدة الخادم الخلفي
+        
+        target: postgresql://...، أو sqlite:///ملف للتجربة، أو ملف .sql
+        (انظر content_sync). تُرسل الصفوف التي تغيرت منذ آخر مزامنة مع نفس
+        الهدف فقط، و full=True يرسلها جميعاً. copy=True يكتب ملف .sql مع
+        بيانات بصيغة COPY بدلاً من جمل INSERT.
+        """
+        report = sync_content(self.storage.load, target, CATEGORIES, self.sync_state_file,
+                              full=full, batch_size=batch_size, copy=copy)
+        logger.info("🔄 المزامنة مع %s: %d صف مُرسل، %d معطل، %d بدون تغيير (%.2f ثانية)",
+                    report['target'], report['sent'], report['deactivated'], report['unchanged'],
+                    report['seconds'])
+        return report
+    
+    @metrics.timed('update_term')
+    @_exclusive
+    def update_term(self, slug, changes):
+        """
+        تعديل مصطلح موجود
+        
+        changes: قاموس بالحقول المراد تغييرها. يبقى الـ slug واسم الملف كما هما.
+        """
+        old_term = self._find_record('terms', slug)
+        term_data = {**old_term, **changes, 'slug': old_term['slug'], 'filename': old_term['filename']}
+        if term_data['category'] not in CATEGORIES:
             raise ValueError(f"المجال غير صحيح. المجالات المتاحة: {list(CATEGORIES.keys())}")
         
-        # إنشاء slug لاسم الملف
-        slug = self._slugify(article_data['title'])
-        filename = f"article-{slug}.html"
+        with metrics.stage('storage'):
+            self.storage.replace('terms', slug, term_data)
+        self._set_slug_title('terms', slug, term_data['title_ar'])
+        self._index_records('terms', [term_data])
+        if term_data.get('image'):
+            self.build_images([term_data['image']])
+        self._create_term_page(term_data)
         
-        # إضافة معلومات إضافية
-        article_data['slug'] = slug
-        article_data['filename'] = filename
-        article_data['date'] = self._get_current_date()
+        self._update_stats('terms', added=[term_data], removed=[old_term])
+        for category in sorted({old_term['category'], term_data['category']}):
+            self._update_category_page(category)
+        self._update_terms_list_page()
+        self._update_search_data()
+        
+        logger.info("✏️ تم تعديل المصطلح: %s", term_data['title_ar'])
+        return term_data['filename']
+    
+    @metrics.timed('update_article')
+    @_exclusive
+    def update_article(self, slug, changes):
+        """
+        تعديل مقال موجود
         
-        # حفظ البيانات
-        articles = self._load_json(self.articles_file)
-        articles.append(article_data)
-        self._save_json(self.articles_file, articles)
+        changes: قاموس بالحقول المراد تغييرها. يبقى الـ slug واسم الملف كما هما.
+        """
+        old_article = self._find_record('articles', slug)
+        article_data = {**old_article, **changes, 'slug': old_article['slug'], 'filename': old_article['filename']}
+        if article_data['category'] not in CATEGORIES:
+            raise ValueError(f"المجال غير صحيح. المجالات المتاحة: {list(CATEGORIES.keys())}")
         
-        # إنشاء صفحة HTML
+        with metrics.stage('storage'):
+            self.storage.replace('articles', slug, article_data)
+        self._set_slug_title('articles', slug, article_data['title'])
+        self._index_records('articles', [article_data])
         self._create_article_page(article_data)
         
-        # تحديث الصفحات ذات الصلة
+        self._update_stats('articles', added=[article_data], removed=[old_article])
         self._update_articles_list_page()
-        self._update_homepage_stats()
+        self._update_search_data()
         
-        print(f"✅ تم إضافة المقال: {article_data['title']}")
-        print(f"📄 الملف: {filename}")
-        return filename
+        logger.info("✏️ تم تعديل المقال: %s", article_data['title'])
+        return article_data['filename']
+    
+    @metrics.timed('delete_term')
+    @_exclusive
+    def delete_term(self, slug):
+        """حذف مصطلح وصفحته"""
+        term_data = self._find_record('terms', slug)
+        with metrics.stage('storage'):
+            self.storage.remove('terms', slug)
+        self._release_slug('terms', slug)
+        self._unindex_record('terms', slug)
+        (self.base_dir / term_data['filename']).unlink(missing_ok=True)
+        
+        self._update_stats('terms', removed=[term_data])
+        self._update_category_page(term_data['category'])
+        self._update_terms_list_page()
+        self._update_search_data()
+        
+        logger.info("🗑️ تم حذف المصطلح: %s", term_data['title_ar'])
+    
+    @metrics.timed('delete_article')
+    @_exclusive
+    def delete_article(self, slug):
+        """حذف مقال وصفحته"""
+        article_data = self._find_record('articles', slug)
+        with metrics.stage('storage'):
+            self.storage.remove('articles', slug)
+        self._release_slug('articles', slug)
+        self._unindex_record('articles', slug)
+        (self.base_dir / article_data['filename']).unlink(missing_ok=True)
+        
+        self._update_stats('articles', removed=[article_data])
+        self._update_articles_list_page()
+        self._update_search_data()
+        
+        logger.info("🗑️ تم حذف المقال: %s", article_data['title'])
+    
+    # ------------------------------------------------------------------
+    # البناء التدريجي
+    #
+    # يحفظ data/build-manifest.json لكل سجل بصمة محتواه والصفحات التي
+    # يغذيها (صفحته، صفحة المجال، صفحة القائمة، الرئيسية) مع رقم إصدار
+    # القوالب. build() يعيد إنشاء الصفحات التي تغيرت مدخلاتها فقط.
+    # ------------------------------------------------------------------
+    
+    def _record_hash(self, record, images=None, related=None):
+        """
+        بصمة محتوى السجل
+        
+        images: بيان الصور؛ تدخل بصمة صورة السجل في بصمته لأن نسخ الصورة
+        وأبعادها تظهر في الصفحة. related: روابط المحتوى ذي الصلة المعروضة
+        في الصفحة.
+        """
+        payload = json.dumps(record, ensure_ascii=False, sort_keys=True)
+        image = (images or {}).get(record.get('image') or '')
+        if image:
+            payload += image['hash']
+        if related:
+            payload += json.dumps(related, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def _record_pages(self, kind, record):
+        """الصفحات التي يغذيها السجل"""
+        if kind == 'terms':
+            return [record['filename'], f"category-{record['category']}.html", 'terms-list.html', 'index.html']
+        return [record['filename'], 'articles.html', 'index.html']
+    
+    def _load_manifest(self):
+        if not self.manifest_file.exists():
+            return {'template_version': None, 'records': {}}
+        return self._load_json(self.manifest_file)
+    
+    @metrics.timed('render')
+    def _render_records(self, kind, records, workers=1):
+        """
+        إنشاء صفحات مجموعة من السجلات، على عدة عمليات إذا كان workers > 1
+        
+        كل صفحة تعتمد على سجلها فقط وتكتبها عملية واحدة، لذا الناتج
+        متطابق مهما كان عدد العمليات.
+        """
+        # عند تكرار اسم الملف يفوز آخر سجل، كما في الإنشاء المتسلسل
+        records = list({record['filename']: record for record in records}.values())
+        if workers <= 1 or len(records) < 2:
+            _render_chunk(self.base_dir, kind, records)
+            return len(records)
+        
+        chunk_size = max(1, -(-len(records) // (workers * 4)))
+        chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_render_chunk, self.base_dir, kind, chunk) for chunk in chunks]
+            rendered = sum(future.result() for future in futures)
+        # الصفحات كتبتها عمليات أخرى: تُحسب هنا من أحجامها على القرص
+        if metrics.enabled:
+            for record in records:
+                metrics.wrote(self.base_dir / record['filename'])
+        return rendered
+    
+    @metrics.timed('build')
+    @_exclusive
+    def build(self, force=False, workers=1, publish=True, related=True):
+        """
+        بناء الموقع تدريجياً: إعادة إنشاء الصفحات التي تغيرت مدخلاتها فقط
+        
+        force=True يعيد بناء جميع الصفحات. workers يحدد عدد العمليات
+        المستخدمة لإنشاء الصفحات. publish=False يتخطى مرحلة النشر في dist/
+        (يستخدمه خادم التطوير). related=False يستخدم data/related.json كما
+        هو دون تحديثه (خادم التطوير يحدّثه في الخلفية ثم يبني مرة أخرى).
+        يعيد قاموساً بعدد الصفحات التي أعيد بناؤها وعدد الصفحات التي تم تخطيها.
+        """
+        manifest = self._load_manifest()
+        old_entries = manifest['records']
+        rebuild_all = force or manifest['template_version'] != TEMPLATE_VERSION
+        
+        # مرحلة الصور أولاً لأن الصفحات تستخدم أبعاد النسخ وأسماءها. ترميز
+        # الصور أثقل بكثير من إنشاء الصفحات، فيكون متوازياً حتى مع workers=1
+        self.build_images(self._record_images(), workers=workers if workers > 1 else None, prune=True)
+        images = self._load_image_manifest()
+        # ثم المحتوى ذو الصلة لأنه يظهر في صفحات السجلات
+        related = self.build_related(full=force) if related else self._load_related()
+        
+        entries = {}
+        dirty_pages = set()
+        all_pages = set()
+        
+        for kind in ('terms', 'articles'):
+            dirty_records = []
+            with metrics.stage('load'):
+                records = self.storage.load(kind)
+            with metrics.stage('hash'):
+                for record in records:
+                    key = f"{kind}/{record['slug']}"
+                    pages = self._record_pages(kind, record)
+                    links = related_links(related, key)
+                    entry = {'hash': self._record_hash(record, images, links), 'pages': pages}
+                    entries[key] = entry
+                    all_pages.update(pages)
+                    
+                    old_entry = old_entries.get(key)
+                    if (rebuild_all or old_entry is None or old_entry['hash'] != entry['hash']
+                            or not (self.base_dir / record['filename']).exists()):
+                        dirty_records.append({**record, 'related': links})
+                        dirty_pages.update(pages)
+                        # صفحات كان السجل يغذيها قبل التعديل (مثل مجال سابق)
+                        if old_entry:
+                            dirty_pages.update(old_entry['pages'][1:])
+            metrics.count(f"{kind}_rendered", len(dirty_records))
+            self._render_records(kind, dirty_records, workers)
+        
+        # السجلات المحذوفة: حذف صفحاتها وتحديث الصفحات التي كانت تغذيها
+        for key, old_entry in old_entries.items():
+            if key not in entries:
+                own_page, *shared_pages = old_entry['pages']
+                (self.base_dir / own_page).unlink(missing_ok=True)
+                dirty_pages.update(shared_pages)
+        
+        # تحديث الصفحات المجمعة المتأثرة فقط
+        if 'index.html' in dirty_pages:
+            # قد تكون البيانات عُدلت من خارج هذه الجلسة
+            self._update_homepage_stats(self.rebuild_stats())
+        for category in CATEGORIES:
+            if f"category-{category}.html" in dirty_pages:
+                self._update_category_page(category)
+        if 'terms-list.html' in dirty_pages:
+            self._update_terms_list_page()
+        if 'articles.html' in dirty_pages:
+            self._update_articles_list_page()
+        if 'index.html' in dirty_pages:
+            self._update_search_data()
+            self._search_index = None
+        
+        self._save_json(self.manifest_file, {'template_version': TEMPLATE_VERSION, 'records': entries})
+        self.build_sitemap()
+        
+        rebuilt = len(dirty_pages)
+        skipped = len(all_pages - dirty_pages)
+        logger.info("🏗️ البناء: %d صفحة أعيد بناؤها، %d صفحة لم تتغير", rebuilt, skipped)
+        
+        # مرحلة النشر أخيراً لأنها تصغر الصفحات المولدة
+        published = self.build_dist(workers=workers) if publish else 0
+        return {'rebuilt': rebuilt, 'skipped': skipped, 'published': published}
+    
+    @metrics.timed('rebuild_all')
+    @_exclusive
+    def rebuild_all(self, workers=None, publish=True):
+        """
+        إعادة إنشاء جميع صفحات المصطلحات والمقالات من data/*.json
+        
+        تُستخدم بعد تعديل القوالب. workers عدد العمليات المتوازية
+        (الافتراضي: عدد أنوية المعالج). publish=False يتخطى مرحلة النشر.
+        """
+        workers = workers or os.cpu_count() or 1
+        started = time.perf_counter()
+        self.rebuild_slug_index()
+        report = self.build(force=True, workers=workers, publish=publish)
+        elapsed = time.perf_counter() - started
+        logger.info("⚡ إعادة البناء الكاملة: %.2f ثانية باستخدام %d عملية", elapsed, workers)
+        report['seconds'] = elapsed
+        report['workers'] = workers
+        return report
+    
+    # ------------------------------------------------------------------
+    # المحتوى ذو الصلة (انظر site_related)
+    # ------------------------------------------------------------------
+    
+    def _load_related(self):
+        if not self.related_file.exists():
+            return {}
+        return self._load_json(self.related_file)
+    
+    @metrics.timed('related')
+    def build_related(self, full=False):
+        """
+        تحديث قوائم المحتوى ذي الصلة للسجلات التي تغيرت (وما تأثر بها)
+        
+        full=True يعيد حساب الجميع (build(force=True)). الحساب دون القفل
+        (قد يستغرق ثوانٍ)، والكتابة بالقفل فقط إذا لم يتغير الملف أثناءه.
+        يعيد محتوى data/related.json لاستخدامه في إنشاء الصفحات.
+        """
+        signature = file_signature(self.related_file)
+        old = self._load_related()
+        records = [(f"{kind}/{record['slug']}", kind, record) for kind in KINDS for record in self.storage.load(kind)]
+        related, computed = related_content(records, old, full=full)
+        if not computed and related == old:
+            return related
+        with self.lock:
+            # عملية أخرى كتبت الملف أثناء الحساب: تُستخدم قوائمها، والبناء التالي
+            # يعيد حساب ما لا يطابق بصمته
+            if file_signature(self.related_file) != signature:
+                return self._load_related()
+            # بدون مسافات بادئة: الملف فيه قائمة لكل سجل
+            with atomic_open(self.related_file) as f:
+                json.dump(related, f, ensure_ascii=False, separators=(',', ':'))
+        logger.info("🔗 المحتوى ذو الصلة: حُسبت قوائم %d سجل من %d", computed, len(records))
+        return related
+    
+    def _related_html(self, kind, record):
+        """
+        قسم المحتوى ذي الصلة في صفحة السجل
+        
+        البناء يمرر الروابط في record['related']؛ عند الإضافة أو التعديل
+        المباشر تُقرأ من data/related.json (السجل الجديد بدون قائمة حتى البناء التالي).
+        """
+        links = record.get('related')
+        if links is None:
+            links = related_links(self._load_related(), f"{kind}/{record['slug']}")
+        if not links:
+            return ''
+        return RELATED_SECTION.render({'links': [RELATED_LINK.render({
+            'url': link['url'],
+            'title': link['title'],
+            'color': CATEGORIES[link['category']]['color'],
+            'category_ar': CATEGORIES[link['category']]['ar'],
+        }) for link in links]})
     
+    # ------------------------------------------------------------------
+    # الصور (انظر site_images)
+    # ------------------------------------------------------------------
+    
+    def _load_image_manifest(self):
+        if not self.image_manifest_file.exists():
+            return {}
+        return self._load_json(self.image_manifest_file)
+    
+    def _image_entry(self, name):
+        """مدخل الصورة من data/image-manifest.json (أو None إن لم تُعالج بعد)"""
+        return self._load_image_manifest().get(name)
+    
+    def _record_images(self):
+        """أسماء الصور في حقول image للسجلات (الصور الوحيدة التي تُعرض بـ <picture>)"""
+        return sorted({record['image'] for kind in KINDS for record in self.storage.load(kind) if record.get('image')})
+    
+    @metrics.timed('images')
+    @_exclusive
+    def build_images(self, names=None, workers=None, prune=False):
+        """
+        إنشاء نسخ WebP/AVIF للصور التي تغير محتواها
+        
+        names: أسماء الصور داخل images/ (build() يمرر _record_images()، و
+        None يعني جميع صور JPG/PNG). prune=True يحذف من البيان الصور غير
+        الموجودة في names. workers عدد عمليات الترميز (الافتراضي: عدد أنوية
+        المعالج، وصورة واحدة تُرمَّز في نفس العملية). يعيد عدد الصور التي حُوِّلت.
+        """
+        if workers is None and names is not None and len(names) == 1:
+            # إضافة سجل واحد: إنشاء مجموعة عمليات أبطأ من الترميز نفسه
+            workers = 1
+        old_manifest = self._load_image_manifest()
+        manifest, converted = process_images(self.images_dir, old_manifest, names, workers, prune)
+        if manifest != old_manifest:
+            self._save_json(self.image_manifest_file, manifest)
+        if converted:
+            logger.info("🖼️ الصور: تم تحويل %d صورة", converted)
+        return converted
+    
+    # ------------------------------------------------------------------
+    # خريطة الموقع وخلاصة Atom (انظر site_sitemap)
+    # ------------------------------------------------------------------
+    
+    def _sitemap_pages(self):
+        """
+        روابط الخريطة: {المسار: (البصمة، تاريخ ISO أو None)}
+        
+        بصمة السجل من data/build-manifest.json، وبصمات صفحات القوائم من
+        data/listing-manifest.json، والصفحات المكتوبة يدوياً من محتواها بدون
+        العدادات (التي تتغير مع كل إضافة).
+        """
+        def page_hash(filename):
+            text = (self.base_dir / filename).read_text(encoding='utf-8')
+            return hashlib.sha256(strip_stats(text).encode('utf-8')).hexdigest()
+        
+        pages = {}
+        listings = self._load_json(self.listing_manifest_file) if self.listing_manifest_file.exists() else {}
+        listing_files = ['terms-list.html', 'articles.html'] + [f"category-{c}.html" for c in CATEGORIES]
+        for filename in STATIC_PAGES + tuple(listing_files):
+            if filename in listings:
+                for number, fingerprint in enumerate(listings[filename], start=1):
+                    pages[page_filename(filename, number)] = (fingerprint, None)
+            elif (self.base_dir / filename).exists():
+                pages[filename] = (page_hash(filename), None)
+        for entries in self._manual_entries().values():
+            for entry in entries:
+                if (self.base_dir / entry['url']).exists():
+                    pages[entry['url']] = (page_hash(entry['url']), None)
+        
+        records = self._load_manifest()['records']
+        for kind in KINDS:
+            for record in self.storage.load(kind):
+                entry = records.get(f"{kind}/{record['slug']}")
+                digest = entry['hash'] if entry else self._record_hash(record)
+                pages[record['filename']] = (digest, iso_date(record.get('date')))
+        return pages
+    
+    def _feed_entries(self, urls):
+        """أحدث FEED_SIZE مصطلحاً ومقالاً (بالتاريخ ثم آخر تعديل) لخلاصة Atom"""
+        candidates = (
+            (iso_date(record.get('date')) or '', urls[record['filename']][1], kind, record)
+            for kind in KINDS for record in self.storage.load(kind)
+        )
+        latest = heapq.nlargest(FEED_SIZE, candidates, key=lambda item: item[:2] + (item[3]['filename'],))
+        return [{
+            'path': record['filename'],
+            'title': record[TITLE_FIELDS[kind]],
+            'summary': record.get('definition') or record.get('intro', ''),
+            'category': record['category'],
+            'category_label': CATEGORIES[record['category']]['ar'],
+            'published': date or lastmod,
+            'updated': lastmod,
+        } for date, lastmod, kind, record in latest]
+    
+    @metrics.timed('sitemap')
+    @_exclusive
+    def build_sitemap(self):
+        """
+        كتابة أجزاء sitemap.xml التي تغيرت و feed.xml إذا تغيرت
+        
+        lastmod لكل رابط يتغير فقط عند تغير بصمة محتواه. يعيد عدد الملفات المكتوبة.
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        old_manifest = {}
+        if self.sitemap_manifest_file.exists():
+            old_manifest = self._load_json(self.sitemap_manifest_file)
+        manifest, written = write_sitemap(self.base_dir, self._sitemap_pages(), old_manifest, today, self.site_url)
+        manifest['feed'], feed_written = write_feed(self.base_dir, self._feed_entries(manifest['urls']),
+                                                    old_manifest.get('feed'), self.site_url, today)
+        written += feed_written
+        if manifest != old_manifest:
+            self._save_json(self.sitemap_manifest_file, manifest)
+        if written:
+            logger.info("🗺️ خريطة الموقع: %d رابط في %d جزء، تم تحديث %d ملف",
+                        len(manifest['urls']), len(manifest['shards']), written)
+        return written
+    
+    # ------------------------------------------------------------------
+    # النشر: التصغير والضغط المسبق في dist/ (انظر site_minify)
+    # ------------------------------------------------------------------
+    
+    @metrics.timed('publish')
+    @_exclusive
+    def build_dist(self, workers=1):
+        """
+        تصغير الملفات التي تغيرت وكتابتها مع نسخها المضغوطة في dist/
+        
+        يطبع الحجم الموفر لكل نوع ملف ويعيد عدد الملفات المكتوبة.
+        """
+        old_manifest = {}
+        if self.dist_manifest_file.exists():
+            old_manifest = self._load_json(self.dist_manifest_file)
+        manifest, written = publish(self.base_dir, old_manifest, workers)
+        if manifest != old_manifest:
+            self._save_json(self.dist_manifest_file, manifest)
+        if written:
+            logger.info("📦 النشر: تم تصغير وضغط %d ملف في dist/", len(written))
+            for suffix, total in sorted(savings_by_type(manifest, set(written)).items()):
+                saved = total['source'] - total['output']
+                compressed = f"gzip {total['gz'] / 1024:.0f} ك.ب"
+                if total['br']:
+                    compressed += f"، brotli {total['br'] / 1024:.0f} ك.ب"
+                logger.info("   - %s (%d ملف): %.0f ← %.0f ك.ب (توفير %.0f ك.ب)، %s", suffix, total['files'],
+                            total['source'] / 1024, total['output'] / 1024, saved / 1024, compressed)
+        return len(written)
+    
+    # ------------------------------------------------------------------
+    # ملفات الوسائط (انظر site_assets)
+    # ------------------------------------------------------------------
+    
+    def _asset_state(self):
+        """بصمات ملفات الوسائط، ومراجع السجلات، وخريطة المراجع الكاملة"""
+        assets = scan_assets(self.base_dir)
+        data_refs = data_references({kind: self.storage.load(kind) for kind in KINDS})
+        return assets, data_refs, reference_graph(self.base_dir, data_refs)
+    
+    def assets_report(self):
+        """تقرير الملفات المكررة وغير المستخدمة والمراجع المفقودة"""
+        assets, data_refs, graph = self._asset_state()
+        groups = duplicate_groups(assets, graph, data_refs)
+        duplicates = [path for group in groups for path in group[1:]]
+        unused = unreferenced(assets, graph)
+        broken = missing(assets, graph)
+        
+        logger.info("🗂️ ملفات الوسائط: %d ملف (%.0f ك.ب)", len(assets), size_of(self.base_dir, assets) / 1024)
+        logger.info("   - نسخ مكررة: %d (%.0f ك.ب)", len(duplicates), size_of(self.base_dir, duplicates) / 1024)
+        for group in groups:
+            logger.info("     %s ← %s", group[0], ', '.join(group[1:]))
+        logger.info("   - غير مستخدمة: %d (%.0f ك.ب)", len(unused), size_of(self.base_dir, unused) / 1024)
+        for path in unused:
+            logger.info("     %s", path)
+        if broken:
+            logger.warning("   ⚠️ مراجع لملفات غير موجودة: %s", ', '.join(broken))
+        return {'assets': len(assets), 'duplicates': groups, 'unused': unused, 'missing': broken}
+    
+    @_exclusive
+    def dedupe_assets(self):
+        """
+        دمج الملفات المتطابقة محتوىً في النسخة المعتمدة من كل مجموعة
+        
+        تُحدَّث المراجع في صفحات HTML وملفات CSS/JS، وحقل image في السجلات
+        التي تشير إلى نسخة مكررة، ثم تُحذف النسخ المكررة.
+        """
+        assets, data_refs, graph = self._asset_state()
+        replacements = {}
+        for canonical, *duplicates in duplicate_groups(assets, graph, data_refs):
+            for duplicate in duplicates:
+                replacements[duplicate] = canonical
+        
+        for duplicate, canonical in replacements.items():
+            for kind, slug in data_refs.get(duplicate, []):
+                if canonical.startswith('images/'):
+                    update = self.update_term if kind == 'terms' else self.update_article
+                    update(slug, {'image': canonical[len('images/'):]})
+        
+        changed = rewrite_references(self.base_dir, replacements)
+        saved = size_of(self.base_dir, replacements)
+        for duplicate in replacements:
+            (self.base_dir / duplicate).unlink()
+        logger.info("🗂️ دمج النسخ المكررة: حذف %d ملف (%.0f ك.ب)، وتحديث %d صفحة",
+                    len(replacements), saved / 1024, len(changed))
+        return {'removed': sorted(replacements), 'bytes': saved, 'rewritten': changed}
+    
+    @_exclusive
+    def prune_assets(self):
+        """حذف ملفات الوسائط التي لا تشير إليها أي صفحة أو سجل"""
+        assets, _, graph = self._asset_state()
+        unused = unreferenced(assets, graph)
+        saved = size_of(self.base_dir, unused)
+        for path in unused:
+            (self.base_dir / path).unlink()
+        logger.info("🧹 حذف %d ملف غير مستخدم (%.0f ك.ب)", len(unused), saved / 1024)
+        return {'removed': unused, 'bytes': saved}
+    
+    @metrics.timed('page')
     def _create_term_page(self, term_data):
         """إنشاء صفحة HTML للمصطلح"""
         category = CATEGORIES[term_data['category']]
         
-        # بناء أمثلة التوضيح
-        examples_html = ""
-        for example in term_data.get('examples', []):
-            examples_html += f"""
-                        <h3 class="mt-4 mb-3">{example['title']}</h3>
-                        <p>{example['content']}</p>
-"""
-        
         # صورة المصطلح
         image_html = ""
         if term_data.get('image'):
+            picture = picture_html(term_data['image'], term_data['title_ar'],
+                                   self._image_entry(term_data['image']),
+                                   sizes='(min-width: 992px) 66vw, 100vw')
             image_html = f"""
                         <div class="term-image-large">
-                            <img src="images/{term_data['image']}" alt="{term_data['title_ar']}" class="img-fluid rounded">
+                            {picture}
                         </div>
 """
         
-        html_content = f"""<!DOCTYPE html>
-<html lang="ar" dir="rtl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{term_data['title_ar']} - ديوان الانفراد</title>
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.rtl.min.css">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.2/css/all.min.css">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Tajawal:wght@400;500;700;900&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="styles.css">
-</head>
-<body>
-    <!-- Header -->
-    <header class="bg-white shadow-sm sticky-top">
-        <nav class="navbar navbar-expand-lg">
-            <div class="container">
-                <a class="navbar-brand d-flex align-items-center" href="index.html">
-                    <img src="images/logos/logo_ar.PNG" alt="ديوان الانفراد" style="height: 50px;">
-                    <span class="fw-bold fs-3" style="color: #0a2351; margin-right: 120px;">ديوان الانفراد</span>
-                </a>
-                <button class="navbar-toggler" type="button" data-bs-toggle="collapse" data-bs-target="#navbarNav">
-                    <span class="navbar-toggler-icon"></span>
-                </button>
-                <div class="collapse navbar-collapse" id="navbarNav">
-                    <ul class="navbar-nav ms-auto">
-                        <li class="nav-item">
-                            <a class="nav-link" href="index.html">الرئيسية</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link" href="index.html#about">عن المنصة</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link" href="categories.html">المجالات العلمية</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link active" href="terms-list.html">المصطلحات</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link" href="articles.html">المقالات</a>
-                        </li>
-                    </ul>
-                    <div class="d-flex gap-2">
-                        <button class="btn btn-outline-primary" data-bs-toggle="modal" data-bs-target="#newsletterModal">
-                            <i class="fas fa-envelope"></i> انضم إلينا
-                        </button>
-                        <button class="btn btn-primary" data-bs-toggle="modal" data-bs-target="#knowledgeModal">
-                            <i class="fas fa-share-alt"></i> شارك معرفتك
-                        </button>
-                    </div>
-                </div>
-            </div>
-        </nav>
-    </header>
-
-    <!-- Term Header -->
-    <section class="term-page-header">
-        <div class="container">
-            <nav aria-label="breadcrumb">
-                <ol class="breadcrumb">
-                    <li class="breadcrumb-item"><a href="index.html" class="text-white">الرئيسية</a></li>
-                    <li class="breadcrumb-item"><a href="category-{term_data['category']}.html" class="text-white">{category['ar']}</a></li>
-                    <li class="breadcrumb-item active text-white-50" aria-current="page">{term_data['title_ar']}</li>
-                </ol>
-            </nav>
-            <div class="row align-items-center">
-                <div class="col-md-8">
-                    <span class="badge bg-light text-primary mb-2">{category['ar']}</span>
-                    <h1 class="term-page-title">{term_data['title_ar']}</h1>
-                </div>
-                <div class="col-md-4 text-md-end mt-3 mt-md-0">
-                    <button class="btn btn-light" onclick="copyPageLink()"><i class="fas fa-share-alt"></i> نسخ الرابط</button>
-                </div>
-            </div>
-        </div>
-    </section>
-
-    <!-- Term Content -->
-    <section class="py-5">
-        <div class="container">
-            <div class="row">
-                <div class="col-lg-8">
-                    <!-- Basic Definition -->
-                    <div class="term-section">
-                        <h2 class="term-section-title">التعريف العلمي</h2>
-                        <p>{term_data['definition']}</p>{image_html}
-                    </div>
-
-                    <!-- Detailed Explanation -->
-                    <div class="term-section">
-                        <h2 class="term-section-title">شرح مبسط</h2>
-                        <p>{term_data['explanation']}</p>
-                    </div>
-
-                    <!-- Examples and Illustrations -->
-                    <div class="term-section">
-                        <h2 class="term-section-title">أمثلة للتوضيح</h2>
-                        {examples_html}
-                    </div>
-                </div>
-
-                <div class="col-lg-4">
-                    <!-- Term Info Card -->
-                    <div class="term-section mb-4">
-                        <h3 class="term-section-title">معلومات المصطلح</h3>
-                        <table class="table">
-                            <tbody>
-                                <tr>
-                                    <th>المجال</th>
-                                    <td>{category['ar']}</td>
-                                </tr>
-                                <tr>
-                                    <th>تاريخ الإضافة</th>
-                                    <td>{term_data['date']}</td>
-                                </tr>
-                            </tbody>
-                        </table>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </section>
-
-    <!-- Footer -->
-    <footer class="bg-dark text-white py-5">
-        <div class="container">
-            <div class="row">
-                <div class="col-md-4 mb-4">
-                    <h5 class="fw-bold mb-3">ديوان الانفراد</h5>
-                    <p>منصة علمية متخصصة في توحيد وتوثيق المصطلحات العلمية باللغة العربية</p>
-                </div>
-                <div class="col-md-4 mb-4">
-                    <h5 class="fw-bold mb-3">روابط سريعة</h5>
-                    <ul class="list-unstyled">
-                        <li><a href="index.html" class="text-white-50 text-decoration-none">الرئيسية</a></li>
-                        <li><a href="index.html#about" class="text-white-50 text-decoration-none">عن المنصة</a></li>
-                        <li><a href="categories.html" class="text-white-50 text-decoration-none">المجالات العلمية</a></li>
-                        <li><a href="terms-list.html" class="text-white-50 text-decoration-none">المصطلحات</a></li>
-                    </ul>
-                </div>
-                <div class="col-md-4 mb-4">
-                    <h5 class="fw-bold mb-3">تواصل معنا</h5>
-                    <p class="text-white-50">info@infiradeng.com</p>
-                </div>
-            </div>
-            <hr class="my-4 bg-white-50">
-            <div class="text-center">
-                <p class="mb-0">&copy; ٢٠٢٥ ديوان الانفراد. جميع الحقوق محفوظة.</p>
-            </div>
-        </div>
-    </footer>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js"></script>
-    <script src="script.js"></script>
-
-    <script>
-    function copyPageLink() {{
-        const url = window.location.href;
-        navigator.clipboard.writeText(url).then(function() {{
-            const btn = event.target.closest('button');
-            const originalHTML = btn.innerHTML;
-            btn.innerHTML = '<i class="fas fa-check"></i> تم النسخ!';
-            btn.classList.add('btn-success');
-            btn.classList.remove('btn-light');
-            
-            setTimeout(function() {{
-                btn.innerHTML = originalHTML;
-                btn.classList.remove('btn-success');
-                btn.classList.add('btn-light');
-            }}, 2000);
-        }}, function(err) {{
-            alert('فشل نسخ الرابط. الرجاء المحاولة مرة أخرى.');
-        }});
-    }}
-    </script>
-</body>
-</html>
+        TERM_PAGE.render_file(self.base_dir / term_data['filename'], {
+            'page_title': term_data['title_ar'],
+            'title': term_data['title_ar'],
+            'category': term_data['category'],
+            'category_ar': category['ar'],
+            'definition': term_data['definition'],
+            'explanation': term_data['explanation'],
+            'image': image_html,
+            'examples': self._examples_html(term_data.get('examples', [])),
+            'date': term_data['date'],
+            'related': self._related_html('terms', term_data),
+        })
+    
+    def _examples_html(self, examples):
+        """بناء أمثلة التوضيح جزءاً جزءاً"""
+        for example in examples:
+            yield f"""
+                        <h3 class="mt-4 mb-3">{example['title']}</h3>
+                        <p>{example['content']}</p>
 """
-        
-        # حفظ الملف
-        filepath = self.base_dir / term_data['filename']
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
     
+    @metrics.timed('page')
     def _create_article_page(self, article_data):
         """إنشاء صفحة HTML للمقال"""
         category = CATEGORIES[article_data['category']]
         
-        # بناء أقسام المقال
-        sections_html = ""
-        for section in article_data.get('sections', []):
-            sections_html += f"""
+        ARTICLE_PAGE.render_file(self.base_dir / article_data['filename'], {
+            'page_title': article_data['title'],
+            'title': article_data['title'],
+            'category': article_data['category'],
+            'category_ar': category['ar'],
+            'category_color': category['color'],
+            'intro': article_data['intro'],
+            'sections': self._sections_html(article_data.get('sections', [])),
+            'related': self._related_html('articles', article_data),
+        })
+    
+    def _sections_html(self, sections):
+        """بناء أقسام المقال جزءاً جزءاً"""
+        for section in sections:
+            yield f"""
                         <h2 class="fw-bold mb-4 mt-5">{section['title']}</h2>
                         <p>{section['content']}</p>
 """
+    
+    def _manual_entries(self):
+        """مدخلات data/search-manual.json للصفحات المكتوبة يدوياً"""
+        if self.search_manual_file.exists():
+            return self._load_json(self.search_manual_file)
+        return {}
+    
+    @metrics.timed('listing')
+    def _update_listing(self, filename, layout, kind, category=None, order='title'):
+        """
+        إعادة كتابة صفحات قائمة مقسمة (انظر site_listings)
         
-        html_content = f"""<!DOCTYPE html>
-<html lang="ar" dir="rtl">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{article_data['title']} - ديوان الانفراد</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-    <link rel="stylesheet" href="styles.css">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Tajawal:wght@300;400;500;700;800&display=swap" rel="stylesheet">
-</head>
-<body>
-    <!-- Header -->
-    <header class="sticky-top bg-white shadow-sm">
-        <nav class="navbar navbar-expand-lg navbar-light">
-            <div class="container">
-                <a class="navbar-brand d-flex align-items-center" href="index.html">
-                    <img src="images/logos/icon.PNG" alt="ديوان الانفراد" height="50">
-                    <span class="fw-bold fs-3 me-3" style="color: #0a2351; margin-right: 120px;">ديوان الانفراد</span>
-                </a>
-                <button class="navbar-toggler" type="button" data-bs-toggle="collapse" data-bs-target="#navbarNav">
-                    <span class="navbar-toggler-icon"></span>
-                </button>
-                <div class="collapse navbar-collapse" id="navbarNav">
-                    <ul class="navbar-nav me-auto">
-                        <li class="nav-item">
-                            <a class="nav-link" href="index.html">الرئيسية</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link" href="about.html">عن المنصة</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link" href="categories.html">المجالات العلمية</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link" href="terms-list.html">المصطلحات</a>
-                        </li>
-                        <li class="nav-item">
-                            <a class="nav-link active" href="articles.html">المقالات</a>
-                        </li>
-                    </ul>
-                    <div class="d-flex gap-2">
-                        <button class="btn btn-outline-primary" data-bs-toggle="modal" data-bs-target="#newsletterModal">
-                            <i class="fas fa-envelope"></i> انضم إلينا
-                        </button>
-                        <button class="btn btn-primary" data-bs-toggle="modal" data-bs-target="#knowledgeModal">
-                            <i class="fas fa-share-alt"></i> شارك معرفتك
-                        </button>
-                    </div>
-                </div>
-            </div>
-        </nav>
-    </header>
-
-    <!-- Article Header -->
-    <section class="term-page-header">
-        <div class="container">
-            <nav aria-label="breadcrumb">
-                <ol class="breadcrumb">
-                    <li class="breadcrumb-item"><a href="index.html" class="text-white">الرئيسية</a></li>
-                    <li class="breadcrumb-item"><a href="articles.html" class="text-white">المقالات</a></li>
-                    <li class="breadcrumb-item"><a href="category-{article_data['category']}.html" class="text-white">{category['ar']}</a></li>
-                    <li class="breadcrumb-item active text-white-50" aria-current="page">{article_data['title']}</li>
-                </ol>
-            </nav>
-            <div class="row align-items-center">
-                <div class="col-md-8">
-                    <span class="badge bg-light text-{category['color']} mb-2">{category['ar']}</span>
-                    <h1 class="term-page-title">{article_data['title']}</h1>
-                </div>
-                <div class="col-md-4 text-md-end mt-3 mt-md-0">
-                    <button class="btn btn-light" onclick="copyPageLink()"><i class="fas fa-share-alt"></i> نسخ الرابط</button>
-                </div>
-            </div>
-        </div>
-    </section>
-
-    <!-- Article Content -->
-    <section class="py-5">
-        <div class="container">
-            <div class="row">
-                <div class="col-lg-8 mx-auto">
-                    <article class="article-content">
-                        <h2 class="fw-bold mb-4">مقدمة</h2>
-                        <p class="lead">{article_data['intro']}</p>
-{sections_html}
-                    </article>
-                </div>
-            </div>
-        </div>
-    </section>
-
-    <!-- Footer -->
-    <footer class="bg-dark text-white py-5">
-        <div class="container">
-            <div class="row">
-                <div class="col-md-4 mb-4">
-                    <h5 class="fw-bold mb-3">ديوان الانفراد</h5>
-                    <p>منصة علمية متخصصة في توحيد وتوثيق المصطلحات العلمية باللغة العربية</p>
-                </div>
-                <div class="col-md-4 mb-4">
-                    <h5 class="fw-bold mb-3">روابط سريعة</h5>
-                    <ul class="list-unstyled">
-                        <li><a href="index.html" class="text-white-50 text-decoration-none">الرئيسية</a></li>
-                        <li><a href="about.html" class="text-white-50 text-decoration-none">عن المنصة</a></li>
-                        <li><a href="categories.html" class="text-white-50 text-decoration-none">المجالات العلمية</a></li>
-                        <li><a href="terms-list.html" class="text-white-50 text-decoration-none">المصطلحات</a></li>
-                    </ul>
-                </div>
-                <div class="col-md-4 mb-4">
-                    <h5 class="fw-bold mb-3">تواصل معنا</h5>
-                    <p class="text-white-50">info@infiradeng.com</p>
-                </div>
-            </div>
-            <hr class="my-4 bg-white-50">
-            <div class="text-center">
-                <p class="mb-0">&copy; ٢٠٢٥ ديوان الانفراد. جميع الحقوق محفوظة.</p>
-            </div>
-        </div>
-    </footer>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-    <script src="script.js"></script>
-
-    <script>
-    function copyPageLink() {{
-        const url = window.location.href;
-        navigator.clipboard.writeText(url).then(function() {{
-            const btn = event.target.closest('button');
-            const originalHTML = btn.innerHTML;
-            btn.innerHTML = '<i class="fas fa-check"></i> تم النسخ!';
-            btn.classList.add('btn-success');
-            btn.classList.remove('btn-light');
-            
-            setTimeout(function() {{
-                btn.innerHTML = originalHTML;
-                btn.classList.remove('btn-success');
-                btn.classList.add('btn-light');
-            }}, 2000);
-        }}, function(err) {{
-            alert('فشل نسخ الرابط. الرجاء المحاولة مرة أخرى.');
-        }});
-    }}
-    </script>
-</body>
-</html>
-"""
+        القائمة = المحتوى المخزن مع مدخلات الصفحات المكتوبة يدوياً، ولا تُكتب
+        إلا الصفحات التي تغيرت شريحتها.
+        """
+        records = self.storage.list_category(kind, category) if category else self.storage.load(kind)
+        manual = self._manual_entries().get(kind, [])
+        if category:
+            manual = [entry for entry in manual if entry['categorySlug'] == category]
+        entries = sort_entries(merge_entries(listing_entries(kind, records, CATEGORIES), manual), order)
         
-        # حفظ الملف
-        filepath = self.base_dir / article_data['filename']
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        manifest = {}
+        if self.listing_manifest_file.exists():
+            manifest = self._load_json(self.listing_manifest_file)
+        fingerprints, written = write_listing(self.base_dir, filename, layout, entries, CATEGORIES,
+                                              manifest.get(filename))
+        if fingerprints != manifest.get(filename):
+            manifest[filename] = fingerprints
+            self._save_json(self.listing_manifest_file, manifest)
+        return len(fingerprints), written
     
     def _update_category_page(self, category):
         """تحديث صفحة الفئة بالمصطلحات الجديدة"""
-        print(f"🔄 تحديث صفحة الفئة: {CATEGORIES[category]['ar']}")
-        # سيتم تنفيذ هذا لاحقاً
+        pages, written = self._update_listing(f"category-{category}.html", 'category', 'terms', category)
+        logger.info("🔄 تحديث صفحة الفئة: %s (%d/%d صفحة)", CATEGORIES[category]['ar'], written, pages)
     
     def _update_terms_list_page(self):
-        """تحديث صفحة قائمة المصطلحات"""
-        print("🔄 تحديث صفحة قائمة المصطلحات")
-        # سيتم تنفيذ هذا لاحقاً
+        """تحديث صفحة قائمة المصطلحات (مرتبة أبجدياً)"""
+        pages, written = self._update_listing('terms-list.html', 'terms', 'terms')
+        logger.info("🔄 تحديث صفحة قائمة المصطلحات (%d/%d صفحة)", written, pages)
     
     def _update_articles_list_page(self):
-        """تحديث صفحة قائمة المقالات"""
-        print("🔄 تحديث صفحة قائمة المقالات")
-        # سيتم تنفيذ هذا لاحقاً
+        """تحديث صفحة قائمة المقالات (الأحدث أولاً)"""
+        pages, written = self._update_listing('articles.html', 'articles', 'articles', order='date')
+        logger.info("🔄 تحديث صفحة قائمة المقالات (%d/%d صفحة)", written, pages)
+    
+    # ------------------------------------------------------------------
+    # الإحصائيات (انظر site_stats)
+    # ------------------------------------------------------------------
+    
+    def _load_stats(self):
+        """تحميل data/stats.json، أو حسابه من التخزين إذا لم يوجد"""
+        if not self.stats_file.exists():
+            return self.rebuild_stats()
+        # نسخة عميقة لأن التحديث يغير القواميس الداخلية
+        return copy.deepcopy(self._load_json(self.stats_file))
+    
+    @metrics.timed('stats')
+    @_exclusive
+    def rebuild_stats(self):
+        """حساب الإحصائيات كاملة من المحتوى المخزن والصفحات المكتوبة يدوياً"""
+        stats = empty_stats(CATEGORIES)
+        manual = self._manual_entries()
+        for kind in KINDS:
+            records = self.storage.load(kind)
+            for record in records:
+                count(stats, kind, record['category'], 1)
+            filenames = {record['filename'] for record in records}
+            for entry in manual.get(kind, []):
+                if entry['url'] not in filenames:
+                    count(stats, kind, entry['categorySlug'], 1)
+            stats['latest'][kind] = latest_from_records(kind, records)
+        self._save_json(self.stats_file, stats)
+        return stats
     
-    def _update_homepage_stats(self):
-        """تحديث الإحصائيات في الصفحة الرئيسية"""
-        terms = self._load_json(self.terms_file)
-        articles = self._load_json(self.articles_file)
+    @metrics.timed('stats')
+    def _update_stats(self, kind, added=(), removed=(), new=()):
+        """تحديث الإحصائيات تدريجياً بعد تغيير ثم تحديث العدادات في الصفحات"""
+        if not self.stats_file.exists():
+            # الحساب الكامل يشمل التغيير لأنه حُفظ في التخزين قبل هذا الاستدعاء
+            stats = self.rebuild_stats()
+        else:
+            stats = self._load_stats()
+            if not apply_change(stats, kind, added, removed, new):
+                stats['latest'][kind] = latest_from_records(kind, self.storage.load(kind))
+            self._save_json(self.stats_file, stats)
+        categories = {record['category'] for record in list(added) + list(removed)}
+        self._update_homepage_stats(stats, categories)
+    
+    def _listing_pages(self, filename):
+        """جميع صفحات قائمة مقسمة (حسب data/listing-manifest.json)"""
+        pages = 1
+        if self.listing_manifest_file.exists():
+            pages = len(self._load_json(self.listing_manifest_file).get(filename) or [None])
+        return [page_filename(filename, number) for number in range(1, pages + 1)]
+    
+    def _update_homepage_stats(self, stats=None, categories=None):
+        """
+        تحديث العدادات في الصفحة الرئيسية وصفحة المجالات وصفحات المجالات
+        
+        categories: المجالات التي تغيرت (الافتراضي: جميعها)
+        """
+        stats = stats or self._load_stats()
+        values = stat_values(stats)
+        pages = ['index.html', 'categories.html']
+        for category in sorted(CATEGORIES if categories is None else categories):
+            pages.extend(self._listing_pages(f"category-{category}.html"))
+        for page in pages:
+            patch_stats(self.base_dir / page, values)
+        
+        logger.info("📊 الإحصائيات الجديدة:")
+        logger.info("   - المصطلحات: %d", stats['terms']['total'])
+        logger.info("   - المقالات: %d", stats['articles']['total'])
+    
+    def _index_records(self, kind, records):
+        """تحديث فهرس البحث بالسجلات الجديدة أو المعدلة إن كان مبنياً"""
+        if self._search_index is not None:
+            for record in records:
+                self._search_index.add(kind, record)
+    
+    def _unindex_record(self, kind, slug):
+        """حذف سجل من فهرس البحث إن كان مبنياً"""
+        if self._search_index is not None:
+            self._search_index.remove(kind, slug)
+    
+    def search(self, query, category=None, limit=10, kind=None):
+        """
+        البحث في المصطلحات والمقالات مع ترتيب النتائج حسب الصلة
         
-        print(f"📊 الإحصائيات الجديدة:")
-        print(f"   - المصطلحات: {len(terms)}")
-        print(f"   - المقالات: {len(articles)}")
+        category: حصر النتائج في مجال واحد (مثل 'physics')
+        kind: 'terms' أو 'articles' لحصر النتائج في نوع واحد
+        يعيد قائمة قواميس فيها kind و slug و title و category و url و score.
+        """
+        if self._search_index is None:
+            with metrics.stage('search_index'):
+                index = SearchIndex()
+                for content_kind in ('terms', 'articles'):
+                    for record in self.storage.load(content_kind):
+                        index.add(content_kind, record)
+            self._search_index = index
+        return self._search_index.search(query, category=category, kind=kind, limit=limit)
+    
+    @metrics.timed('search_data')
+    def _update_search_data(self):
+        """إعادة توليد search-data.json من ملفات البيانات مع الفهرس المقلوب"""
+        data = build_search_data(self.storage.load('terms'), self.storage.load('articles'), CATEGORIES,
+                                 self._manual_entries())
+        with atomic_open(self.search_data_file) as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        metrics.wrote(self.search_data_file)
     
     def get_stats(self):
-        """الحصول على إحصائيات المحتوى"""
-        terms = self._load_json(self.terms_file)
-        articles = self._load_json(self.articles_file)
+        """
+        الحصول على إحصائيات المحتوى من data/stats.json دون عد السجلات
         
+        الأعداد تشمل الصفحات المكتوبة يدوياً (data/search-manual.json).
+        """
+        stats = self._load_stats()
         return {
-            'terms_count': len(terms),
-            'articles_count': len(articles),
-            'categories_count': len(CATEGORIES)
+            'terms_count': stats['terms']['total'],
+            'articles_count': stats['articles']['total'],
+            'categories_count': len(CATEGORIES),
+            'categories': {
+                category: {
+                    'terms': stats['terms']['categories'].get(category, 0),
+                    'articles': stats['articles']['categories'].get(category, 0),
+                }
+                for category in CATEGORIES
+            },
+            'latest': stats['latest'],
         }
 
 
+def _render_chunk(base_dir, kind, records):
+    """إنشاء دفعة من صفحات المحتوى (تُستدعى داخل عمليات البناء المتوازي)"""
+    manager = ContentManager(base_dir, storage=None)
+    render = manager._create_term_page if kind == 'terms' else manager._create_article_page
+    for record in records:
+        render(record)
+    return len(records)
+
+
 # مثال على الاستخدام
 if __name__ == "__main__":
     manager = ContentManager()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس زمن مراحل البناء وحجم الكتابة لمنصة ديوان الانفراد
+Per-Stage Timing and Write Counters for Diwan Al-Infirad Platform
+
+القياس معطل افتراضياً: stage() تعيد سياقاً فارغاً مشتركاً و wrote() تعود
+فوراً، فلا يكلف الاستخدام العادي شيئاً. عند تفعيله (add_content.py --profile)
+يُسجَّل لكل مرحلة عدد الاستدعاءات والزمن والملفات والبايتات المكتوبة،
+والمراحل متداخلة بأسماء مثل build/pages.
+
+    from content_metrics import metrics
+
+    metrics.enable()
+    with metrics.stage('pages'):
+        ...
+        metrics.wrote(path)
+    metrics.dump('trace.json')
+
+ملف التتبع بصيغة Chrome Trace Event (يُفتح في chrome://tracing أو
+ui.perfetto.dev) مع ملخص المراحل والعدادات.
+
+رسائل ContentManager تُكتب عبر logging؛ setup_logging() يعرضها في الطرفية
+كما كانت تُطبع سابقاً.
+"""
+
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# سياق فارغ مشترك يُعاد عندما يكون القياس معطلاً
+_DISABLED = nullcontext()
+
+
+def setup_logging(level=logging.INFO):
+    """عرض رسائل المنصة في الطرفية بدون بادئات (سطر لكل رسالة)"""
+    logging.basicConfig(level=level, format='%(message)s', stream=sys.stdout)
+
+
+class Metrics:
+    """
+    مسجل المراحل والعدادات داخل العملية
+
+    ما يُكتب داخل عمليات البناء المتوازي لا يصل إلى هذا المسجل، لذا تحسبه
+    المرحلة المستدعية في العملية الرئيسية من نتائج تلك العمليات (الصفحات
+    وملفات dist/؛ نسخ الصور المحولة بالتوازي لا تدخل في العدادات).
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+    
+    def enable(self):
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+    
+    def reset(self):
+        self.stages = {}
+        self.counters = {'files_written': 0, 'bytes_written': 0}
+        self.events = []
+        self._stack = []
+        self._origin = time.perf_counter()
+    
+    def stage(self, name):
+        """سياق يقيس زمن مرحلة وما كُتب خلالها"""
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name)
+    
+    def timed(self, name):
+        """مزخرف يقيس كل استدعاء للدالة كمرحلة باسم name"""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+    
+    @contextmanager
+    def _measure(self, name):
+        path = f"{self._stack[-1]['path']}/{name}" if self._stack else name
+        frame = {'path': path, 'files': 0, 'bytes': 0}
+        self._stack.append(frame)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            total = self.stages.setdefault(path, {'calls': 0, 'seconds': 0.0, 'files': 0, 'bytes': 0})
+            total['calls'] += 1
+            total['seconds'] += elapsed
+            total['files'] += frame['files']
+            total['bytes'] += frame['bytes']
+            # ما كُتب في مرحلة فرعية يُحسب للمراحل الأعلى أيضاً
+            if self._stack:
+                self._stack[-1]['files'] += frame['files']
+                self._stack[-1]['bytes'] += frame['bytes']
+            self.events.append({
+                'name': name, 'cat': path.split('/')[0], 'ph': 'X',
+                'ts': round((started - self._origin) * 1e6), 'dur': round(elapsed * 1e6),
+                'pid': os.getpid(), 'tid': threading.get_ident(),
+                'args': {'files': frame['files'], 'bytes': frame['bytes']},
+            })
+    
+    def wrote(self, filepath=None, nbytes=None, files=1):
+        """
+        تسجيل كتابة ملف (أو files ملفات) في المرحلة الحالية
+
+        nbytes: الحجم المكتوب؛ بدونه يُقرأ حجم filepath من القرص.
+        """
+        if not self.enabled:
+            return
+        if nbytes is None:
+            try:
+                nbytes = os.stat(filepath).st_size
+            except (OSError, TypeError):
+                nbytes = 0
+        self.counters['files_written'] += files
+        self.counters['bytes_written'] += nbytes
+        if self._stack:
+            self._stack[-1]['files'] += files
+            self._stack[-1]['bytes'] += nbytes
+    
+    def count(self, name, amount=1):
+        """زيادة عداد مسمى (مثل السجلات المعالجة)"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def report(self):
+        """مجموع كل مرحلة (الاستدعاءات، الزمن، الملفات، البايتات) والعدادات"""
+        return {
+            'stages': {path: {**total, 'seconds': round(total['seconds'], 6)} for path, total in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+    
+    def summary(self):
+        """أسطر نصية بزمن كل مرحلة وحجم كتابتها"""
+        lines = []
+        for path, total in sorted(self.stages.items()):
+            depth = path.count('/')
+            lines.append(f"   {'  ' * depth}{path.rsplit('/', 1)[-1]:<{24 - 2 * depth}} "
+                         f"{total['seconds'] * 1000:>9.1f} م.ث  ×{total['calls']:<5} "
+                         f"{total['files']:>6} ملف  {total['bytes'] / 1024:>9.1f} ك.ب")
+        return lines
+    
+    def dump(self, filepath):
+        """كتابة ملف التتبع (Chrome Trace Event مع الملخص)"""
+        trace = {'traceEvents': sorted(self.events, key=lambda event: event['ts']),
+                 'displayTimeUnit': 'ms', **self.report()}
+        Path(filepath).write_text(json.dumps(trace, ensure_ascii=False, indent=1), encoding='utf-8')
+
+
+# المسجل المشترك في العملية (كما في logging.getLogger)
+metrics = Metrics()
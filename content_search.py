@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+البحث في محتوى منصة ديوان الانفراد
+Search Support for Diwan Al-Infirad Platform
+
+يولد ملف search-data.json الذي يستخدمه search.js في المتصفح، مع حقول
+مطبّعة مسبقاً (بنفس قواعد normalizeArabic) وفهرس مقلوب من الكلمة إلى
+أرقام المستندات، حتى يبحث المتصفح في الفهرس بدلاً من المرور على كل
+المستندات عند كل ضغطة مفتاح.
+
+ويوفر SearchIndex للبحث من جهة الخادم (ContentManager.search) بتجذيع
+عربي خفيف وترتيب BM25 على العنوان والتعريف والشرح والأمثلة.
+"""
+
+import heapq
+import math
+import re
+from functools import lru_cache
+
+# يجب أن تطابق normalizeArabic في search.js
+ALEF_VARIANTS = re.compile('[أإآ]')
+YA_VARIANTS = re.compile('[ىئ]')
+NON_WORD = re.compile(r'[^\u0600-\u06FFa-zA-Z0-9\s]')
+
+# أدوات التعريف التي تُحذف من بداية الكلمة في مفاتيح الفهرس، حتى يجد
+# البحث عن "جاذبيه" كلمة "الجاذبيه"
+ARTICLE_PREFIXES = ('وال', 'بال', 'كال', 'فال', 'لل', 'ال')
+
+
+def normalize_arabic(text):
+    """تطبيع النص العربي للبحث (توحيد الألف والياء والتاء المربوطة)"""
+    if not text:
+        return ''
+    text = text.lower()
+    text = ALEF_VARIANTS.sub('ا', text)
+    text = YA_VARIANTS.sub('ي', text)
+    text = text.replace('ة', 'ه')
+    text = NON_WORD.sub('', text)
+    return text.strip()
+
+
+def strip_article(token):
+    """حذف أداة التعريف من بداية كلمة مطبّعة إن بقي بعدها حرفان على الأقل"""
+    for prefix in ARTICLE_PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 2:
+            return token[len(prefix):]
+    return token
+
+
+def index_keys(normalized_text):
+    """مفاتيح الفهرس لنص مطبّع: كل كلمة، وصيغتها بدون أداة التعريف"""
+    keys = set()
+    for token in normalized_text.split():
+        keys.add(token)
+        keys.add(strip_article(token))
+    return keys
+
+
+def term_entry(term, categories):
+    """مدخل مصطلح بنفس صيغة search-data.json"""
+    return {
+        'title': term['title_ar'],
+        'englishTitle': term.get('title_en', ''),
+        'category': categories[term['category']]['ar'],
+        'categorySlug': term['category'],
+        'url': term['filename'],
+        'definition': term.get('definition', ''),
+        'keywords': term.get('keywords') or [k for k in (term.get('title_en'),) if k],
+    }
+
+
+def article_entry(article, categories):
+    """مدخل مقال بنفس صيغة search-data.json"""
+    intro = article.get('intro', '')
+    return {
+        'title': article['title'],
+        'category': categories[article['category']]['ar'],
+        'categorySlug': article['category'],
+        'url': article['filename'],
+        'summary': article.get('summary') or intro.split('.')[0][:200],
+        'readingTime': f"{article.get('reading_time', 10)} دقيقة",
+        'keywords': article.get('keywords', []),
+    }
+
+
+# الحقول المطبّعة لكل نوع، بنفس أسماء حقول المدخل
+NORMALIZED_FIELDS = {
+    'terms': ('title', 'englishTitle', 'definition', 'category'),
+    'articles': ('title', 'summary', 'category'),
+}
+
+
+def merge_entries(entries, manual):
+    """المدخلات اليدوية التي لا يقابلها مدخل مولد بنفس الرابط، ثم المدخلات المولدة"""
+    urls = {entry['url'] for entry in entries}
+    return [entry for entry in manual or [] if entry['url'] not in urls] + entries
+
+
+def build_search_data(terms, articles, categories, extra=None):
+    """
+    بناء محتوى search-data.json
+
+    extra: مدخلات مكتوبة يدوياً لصفحات لا يديرها ContentManager
+    (بنفس الصيغة)، وتُستبدل بالمدخل المولد إذا تطابق الرابط.
+    """
+    generated = {
+        'terms': [term_entry(t, categories) for t in terms],
+        'articles': [article_entry(a, categories) for a in articles],
+    }
+    extra = extra or {}
+    
+    data = {'terms': [], 'articles': [], 'index': {}}
+    for kind, entries in generated.items():
+        index = {}
+        for doc_id, entry in enumerate(merge_entries(entries, extra.get(kind))):
+            normalized = {field: normalize_arabic(entry.get(field)) for field in NORMALIZED_FIELDS[kind]}
+            normalized['keywords'] = [normalize_arabic(k) for k in entry.get('keywords', [])]
+            data[kind].append({**entry, 'normalized': normalized})
+            
+            keys = set()
+            for field in NORMALIZED_FIELDS[kind]:
+                keys |= index_keys(normalized[field])
+            for keyword in normalized['keywords']:
+                keys |= index_keys(keyword)
+            for key in keys:
+                index.setdefault(key, []).append(doc_id)
+        data['index'][kind] = dict(sorted(index.items()))
+    return data
+
+
+# ----------------------------------------------------------------------
+# البحث من جهة الخادم: فهرس مقلوب مع تجذيع خفيف وترتيب BM25
+# ----------------------------------------------------------------------
+
+# لواحق تُحذف بالترتيب (على نمط مجذِّع Light10) إن بقي بعدها حرفان على الأقل
+SUFFIXES = ('ها', 'ان', 'ات', 'ون', 'ين', 'يه', 'ه', 'ي')
+
+# أوزان الحقول لكل نوع محتوى
+FIELD_WEIGHTS = {
+    'terms': {'title_ar': 3.0, 'title_en': 2.0, 'definition': 1.5, 'explanation': 1.0, 'examples': 0.8},
+    'articles': {'title': 3.0, 'intro': 1.5, 'sections': 1.0},
+}
+
+
+@lru_cache(maxsize=65536)
+def light_stem(token):
+    """تجذيع خفيف: حذف الواو وأداة التعريف من البداية والضمائر والجموع من النهاية"""
+    if not ('\u0600' <= token[:1] <= '\u06ff'):
+        return token
+    if len(token) > 3 and token.startswith('و'):
+        token = token[1:]
+    token = strip_article(token)
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            token = token[:-len(suffix)]
+    return token
+
+
+def analyze(text):
+    """تحويل نص إلى قائمة كلمات مطبّعة ومجذّعة"""
+    return [light_stem(token) for token in normalize_arabic(text).split()]
+
+
+def field_text(record, field):
+    """نص الحقل، مع دمج عناوين ومحتوى الأمثلة أو الأقسام"""
+    value = record.get(field)
+    if isinstance(value, list):
+        return ' '.join(f"{item.get('title', '')} {item.get('content', '')}" for item in value)
+    return value or ''
+
+
+class SearchIndex:
+    """
+    فهرس بحث في الذاكرة مع ترتيب BM25
+
+    يجمع تكرار الكلمة في حقول السجل بأوزان FIELD_WEIGHTS ثم يطبق BM25
+    على المجموع. الإضافة والحذف تدريجيان، فلا حاجة لإعادة بناء الفهرس
+    عند إضافة مصطلح.
+    """
+    
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}   # الكلمة -> {رقم المستند: التكرار الموزون}
+        self.docs = {}       # رقم المستند -> بيانات النتيجة
+        self.doc_terms = {}  # رقم المستند -> كلمات المستند (للحذف)
+        self.doc_lengths = {}  # رقم المستند -> طول المستند الموزون
+        self.doc_ids = {}    # (النوع, slug) -> رقم المستند
+        self.total_length = 0.0
+        self._next_id = 0
+    
+    def __len__(self):
+        return len(self.docs)
+    
+    def add(self, kind, record):
+        """إضافة سجل إلى الفهرس (أو استبداله إن كان موجوداً)"""
+        key = (kind, record['slug'])
+        if key in self.doc_ids:
+            self.remove(kind, record['slug'])
+        
+        frequencies = {}
+        length = 0.0
+        for field, weight in FIELD_WEIGHTS[kind].items():
+            for token in analyze(field_text(record, field)):
+                frequencies[token] = frequencies.get(token, 0.0) + weight
+                length += weight
+        
+        doc_id = self._next_id
+        self._next_id += 1
+        for token, frequency in frequencies.items():
+            self.postings.setdefault(token, {})[doc_id] = frequency
+        self.docs[doc_id] = {
+            'kind': kind,
+            'slug': record['slug'],
+            'title': record.get('title_ar') or record.get('title'),
+            'category': record['category'],
+            'url': record['filename'],
+        }
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = list(frequencies)
+        self.doc_ids[key] = doc_id
+        self.total_length += length
+    
+    def remove(self, kind, slug):
+        """حذف سجل من الفهرس"""
+        doc_id = self.doc_ids.pop((kind, slug), None)
+        if doc_id is None:
+            return
+        for token in self.doc_terms.pop(doc_id):
+            postings = self.postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[token]
+        del self.docs[doc_id]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+    
+    def search(self, query, category=None, kind=None, limit=10):
+        """البحث وإرجاع أفضل النتائج مرتبة حسب درجة BM25"""
+        count = len(self.docs)
+        if not count:
+            return []
+        k1, b = self.k1, self.b
+        # norm = k1 * (1 - b + b * length / average_length)
+        norm_base = k1 * (1 - b)
+        norm_scale = k1 * b * count / self.total_length if self.total_length else 0.0
+        lengths = self.doc_lengths
+        
+        scores = {}
+        for token in set(analyze(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            boost = idf * (k1 + 1)
+            for doc_id, frequency in postings.items():
+                norm = norm_base + norm_scale * lengths[doc_id]
+                scores[doc_id] = scores.get(doc_id, 0.0) + boost * frequency / (frequency + norm)
+        
+        if category or kind:
+            scores = {
+                doc_id: score for doc_id, score in scores.items()
+                if (not category or self.docs[doc_id]['category'] == category)
+                and (not kind or self.docs[doc_id]['kind'] == kind)
+            }
+        
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        results = []
+        for doc_id, score in best:
+            doc = self.docs[doc_id]
+            result = {k: doc[k] for k in ('kind', 'slug', 'title', 'category', 'url')}
+            result['score'] = score
+            results.append(result)
+        return results
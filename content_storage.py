@@ -0,0 +1,744 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+طبقة تخزين المحتوى لمنصة ديوان الانفراد
+Content Storage Backends for Diwan Al-Infirad Platform
+
+يتعامل ContentManager مع البيانات عبر واجهة موحدة، ولكل نوع محتوى
+('terms' أو 'articles') نفس العمليات:
+
+    load(kind)                   - جميع السجلات بترتيب الإضافة
+    append(kind, records)        - إضافة سجلات جديدة
+    replace(kind, slug, record)  - استبدال سجل موجود
+    replace_many(kind, records)  - استبدال عدة سجلات موجودة دفعة واحدة
+    remove(kind, slug)           - حذف سجل
+    find(kind, slug)             - البحث عن سجل بالـ slug (أو None)
+    count(kind, category=None)   - عدد السجلات (في مجال محدد اختيارياً)
+    list_category(kind, category)- سجلات مجال واحد
+    compact()                    - ضغط التخزين إن كان يدعم ذلك
+
+الأنماط المتاحة:
+    json    - ملفات data/terms.json و data/articles.json (الافتراضي)
+    journal - سجل عمليات إلحاقي JSONL مع لقطات دورية
+    sqlite  - قاعدة SQLite مضمنة بجداول مطابقة لـ database/schema/01_create_tables.sql
+
+الكتابة آمنة عند الانقطاع: ملفات JSON تُكتب في ملف مؤقت ثم fsync ثم
+تستبدل الأصل (atomic_open)، فيبقى الملف القديم كاملاً إن توقفت العملية
+أثناء الكتابة. FileLock قفل بين العمليات يحيط بدورة القراءة والتعديل
+والحفظ، و Spool مجلد تنتظر فيه الإضافات حتى تُحفظ معاً (انظر
+ContentManager.add_term).
+"""
+
+import os
+import json
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: بدون قفل بين العمليات
+    fcntl = None
+
+from content_metrics import metrics
+
+KINDS = ('terms', 'articles')
+
+# حقل العنوان في سجلات كل نوع
+TITLE_FIELDS = {'terms': 'title_ar', 'articles': 'title'}
+
+# نوع المحتوى كما في عمود type في جدول published_content
+CONTENT_TYPES = {'terms': 'term', 'articles': 'article'}
+
+
+def iter_jsonl(filepath):
+    """قراءة سجلات ملف JSONL سطراً بسطر دون تحميل الملف كاملاً في الذاكرة"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_json(filepath):
+    """تحميل ملف JSON"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _fsync_dir(directory):
+    """حفظ مدخل المجلد على القرص بعد os.replace (غير متاح على Windows)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(filepath, mode='w', encoding='utf-8'):
+    """
+    فتح ملف للكتابة بحيث يظهر المحتوى الجديد كاملاً أو لا يظهر
+
+    الكتابة في ملف مؤقت بجانب الهدف (اسمه يحمل رقم العملية حتى لا تتصادم
+    عمليتان)، ثم fsync واستبدال الهدف. عند أي استثناء يُحذف الملف المؤقت
+    ويبقى الهدف كما كان.
+    """
+    filepath = Path(filepath)
+    tmp = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
+    f = open(tmp, mode, encoding=None if 'b' in mode else encoding)
+    try:
+        yield f
+        f.flush()
+        os.fsync(f.fileno())
+        f.close()
+        os.replace(tmp, filepath)
+    except BaseException:
+        f.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    _fsync_dir(filepath.parent)
+
+
+def save_json(filepath, data):
+    """حفظ ملف JSON (كتابة ذرية)"""
+    with atomic_open(filepath) as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    metrics.wrote(filepath)
+
+
+def file_signature(filepath):
+    """بصمة الملف للتحقق من صلاحية الذاكرة المؤقتة: (وقت التعديل بالنانوثانية، الحجم)"""
+    try:
+        stat = os.stat(filepath)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _copy(data):
+    """نسخة سطحية حتى لا يغيّر المستدعي النسخة المحفوظة في الذاكرة"""
+    if isinstance(data, list):
+        return list(data)
+    if isinstance(data, dict):
+        return dict(data)
+    return data
+
+
+class JsonFileCache:
+    """
+    ذاكرة مؤقتة للبيانات المحللة داخل العملية
+    
+    كل مدخل مرتبط ببصمات ملفاته (المسار، وقت التعديل، الحجم). إذا عدّلت
+    عملية أخرى أحد الملفات تتغير بصمته فيُعاد تحليله عند القراءة التالية.
+    الكتابة من هذه العملية تحدّث المدخل مباشرة دون إعادة قراءة الملف.
+    """
+    
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, paths):
+        """البيانات المحفوظة إن كانت ملفاتها لم تتغير، وإلا None"""
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == tuple(file_signature(p) for p in paths):
+            self.hits += 1
+            return _copy(entry[1])
+        self.misses += 1
+        return None
+    
+    def put(self, key, paths, data):
+        """حفظ بيانات مع البصمات الحالية لملفاتها"""
+        self.entries[key] = (tuple(file_signature(p) for p in paths), _copy(data))
+    
+    def load_json(self, filepath):
+        """تحميل ملف JSON من الذاكرة المؤقتة أو من القرص"""
+        key = str(filepath)
+        data = self.get(key, (filepath,))
+        if data is None:
+            data = load_json(filepath)
+            self.put(key, (filepath,), data)
+        return data
+    
+    def save_json(self, filepath, data):
+        """حفظ ملف JSON وتحديث الذاكرة المؤقتة بنفس البيانات"""
+        save_json(filepath, data)
+        self.put(str(filepath), (filepath,), data)
+    
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.entries)}
+
+
+def apply_operation(records, entry):
+    """تطبيق عملية واحدة (add / update / delete) على قائمة السجلات"""
+    if entry['op'] == 'add':
+        records.append(entry['record'])
+        return
+    
+    for index, record in enumerate(records):
+        if record.get('slug') == entry['slug']:
+            if entry['op'] == 'update':
+                records[index] = entry['record']
+            else:
+                del records[index]
+            return
+
+
+def apply_operations(records, entries):
+    """
+    تطبيق مجموعة عمليات بالترتيب
+    
+    التعديلات المتتالية تستخدم خريطة slug -> موقع تُبنى مرة واحدة بدلاً من
+    البحث الخطي لكل عملية (مهم عند تحديث دفعة كبيرة من السجلات).
+    """
+    positions = None
+    for entry in entries:
+        if entry['op'] == 'update':
+            if positions is None:
+                positions = {}
+                for index, record in enumerate(records):
+                    positions.setdefault(record.get('slug'), index)
+            index = positions.get(entry['slug'])
+            if index is not None:
+                records[index] = entry['record']
+            continue
+        apply_operation(records, entry)
+        if entry['op'] == 'add' and positions is not None:
+            positions.setdefault(entry['record'].get('slug'), len(records) - 1)
+        elif entry['op'] == 'delete':
+            positions = None
+
+
+class SlugIndex:
+    """
+    فهرس slug دائم (data/slug-index.json)
+    
+    المفتاح "terms/<slug>" بنفس صيغة مفاتيح build-manifest.json والقيمة عنوان
+    السجل، فالتحقق من وجود slug أو تكرار عنوان لا يحتاج تحميل المحتوى.
+    """
+    
+    def __init__(self, entries=None):
+        self.entries = entries or {}
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def get(self, kind, slug):
+        """عنوان السجل صاحب الـ slug، أو None إن لم يكن مستخدماً"""
+        return self.entries.get(f"{kind}/{slug}")
+    
+    def add(self, kind, slug, title):
+        """تسجيل slug؛ يعيد False إذا كان مسجلاً من قبل"""
+        key = f"{kind}/{slug}"
+        if key in self.entries:
+            return False
+        self.entries[key] = title
+        return True
+    
+    def set_title(self, kind, slug, title):
+        self.entries[f"{kind}/{slug}"] = title
+    
+    def discard(self, kind, slug):
+        self.entries.pop(f"{kind}/{slug}", None)
+
+
+class FileLock:
+    """
+    قفل استشاري بين العمليات (flock) على ملف مثل data/.lock
+
+    قابل لإعادة الدخول داخل العملية، فيمكن لدالة مقفلة أن تستدعي دالة
+    مقفلة أخرى (add_term ← update_term). القفل يُحرر تلقائياً إذا انتهت
+    العملية، فلا يبقى قفل معلق بعد انقطاع مفاجئ.
+    """
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+        self._depth = 0
+    
+    def __enter__(self):
+        if self._depth == 0:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a')
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+        self._depth += 1
+        return self
+    
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class Spool:
+    """
+    مجلد الإضافات المنتظرة (data/spool/) للحفظ المجمع
+
+    كل عملية تكتب إضافتها في ملف (تذكرة) ثم تنتظر القفل. من يحصل على
+    القفل أولاً يحفظ جميع التذاكر المنتظرة في عملية كتابة واحدة، ويكتب
+    نتيجة كل تذكرة (اسم الملف أو رسالة الخطأ) بجانبها. التذاكر تُكتب
+    كتابة ذرية، فتذكرة عملية توقفت قبل الحفظ تحفظها العملية التالية.
+    """
+    
+    # نتائج لم تقرأها عمليتها (توقفت قبل ذلك) تُحذف بعد هذه المدة
+    STALE_RESULT_SECONDS = 3600
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        self._counter = 0
+    
+    def submit(self, kind, record):
+        """كتابة تذكرة إضافة؛ يعيد اسمها"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._counter += 1
+        # الاسم يبدأ بالوقت فيحفظ الترتيب الزمني للتذاكر
+        ticket = f"{time.time_ns():020d}-{os.getpid()}-{self._counter}"
+        with atomic_open(self.path / f"{ticket}.json") as f:
+            json.dump({'kind': kind, 'record': record}, f, ensure_ascii=False)
+        return ticket
+    
+    def pending(self):
+        """التذاكر المنتظرة بترتيب إرسالها: [(الاسم، المحتوى)]"""
+        if not self.path.exists():
+            return []
+        tickets = []
+        for path in sorted(self.path.glob('*.json')):
+            tickets.append((path.stem, load_json(path)))
+        return tickets
+    
+    def is_pending(self, ticket):
+        return (self.path / f"{ticket}.json").exists()
+    
+    def finish(self, results):
+        """كتابة نتائج التذاكر ثم حذفها: {الاسم: النتيجة}"""
+        for ticket, result in results.items():
+            with atomic_open(self.path / f"{ticket}.result") as f:
+                json.dump(result, f, ensure_ascii=False)
+        for ticket in results:
+            (self.path / f"{ticket}.json").unlink(missing_ok=True)
+        cutoff = time.time() - self.STALE_RESULT_SECONDS
+        for path in self.path.glob('*.result'):
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+    
+    def cancel(self, ticket):
+        (self.path / f"{ticket}.json").unlink(missing_ok=True)
+    
+    def take_result(self, ticket):
+        """قراءة نتيجة تذكرة وحذفها"""
+        path = self.path / f"{ticket}.result"
+        result = load_json(path)
+        path.unlink()
+        return result
+
+
+ARABIC_DIGITS = str.maketrans('٠١٢٣٤٥٦٧٨٩', '0123456789')
+
+
+def iso_date(date):
+    """تحويل تاريخ المنصة (مثل ٢٠٢٥/3/7) إلى صيغة ISO قابلة للترتيب (2025-03-07)"""
+    if not date:
+        return None
+    parts = re.split(r'[/-]', date.translate(ARABIC_DIGITS))
+    if len(parts) != 3 or not all(p.isdigit() for p in parts):
+        return None
+    year, month, day = (int(p) for p in parts)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+class JsonStorage:
+    """تخزين كل نوع محتوى في ملف JSON واحد يُعاد كتابته عند كل تعديل"""
+    
+    name = 'json'
+    
+    def __init__(self, data_dir, cache=None):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.cache = cache or JsonFileCache()
+        for kind in KINDS:
+            if not self.path(kind).exists():
+                save_json(self.path(kind), [])
+    
+    def path(self, kind):
+        return self.data_dir / f"{kind}.json"
+    
+    def load(self, kind):
+        return self.cache.load_json(self.path(kind))
+    
+    def save(self, kind, records):
+        self.cache.save_json(self.path(kind), records)
+    
+    def _modify(self, kind, entries):
+        records = self.load(kind)
+        apply_operations(records, entries)
+        self.save(kind, records)
+    
+    def append(self, kind, records):
+        self._modify(kind, [{'op': 'add', 'record': r} for r in records])
+    
+    def replace(self, kind, slug, record):
+        self._modify(kind, [{'op': 'update', 'slug': slug, 'record': record}])
+    
+    def replace_many(self, kind, records):
+        """استبدال مجموعة سجلات موجودة (بالـ slug) في عملية كتابة واحدة"""
+        self._modify(kind, [{'op': 'update', 'slug': r['slug'], 'record': r} for r in records])
+    
+    def remove(self, kind, slug):
+        self._modify(kind, [{'op': 'delete', 'slug': slug}])
+    
+    def find(self, kind, slug):
+        for record in self.load(kind):
+            if record.get('slug') == slug:
+                return record
+        return None
+    
+    def count(self, kind, category=None):
+        return len(self.list_category(kind, category) if category else self.load(kind))
+    
+    def list_category(self, kind, category):
+        return [r for r in self.load(kind) if r.get('category') == category]
+    
+    def compact(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+class JournalStorage(JsonStorage):
+    """
+    تخزين بسجل عمليات إلحاقي مع ضغط دوري
+
+    لكل نوع محتوى ملفان إضافيان بجانب ملف JSON:
+        terms.snapshot.jsonl - السطر الأول {"seq": N} ثم سجل في كل سطر
+        terms.journal.jsonl  - عملية في كل سطر: add / update / delete
+    الحالة = اللقطة + عمليات السجل التي رقمها أكبر من N. يبقى ملف
+    terms.json صيغة تصدير تُكتب عند كل ضغط (compaction).
+    """
+    
+    name = 'journal'
+    
+    def __init__(self, data_dir, compact_every=1000, cache=None):
+        super().__init__(data_dir, cache=cache)
+        self.compact_every = compact_every
+    
+    def journal_path(self, kind):
+        return self.data_dir / f"{kind}.journal.jsonl"
+    
+    def snapshot_path(self, kind):
+        return self.data_dir / f"{kind}.snapshot.jsonl"
+    
+    def _state_files(self, kind):
+        """الملفات التي تحدد حالة نوع المحتوى (مفتاح الذاكرة المؤقتة)"""
+        return (self.path(kind), self.snapshot_path(kind), self.journal_path(kind))
+    
+    def _read_snapshot(self, kind):
+        """قراءة أحدث لقطة، أو ملف JSON المصدَّر إذا لم تُنشأ لقطة بعد"""
+        snapshot = self.snapshot_path(kind)
+        if not snapshot.exists():
+            return 0, load_json(self.path(kind))
+        
+        records = iter_jsonl(snapshot)
+        header = next(records)
+        return header['seq'], list(records)
+    
+    def _snapshot_seq(self, kind):
+        """رقم آخر عملية مضمنة في اللقطة (يقرأ السطر الأول فقط)"""
+        snapshot = self.snapshot_path(kind)
+        if not snapshot.exists():
+            return 0
+        with open(snapshot, 'r', encoding='utf-8') as f:
+            return json.loads(f.readline())['seq']
+    
+    def _last_seq(self, kind):
+        """رقم آخر عملية في السجل دون قراءة السجل كاملاً"""
+        journal = self.journal_path(kind)
+        if not journal.exists() or journal.stat().st_size == 0:
+            return self._snapshot_seq(kind)
+        with open(journal, 'rb') as f:
+            position = f.seek(0, os.SEEK_END)
+            tail = b''
+            # القراءة من النهاية بكتل حتى نحصل على السطر الأخير كاملاً
+            while position > 0 and tail.rstrip(b'\n').count(b'\n') == 0:
+                step = min(65536, position)
+                position -= step
+                f.seek(position)
+                tail = f.read(step) + tail
+        last_line = tail.rstrip(b'\n').rsplit(b'\n', 1)[-1]
+        return json.loads(last_line)['seq']
+    
+    def load(self, kind):
+        """إعادة بناء الحالة من اللقطة ثم تطبيق عمليات السجل اللاحقة لها"""
+        key = ('journal', kind)
+        records = self.cache.get(key, self._state_files(kind))
+        if records is not None:
+            return records
+        
+        seq, records = self._read_snapshot(kind)
+        journal = self.journal_path(kind)
+        if journal.exists():
+            apply_operations(records, (entry for entry in iter_jsonl(journal) if entry['seq'] > seq))
+        self.cache.put(key, self._state_files(kind), records)
+        return records
+    
+    def _modify(self, kind, entries):
+        """إلحاق عمليات بالسجل، ثم الضغط إذا تجاوز السجل الحد المحدد"""
+        key = ('journal', kind)
+        records = self.cache.get(key, self._state_files(kind))
+        
+        seq = self._last_seq(kind)
+        lines = []
+        for entry in entries:
+            seq += 1
+            lines.append(json.dumps({'seq': seq, **entry}, ensure_ascii=False))
+        
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        with open(self.journal_path(kind), 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        metrics.wrote(nbytes=len(data))
+        
+        # تحديث الحالة المحفوظة في الذاكرة بدلاً من إعادة قراءة السجل
+        if records is not None:
+            apply_operations(records, entries)
+            self.cache.put(key, self._state_files(kind), records)
+        
+        if seq - self._snapshot_seq(kind) >= self.compact_every:
+            self.compact_kind(kind)
+    
+    def compact_kind(self, kind):
+        """ضغط سجل نوع واحد: كتابة لقطة جديدة وملف JSON المصدَّر ثم تفريغ السجل"""
+        records = self.load(kind)
+        seq = self._last_seq(kind)
+        
+        # الكتابة في ملف مؤقت ثم الاستبدال حتى لا تُفقد اللقطة السابقة
+        snapshot = self.snapshot_path(kind)
+        with atomic_open(snapshot) as f:
+            f.write(json.dumps({'seq': seq}) + '\n')
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        metrics.wrote(snapshot)
+        
+        # العمليات التي رقمها <= seq مضمنة في اللقطة، لذا تفريغ السجل آمن
+        save_json(self.path(kind), records)
+        open(self.journal_path(kind), 'w').close()
+        self.cache.put(('journal', kind), self._state_files(kind), records)
+    
+    def compact(self):
+        for kind in KINDS:
+            self.compact_kind(kind)
+
+
+class SqliteStorage:
+    """
+    تخزين في قاعدة SQLite مضمنة
+
+    الجداول مطابقة لجدولي categories و published_content في
+    database/schema/01_create_tables.sql (بأنواع SQLite بدلاً من UUID و JSONB)،
+    مع فهارس على slug والمجال والتاريخ. الاستعلامات (العد، قوائم المجالات،
+    البحث بالـ slug) تُنفذ في القاعدة دون تحميل المحتوى كاملاً في الذاكرة.
+    """
+    
+    name = 'sqlite'
+    
+    # قيمة PRAGMA user_version بعد استيراد data/*.json
+    JSON_IMPORTED = 1
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY,
+            slug VARCHAR(100) UNIQUE NOT NULL,
+            name_ar VARCHAR(255) NOT NULL,
+            name_en VARCHAR(255) NOT NULL,
+            color VARCHAR(50),
+            display_order INTEGER DEFAULT 0,
+            is_active BOOLEAN DEFAULT 1
+        );
+
+        CREATE TABLE IF NOT EXISTS published_content (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type VARCHAR(50) NOT NULL CHECK (type IN ('term', 'article')),
+            slug VARCHAR(500) NOT NULL,
+            title_ar VARCHAR(500) NOT NULL,
+            title_en VARCHAR(500),
+            category_id INTEGER REFERENCES categories(id),
+            content TEXT NOT NULL,
+            reading_time INTEGER,
+            published_at DATE,
+            is_active BOOLEAN DEFAULT 1
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_categories_slug ON categories(slug);
+        CREATE INDEX IF NOT EXISTS idx_published_content_slug ON published_content(type, slug);
+        CREATE INDEX IF NOT EXISTS idx_published_content_category ON published_content(type, category_id);
+        CREATE INDEX IF NOT EXISTS idx_published_content_published_at ON published_content(published_at DESC);
+    """
+    
+    def __init__(self, data_dir, categories):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(exist_ok=True)
+        self.db_path = self.data_dir / 'diwan.sqlite3'
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.executescript(self.SCHEMA)
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO categories (slug, name_ar, name_en, color, display_order) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(slug, c['ar'], c['en'], c['color'], order)
+                 for order, (slug, c) in enumerate(categories.items(), start=1)]
+            )
+        self._category_ids = dict(self.conn.execute("SELECT slug, id FROM categories"))
+        self._import_json_once()
+    
+    def _import_json_once(self):
+        """
+        استيراد data/*.json مرة واحدة عند إنشاء القاعدة
+        
+        يُسجل الاستيراد في PRAGMA user_version، فلا تُستورد الملفات مرة أخرى
+        إذا حُذف كل المحتوى لاحقاً. القواعد الأقدم التي فيها محتوى تُعلَّم
+        دون استيراد.
+        """
+        (version,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if version >= self.JSON_IMPORTED:
+            return
+        with self.conn:
+            if not self.conn.execute("SELECT 1 FROM published_content LIMIT 1").fetchone():
+                for kind in KINDS:
+                    json_path = self.data_dir / f"{kind}.json"
+                    if json_path.exists():
+                        self._insert(kind, load_json(json_path))
+            self.conn.execute(f"PRAGMA user_version = {self.JSON_IMPORTED}")
+    
+    def _row(self, kind, record):
+        """تحويل سجل إلى قيم أعمدة published_content"""
+        return (
+            CONTENT_TYPES[kind],
+            record['slug'],
+            record.get('title_ar') or record.get('title', ''),
+            record.get('title_en'),
+            self._category_ids.get(record.get('category')),
+            json.dumps(record, ensure_ascii=False),
+            record.get('reading_time'),
+            iso_date(record.get('date')),
+        )
+    
+    def load(self, kind):
+        rows = self.conn.execute(
+            "SELECT content FROM published_content WHERE type = ? ORDER BY id",
+            (CONTENT_TYPES[kind],)
+        )
+        return [json.loads(content) for (content,) in rows]
+    
+    def save(self, kind, records):
+        with self.conn:
+            self.conn.execute("DELETE FROM published_content WHERE type = ?", (CONTENT_TYPES[kind],))
+            self._insert(kind, records)
+    
+    def _insert(self, kind, records):
+        self.conn.executemany(
+            "INSERT INTO published_content "
+            "(type, slug, title_ar, title_en, category_id, content, reading_time, published_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._row(kind, r) for r in records)
+        )
+    
+    def append(self, kind, records):
+        with self.conn:
+            self._insert(kind, records)
+    
+    def _first_id(self, kind, slug):
+        row = self.conn.execute(
+            "SELECT id FROM published_content WHERE type = ? AND slug = ? ORDER BY id LIMIT 1",
+            (CONTENT_TYPES[kind], slug)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def replace(self, kind, slug, record):
+        row_id = self._first_id(kind, slug)
+        if row_id is None:
+            return
+        with self.conn:
+            self.conn.execute(
+                "UPDATE published_content SET type = ?, slug = ?, title_ar = ?, title_en = ?, "
+                "category_id = ?, content = ?, reading_time = ?, published_at = ? WHERE id = ?",
+                self._row(kind, record) + (row_id,)
+            )
+    
+    def replace_many(self, kind, records):
+        with self.conn:
+            for record in records:
+                row_id = self._first_id(kind, record['slug'])
+                if row_id is None:
+                    continue
+                self.conn.execute(
+                    "UPDATE published_content SET type = ?, slug = ?, title_ar = ?, title_en = ?, "
+                    "category_id = ?, content = ?, reading_time = ?, published_at = ? WHERE id = ?",
+                    self._row(kind, record) + (row_id,)
+                )
+    
+    def remove(self, kind, slug):
+        row_id = self._first_id(kind, slug)
+        if row_id is None:
+            return
+        with self.conn:
+            self.conn.execute("DELETE FROM published_content WHERE id = ?", (row_id,))
+    
+    def find(self, kind, slug):
+        row = self.conn.execute(
+            "SELECT content FROM published_content WHERE type = ? AND slug = ? ORDER BY id LIMIT 1",
+            (CONTENT_TYPES[kind], slug)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def count(self, kind, category=None):
+        if category is None:
+            query, params = "SELECT COUNT(*) FROM published_content WHERE type = ?", (CONTENT_TYPES[kind],)
+        else:
+            query = "SELECT COUNT(*) FROM published_content WHERE type = ? AND category_id = ?"
+            params = (CONTENT_TYPES[kind], self._category_ids.get(category))
+        return self.conn.execute(query, params).fetchone()[0]
+    
+    def list_category(self, kind, category):
+        rows = self.conn.execute(
+            "SELECT content FROM published_content WHERE type = ? AND category_id = ? ORDER BY id",
+            (CONTENT_TYPES[kind], self._category_ids.get(category))
+        )
+        return [json.loads(content) for (content,) in rows]
+    
+    def export_json(self):
+        """تصدير المحتوى إلى data/terms.json و data/articles.json"""
+        for kind in KINDS:
+            save_json(self.data_dir / f"{kind}.json", self.load(kind))
+    
+    def compact(self):
+        self.conn.execute("VACUUM")
+    
+    def close(self):
+        self.conn.close()
+
+
+STORAGE_BACKENDS = ('json', 'journal', 'sqlite')
+
+
+def create_storage(name, data_dir, categories, compact_every=1000, cache=None):
+    """إنشاء طبقة التخزين المطلوبة بالاسم"""
+    if name == 'json':
+        return JsonStorage(data_dir, cache=cache)
+    if name == 'journal':
+        return JournalStorage(data_dir, compact_every=compact_every, cache=cache)
+    if name == 'sqlite':
+        return SqliteStorage(data_dir, categories)
+    raise ValueError(f"نمط التخزين غير صحيح. الأنماط المتاحة: {list(STORAGE_BACKENDS)}")
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+خادم التطوير المحلي لمنصة ديوان الانفراد
+Local Development Server for Diwan Al-Infirad Platform
+
+يخدم الموقع محلياً ويراقب data/ والقوالب وملفات الوسائط. عند أي تغيير
+يعيد تشغيل الجزء المتأثر فقط من البناء، ثم يطلب من المتصفحات المفتوحة
+إعادة تحميل الصفحة:
+    - data/ و images/: ContentManager.build() (تدريجي حسب بصمات السجلات)،
+      بقوائم المحتوى ذي الصلة المحفوظة. تُحدَّث القوائم في الخلفية، فإذا
+      تغيرت يُعاد بناء الصفحات المتأثرة وتحميلها مرة ثانية
+    - ملفات Python (القوالب في site_templates.py وغيرها): إعادة تشغيل
+      الخادم ثم بناء كامل، لأن الصفحات المولدة تعتمد على الشيفرة نفسها
+    - HTML و CSS و JS المكتوبة يدوياً: إعادة التحميل فقط (أو مرحلة النشر
+      مع --dist)
+
+المراقبة عبر إشعارات نظام الملفات (watchdog) إن كانت مثبتة، وإلا بفحص
+دوري لأوقات التعديل. ما يكتبه البناء نفسه (الصفحات المولدة، و
+search-data.json، و dist/، وبيانات data/ مثل *manifest*) لا يطلق بناءً آخر. كل استجابة تحمل ETag، وتُرسل النسخ المضغوطة مسبقاً
+(.br و .gz) إن وُجدت. إعادة التحميل عبر Server-Sent Events على
+/__livereload، بسكربت صغير يُضاف إلى صفحات HTML عند خدمتها فقط. إذا فشل
+البناء (مثل ملف JSON محفوظ جزئياً) يُسجل الخطأ ويظهر في المتصفح، ويستمر
+الخادم في المراقبة حتى يُصلح الملف.
+
+الاستخدام:
+    python3 add_content.py serve [--port 8000] [--dist]
+"""
+
+import gzip
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from content_storage import file_signature
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog غير مثبت: فحص دوري
+    Observer = None
+
+logger = logging.getLogger(__name__)
+
+LIVERELOAD_PATH = '/__livereload'
+LIVERELOAD_SCRIPT = (
+    "<script>(function(){var ready=false,source=new EventSource('" + LIVERELOAD_PATH + "');"
+    "source.onopen=function(){if(ready){location.reload()}ready=true};"
+    "source.onmessage=function(){location.reload()};"
+    "source.addEventListener('build-error',function(e){var box=document.getElementById('__build_error')"
+    "||document.body.appendChild(document.createElement('pre'));box.id='__build_error';"
+    "box.style.cssText='position:fixed;top:0;left:0;right:0;z-index:99999;margin:0;padding:1em;"
+    "background:#b00020;color:#fff;direction:ltr;white-space:pre-wrap';box.textContent=e.data})})();</script>"
+)
+
+# المدة التي تُجمع فيها التغييرات المتتالية (مثل حفظ المحرر لعدة ملفات) قبل البناء
+DEBOUNCE = 0.1
+POLL_INTERVAL = 0.3
+
+WATCHED_DIRS = ('data', 'images', 'assets')
+IGNORED_DIRS = {'dist', '__pycache__', '.git', 'variants', 'node_modules', 'backend', 'benchmarks', 'spool'}
+
+# يكتبه تحديث المحتوى ذي الصلة في الخلفية، ثم يطلب بناء الصفحات المتأثرة
+RELATED_OUTPUT = 'data/related.json'
+
+# ملفات في data/ يكتبها البناء نفسه، فلا تطلق بناءً جديداً (ومعها جميع *manifest*)
+BUILD_OUTPUTS = {'stats.json', 'slug-index.json', 'sync-state.json', 'related.json', '.lock'}
+
+# ملفات ينشئها البناء في الجذر: صفحات السجلات والقوائم (بأرقام صفحاتها)،
+# وبيانات البحث، وخريطة الموقع والخلاصة (انظر content_manager و site_sitemap)
+GENERATED_FILES = re.compile(
+    r'(?:term|article|category)-.+\.html|(?:terms-list|articles)(?:-\d+)?\.html'
+    r'|search-data\.json|sitemap(?:-\d+)?\.xml|feed\.xml'
+)
+# صفحات مكتوبة يدوياً يحدّث البناء عداداتها: يُتجاهل حدثها إذا لم تتغير منذ آخر بناء
+PATCHED_PAGES = ('index.html', 'categories.html')
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+
+
+# ------------------------------------------------------------------
+# المراقبة
+# ------------------------------------------------------------------
+
+def _relevant(base_dir, path):
+    """هل يؤثر تغيير الملف في الموقع"""
+    try:
+        parts = Path(path).resolve().relative_to(base_dir).parts
+    except ValueError:
+        return False
+    if not parts or IGNORED_DIRS.intersection(parts) or parts[-1].endswith(('.tmp', '.pyc', '~')):
+        return False
+    if parts[0] == 'data':
+        return (parts[-1] not in BUILD_OUTPUTS and 'manifest' not in parts[-1]
+                and not parts[-1].endswith(('-journal', '-wal', '-shm')))
+    if len(parts) == 1:
+        return not GENERATED_FILES.fullmatch(parts[0])
+    return parts[0] in WATCHED_DIRS
+
+
+def _snapshot(base_dir):
+    """أوقات تعديل الملفات المراقبة وأحجامها (للفحص الدوري)"""
+    snapshot = {}
+    stack = [base_dir]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in IGNORED_DIRS and (directory != base_dir or entry.name in WATCHED_DIRS):
+                    stack.append(entry.path)
+            elif _relevant(base_dir, entry.path):
+                stat = entry.stat()
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+class Watcher:
+    """يجمع مسارات الملفات المتغيرة من watchdog أو من الفحص الدوري"""
+    
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir).resolve()
+        self.changed = set()
+        # تغييرات مطلوبة من داخل الخادم (لا يمسحها resync)
+        self.pushed = set()
+        self.condition = threading.Condition()
+        self.mode = 'watchdog' if Observer is not None else 'polling'
+        self._previous = {}
+        self._epoch = 0
+        # بصمات PATCHED_PAGES بعد آخر بناء (أحداث watchdog قد تصل بعد resync)
+        self._patched = {}
+    
+    def notify(self, path):
+        if _relevant(self.base_dir, path) and not self._written_by_build(path):
+            with self.condition:
+                self.changed.add(str(path))
+                self.condition.notify()
+    
+    def start(self):
+        if Observer is not None:
+            watcher = self
+            
+            class Handler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if not event.is_directory:
+                        watcher.notify(event.src_path)
+                        if getattr(event, 'dest_path', None):
+                            watcher.notify(event.dest_path)
+            
+            observer = Observer()
+            observer.schedule(Handler(), str(self.base_dir), recursive=True)
+            observer.daemon = True
+            observer.start()
+        else:
+            threading.Thread(target=self._poll, daemon=True).start()
+    
+    def _written_by_build(self, path):
+        path = Path(path)
+        return path.name in self._patched and self._patched[path.name] == file_signature(path)
+    
+    def _poll(self):
+        self.resync()
+        while True:
+            time.sleep(POLL_INTERVAL)
+            epoch = self._epoch
+            current = _snapshot(self.base_dir)
+            with self.condition:
+                # أُخذت لقطة جديدة أثناء الفحص (resync)، فهذه اللقطة قديمة
+                if epoch != self._epoch:
+                    continue
+                changed = [path for path in set(self._previous) | set(current)
+                           if self._previous.get(path) != current.get(path)]
+                self._previous = current
+                if changed:
+                    self.changed.update(changed)
+                    self.condition.notify()
+    
+    def push(self, path):
+        """طلب بناء لملف كتبه الخادم نفسه (مثل RELATED_OUTPUT)"""
+        with self.condition:
+            self.pushed.add(str(self.base_dir / path))
+            self.condition.notify()
+    
+    def wait(self):
+        """انتظار تغيير، ثم جمع ما يتبعه خلال DEBOUNCE؛ يعيد المسارات النسبية"""
+        with self.condition:
+            while not self.changed and not self.pushed:
+                self.condition.wait()
+        time.sleep(DEBOUNCE)
+        return self.drain()
+    
+    def drain(self):
+        with self.condition:
+            changed = self.changed | self.pushed
+            self.changed, self.pushed = set(), set()
+        return {Path(path).resolve().relative_to(self.base_dir).as_posix() for path in changed}
+    
+    def resync(self):
+        """تجاهل التغييرات حتى الآن (مثل الملفات التي كتبها البناء نفسه)"""
+        snapshot = _snapshot(self.base_dir) if self.mode == 'polling' else None
+        patched = {name: file_signature(self.base_dir / name) for name in PATCHED_PAGES}
+        with self.condition:
+            if snapshot is not None:
+                self._previous = snapshot
+                self._epoch += 1
+            else:
+                self._patched = patched
+            self.changed.clear()
+
+
+class RelatedRefresh:
+    """
+    تحديث data/related.json في الخلفية بعد بناء تغيير في data/
+
+    الحساب قد يستغرق ثوانٍ مع محتوى كبير، فلا ينتظره البناء الفوري. إذا
+    تغير الملف يُطلب من المراقب بناء آخر (RELATED_OUTPUT) يعيد إنشاء
+    الصفحات التي تغيرت قوائمها فقط. الطلبات أثناء الحساب تُجمع في حساب واحد بعده.
+    """
+    
+    def __init__(self, base_dir, storage, watcher):
+        self.base_dir = base_dir
+        self.storage = storage
+        self.watcher = watcher
+        self.requested = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+    
+    def request(self):
+        self.requested.set()
+    
+    def _run(self):
+        from content_manager import ContentManager
+        
+        # مدير مستقل: FileLock ليس آمناً بين الخيوط، وقفل flock يفصل بين الملفين المفتوحين
+        manager = ContentManager(self.base_dir, storage=self.storage)
+        while True:
+            self.requested.wait()
+            self.requested.clear()
+            started = time.perf_counter()
+            signature = file_signature(self.base_dir / RELATED_OUTPUT)
+            try:
+                manager.build_related()
+            except Exception as e:
+                logger.error("❌ فشل تحديث المحتوى ذي الصلة: %s: %s", type(e).__name__, e)
+                continue
+            if file_signature(self.base_dir / RELATED_OUTPUT) != signature:
+                logger.info("🔗 المحتوى ذو الصلة: %.0f م.ث", (time.perf_counter() - started) * 1000)
+                self.watcher.push(RELATED_OUTPUT)
+
+
+# ------------------------------------------------------------------
+# إعادة التحميل في المتصفح
+# ------------------------------------------------------------------
+
+class LiveReload:
+    """عداد إعادة التحميل الذي تنتظره اتصالات /__livereload (مع خطأ آخر بناء إن فشل)"""
+    
+    def __init__(self):
+        self.generation = 0
+        self.error = None
+        self.condition = threading.Condition()
+    
+    def reload(self):
+        with self.condition:
+            self.generation += 1
+            self.error = None
+            self.condition.notify_all()
+    
+    def fail(self, message):
+        """إبلاغ المتصفحات بفشل البناء بدلاً من إعادة التحميل"""
+        with self.condition:
+            self.generation += 1
+            self.error = message
+            self.condition.notify_all()
+    
+    def wait(self, generation, timeout=15):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout=timeout)
+            return self.generation
+
+
+# ------------------------------------------------------------------
+# الخادم
+# ------------------------------------------------------------------
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """خدمة الملفات مع ETag والنسخ المضغوطة مسبقاً وحقن سكربت إعادة التحميل"""
+    
+    livereload = None
+    
+    def log_message(self, format, *args):
+        # سجل الطلبات الناجحة مزعج أثناء التطوير
+        if not (args and str(args[1]).startswith(('2', '3'))):
+            super().log_message(format, *args)
+    
+    def do_GET(self):
+        if urlsplit(self.path).path == LIVERELOAD_PATH:
+            return self._event_stream()
+        self._serve_file()
+    
+    def do_HEAD(self):
+        self._serve_file(send_body=False)
+    
+    def _serve_file(self, send_body=True):
+        
+        filepath = Path(self.translate_path(self.path))
+        if filepath.is_dir():
+            filepath = filepath / 'index.html'
+        signature = file_signature(filepath)
+        if signature is None:
+            return self.send_error(HTTPStatus.NOT_FOUND)
+        
+        content_type = self.guess_type(str(filepath))
+        accepted = self.headers.get('Accept-Encoding', '')
+        is_html = content_type == 'text/html'
+        encoding, body_path = None, filepath
+        if not is_html:
+            for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+                sibling = filepath.with_name(filepath.name + suffix)
+                sibling_signature = file_signature(sibling)
+                if candidate in accepted and sibling_signature and sibling_signature[0] >= signature[0]:
+                    encoding, body_path = candidate, sibling
+                    break
+        
+        etag = f'"{signature[0]:x}-{signature[1]:x}{"-" + encoding if encoding else ""}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        
+        body = body_path.read_bytes()
+        if is_html:
+            body = body.replace(b'</body>', LIVERELOAD_SCRIPT.encode('utf-8') + b'</body>', 1)
+        if encoding is None and 'gzip' in accepted and content_type.startswith(COMPRESSIBLE_TYPES):
+            encoding, body = 'gzip', gzip.compress(body, compresslevel=5)
+        
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8' if content_type.startswith('text/')
+                         else content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+    
+    def _event_stream(self):
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        generation = self.livereload.generation
+        try:
+            if self.livereload.error:
+                self.wfile.write(_error_event(self.livereload.error))
+            while True:
+                current = self.livereload.wait(generation)
+                # سطر تعليق للإبقاء على الاتصال، أو حدث إعادة التحميل أو فشل البناء
+                if current == generation:
+                    self.wfile.write(b': ping\n\n')
+                elif self.livereload.error:
+                    self.wfile.write(_error_event(self.livereload.error))
+                else:
+                    self.wfile.write(b'data: reload\n\n')
+                self.wfile.flush()
+                generation = current
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _error_event(message):
+    lines = ''.join(f"data: {line}\n" for line in message.splitlines() or [''])
+    return f"event: build-error\n{lines}\n".encode('utf-8')
+
+
+def rebuild(manager, changed, dist=False, retry=False):
+    """
+    إعادة تشغيل الجزء المتأثر من البناء؛ يعيد True إذا يجب إعادة تشغيل الخادم
+
+    ملفات Python تتطلب إعادة تشغيل العملية لتحميل الشيفرة الجديدة. retry:
+    البناء السابق فشل، فيُعاد كاملاً مهما كان التغيير.
+    """
+    if any(path.endswith('.py') for path in changed):
+        return True
+    if retry or any(path.startswith(('data/', 'images/')) for path in changed):
+        manager.build(publish=dist, related=False)
+    elif dist:
+        manager.build_dist()
+    return False
+
+
+def _safe_build(livereload, names, function, *args, **kwargs):
+    """
+    تشغيل البناء دون إيقاف الخادم عند فشله (مثل JSON محفوظ جزئياً أو سجل
+    غير صالح): يُسجل الخطأ ويُرسل إلى المتصفحات. يعيد (هل نجح، النتيجة)
+    """
+    try:
+        return True, function(*args, **kwargs)
+    except Exception as e:
+        message = f"{type(e).__name__}: {e}"
+        logger.error("❌ فشل البناء (%s): %s", names, message)
+        livereload.fail(f"Build failed ({names})\n{message}")
+        return False, None
+
+
+def serve(base_dir='.', port=8000, host='127.0.0.1', storage='json', dist=False):
+    """
+    تشغيل خادم التطوير
+
+    dist=True يخدم dist/ (الناتج المصغر ذو البصمات) ويشغل مرحلة النشر بعد
+    كل تغيير، وإلا تُخدم ملفات المصدر مباشرة (أسرع).
+    """
+    from content_manager import ContentManager
+    
+    base_dir = Path(base_dir).resolve()
+    manager = ContentManager(base_dir, storage=storage)
+    livereload = LiveReload()
+    # بعد إعادة التشغيل بسبب تعديل الشيفرة يُعاد بناء جميع الصفحات
+    force = os.environ.pop('DIWAN_DEV_FORCE_BUILD', None) == '1'
+    ok, _ = _safe_build(livereload, 'startup', manager.build, force=force, publish=dist)
+    failed = not ok
+    
+    root = base_dir / 'dist' if dist else base_dir
+    handler = type('Handler', (DevRequestHandler,), {'livereload': livereload})
+    server = ThreadingHTTPServer((host, port), partial(handler, directory=str(root)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    watcher = Watcher(base_dir)
+    watcher.start()
+    related = RelatedRefresh(base_dir, storage, watcher)
+    logger.info("🌐 خادم التطوير: http://%s:%d/ (المراقبة: %s)", host, port, watcher.mode)
+    
+    try:
+        while True:
+            changed = watcher.wait()
+            started = time.perf_counter()
+            names = ', '.join(sorted(changed)[:3]) + (' ...' if len(changed) > 3 else '')
+            ok, restart = _safe_build(livereload, names, rebuild, manager, changed, dist, failed)
+            # بعد الفشل لا resync حتى لا يضيع الحفظ التالي، والتغيير القادم يعيد المحاولة
+            failed = not ok
+            if failed:
+                continue
+            if restart:
+                logger.info("♻️ تغيرت الشيفرة: إعادة تشغيل الخادم")
+                server.server_close()
+                os.environ['DIWAN_DEV_FORCE_BUILD'] = '1'
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+            # التغييرات التي كتبها البناء نفسه لا تطلق بناءً آخر
+            watcher.resync()
+            livereload.reload()
+            if any(path.startswith('data/') and path != RELATED_OUTPUT for path in changed):
+                related.request()
+            logger.info("🔄 %s: %.0f م.ث", names, (time.perf_counter() - started) * 1000)
+    except KeyboardInterrupt:
+        server.shutdown()
+        logger.info("👋 تم إيقاف خادم التطوير")
@@ -3,9 +3,14 @@
 """
 مثال عملي على استخدام نظام إدارة المحتوى
 Practical Example of Content Management System Usage
+
+    python3 example_usage.py [--yes]   # --yes: بدون سؤال التأكيد (للسكربتات)
 """
 
+import sys
+
 from content_manager import ContentManager
+from content_metrics import setup_logging
 
 def example_add_term():
     """مثال على إضافة مصطلح جديد"""
@@ -112,6 +117,7 @@ def show_final_stats():
     print(f"📊 إجمالي المحتوى: {stats['terms_count'] + stats['articles_count']}")
 
 if __name__ == "__main__":
+    setup_logging()
     print("\n" + "="*60)
     print("🌟 أمثلة عملية على استخدام نظام إدارة المحتوى 🌟")
     print("="*60)
@@ -120,7 +126,10 @@ if __name__ == "__main__":
     print("\n⚠️  تنبيه: هذا السكريبت سيضيف محتوى فعلي إلى المنصة!")
     print("   إذا كنت تريد التجربة فقط، راجع الكود أولاً.")
     
-    response = input("\nهل تريد المتابعة؟ (y/n): ").strip().lower()
+    if '--yes' in sys.argv[1:]:
+        response = 'y'
+    else:
+        response = input("\nهل تريد المتابعة؟ (y/n): ").strip().lower()
     
     if response == 'y':
         # مثال 1: إضافة مصطلح
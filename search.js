@@ -1,11 +1,39 @@
 // Real Search Functionality for Infirad Diwan Platform
 let searchData = null;
 
+// Sorted inverted-index keys per content type, for prefix lookups
+let indexKeys = null;
+
+// Definite-article prefixes stripped from index keys (see content_search.py)
+const ARTICLE_PREFIXES = ['وال', 'بال', 'كال', 'فال', 'لل', 'ال'];
+
+// Published name of search-data.json: it changes with the content, so it is read
+// from the short-lived asset-manifest.json (see site_fingerprint.py) rather than
+// embedded here. Without a manifest (development server) the source name is used.
+async function searchDataUrl() {
+    try {
+        const response = await fetch('asset-manifest.json', { cache: 'no-cache' });
+        if (response.ok) {
+            const assets = await response.json();
+            return assets['search-data.json'] || 'search-data.json';
+        }
+    } catch (error) {
+        // No manifest: fall through to the source name
+    }
+    return 'search-data.json';
+}
+
 // Load search data on page load
 async function loadSearchData() {
     try {
-        const response = await fetch('search-data.json');
+        const response = await fetch(await searchDataUrl());
         searchData = await response.json();
+        if (searchData.index) {
+            indexKeys = {
+                terms: Object.keys(searchData.index.terms || {}).sort(),
+                articles: Object.keys(searchData.index.articles || {}).sort()
+            };
+        }
         console.log('Search data loaded successfully');
     } catch (error) {
         console.error('Error loading search data:', error);
@@ -25,6 +53,54 @@ function normalizeArabic(text) {
         .trim();
 }
 
+// Strip the definite article from a normalized token, as the index does
+function stripArticle(token) {
+    for (const prefix of ARTICLE_PREFIXES) {
+        if (token.startsWith(prefix) && token.length - prefix.length >= 2) {
+            return token.slice(prefix.length);
+        }
+    }
+    return token;
+}
+
+// Ids of documents that have an index key starting with the token
+function lookupPrefix(kind, token) {
+    const keys = indexKeys[kind];
+    const postings = searchData.index[kind];
+    const ids = new Set();
+
+    // Binary search for the first key >= token
+    let low = 0;
+    let high = keys.length;
+    while (low < high) {
+        const mid = (low + high) >> 1;
+        if (keys[mid] < token) {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
+    }
+
+    for (let i = low; i < keys.length && keys[i].startsWith(token); i++) {
+        postings[keys[i]].forEach(id => ids.add(id));
+    }
+    return ids;
+}
+
+// Documents matching every query word, or all documents for old search-data.json files
+function findCandidates(kind, normalizedQuery) {
+    const docs = searchData[kind];
+    if (!indexKeys) return docs;
+
+    let ids = null;
+    normalizedQuery.split(/\s+/).forEach(token => {
+        const tokenIds = lookupPrefix(kind, stripArticle(token));
+        ids = ids === null ? tokenIds : new Set([...ids].filter(id => tokenIds.has(id)));
+    });
+
+    return [...(ids || [])].sort((a, b) => a - b).map(id => docs[id]);
+}
+
 // Search function
 function performSearch(query) {
     if (!searchData || !query || query.length < 2) {
@@ -34,12 +110,14 @@ function performSearch(query) {
     const normalizedQuery = normalizeArabic(query);
     const results = { terms: [], articles: [] };
 
-    // Search in terms
-    searchData.terms.forEach(term => {
-        const normalizedTitle = normalizeArabic(term.title);
-        const normalizedEnglish = normalizeArabic(term.englishTitle);
-        const normalizedDefinition = normalizeArabic(term.definition);
-        const normalizedCategory = normalizeArabic(term.category);
+    // Search in terms (fields are pre-normalized by the content manager)
+    findCandidates('terms', normalizedQuery).forEach(term => {
+        const normalized = term.normalized || {};
+        const normalizedTitle = normalized.title ?? normalizeArabic(term.title);
+        const normalizedEnglish = normalized.englishTitle ?? normalizeArabic(term.englishTitle);
+        const normalizedDefinition = normalized.definition ?? normalizeArabic(term.definition);
+        const normalizedCategory = normalized.category ?? normalizeArabic(term.category);
+        const normalizedKeywords = normalized.keywords ?? term.keywords.map(normalizeArabic);
         
         // Check if query matches title, english title, definition, category, or keywords
         const matchScore = 
@@ -47,7 +125,7 @@ function performSearch(query) {
             (normalizedEnglish.includes(normalizedQuery) ? 8 : 0) +
             (normalizedDefinition.includes(normalizedQuery) ? 5 : 0) +
             (normalizedCategory.includes(normalizedQuery) ? 3 : 0) +
-            (term.keywords.some(kw => normalizeArabic(kw).includes(normalizedQuery)) ? 7 : 0);
+            (normalizedKeywords.some(kw => kw.includes(normalizedQuery)) ? 7 : 0);
 
         if (matchScore > 0) {
             results.terms.push({ ...term, matchScore });
@@ -55,16 +133,18 @@ function performSearch(query) {
     });
 
     // Search in articles
-    searchData.articles.forEach(article => {
-        const normalizedTitle = normalizeArabic(article.title);
-        const normalizedSummary = normalizeArabic(article.summary);
-        const normalizedCategory = normalizeArabic(article.category);
+    findCandidates('articles', normalizedQuery).forEach(article => {
+        const normalized = article.normalized || {};
+        const normalizedTitle = normalized.title ?? normalizeArabic(article.title);
+        const normalizedSummary = normalized.summary ?? normalizeArabic(article.summary);
+        const normalizedCategory = normalized.category ?? normalizeArabic(article.category);
+        const normalizedKeywords = normalized.keywords ?? article.keywords.map(normalizeArabic);
         
         const matchScore = 
             (normalizedTitle.includes(normalizedQuery) ? 10 : 0) +
             (normalizedSummary.includes(normalizedQuery) ? 5 : 0) +
             (normalizedCategory.includes(normalizedQuery) ? 3 : 0) +
-            (article.keywords.some(kw => normalizeArabic(kw).includes(normalizedQuery)) ? 7 : 0);
+            (normalizedKeywords.some(kw => kw.includes(normalizedQuery)) ? 7 : 0);
 
         if (matchScore > 0) {
             results.articles.push({ ...article, matchScore });
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+إدارة ملفات الوسائط لمنصة ديوان الانفراد
+Asset Deduplication and Pruning for Diwan Al-Infirad Platform
+
+يحسب بصمة محتوى كل ملف في images/ و assets/، ويبني خريطة المراجع من
+صفحات HTML وملفات CSS و JS وحقول image في سجلات المحتوى، ثم:
+    - يدمج الملفات المتطابقة محتوىً في نسخة واحدة ويحدّث المراجع إليها
+    - يعرض (أو يحذف) الملفات التي لا تشير إليها أي صفحة
+
+الاستخدام:
+    python3 site_assets.py            # تقرير فقط
+    python3 site_assets.py --dedupe   # دمج النسخ المتطابقة
+    python3 site_assets.py --prune    # حذف الملفات غير المستخدمة
+
+الدمج يُبقي إحدى النسخ بمسارها الحالي (وليس باسم مشتق من البصمة) لأن
+حقول image في السجلات أسماء داخل images/.
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+from content_metrics import setup_logging
+from site_images import file_hash
+
+ASSET_ROOTS = ('images', 'assets')
+
+# مسار ملف وسائط داخل نص صفحة أو ملف CSS/JS (يشمل عناصر srcset)
+ASSET_REFERENCE = re.compile(r'''(?:\.\./)?((?:images|assets)/[^"'\s()<>,]+)''')
+
+# الملفات التي تُفحص بحثاً عن مراجع
+REFERENCING_PATTERNS = ('*.html', '*.css', '*.js')
+
+
+def scan_assets(base_dir):
+    """بصمة كل ملف وسائط: {المسار النسبي: البصمة}"""
+    base_dir = Path(base_dir)
+    assets = {}
+    for root in ASSET_ROOTS:
+        for path in sorted((base_dir / root).rglob('*')):
+            if path.is_file() and not path.name.endswith('.tmp'):
+                assets[path.relative_to(base_dir).as_posix()] = file_hash(path)
+    return assets
+
+
+def referencing_files(base_dir):
+    base_dir = Path(base_dir)
+    for pattern in REFERENCING_PATTERNS:
+        yield from sorted(base_dir.glob(pattern))
+
+
+def data_references(records_by_kind):
+    """مراجع حقول image في سجلات المحتوى: {المسار: [(النوع، slug)]}"""
+    references = {}
+    for kind, records in records_by_kind.items():
+        for record in records:
+            if record.get('image'):
+                references.setdefault(f"images/{record['image']}", []).append((kind, record['slug']))
+    return references
+
+
+def reference_graph(base_dir, data_refs):
+    """خريطة المراجع: {مسار الملف: مجموعة الملفات أو السجلات التي تشير إليه}"""
+    graph = {}
+    for filepath in referencing_files(base_dir):
+        text = filepath.read_text(encoding='utf-8', errors='replace')
+        for reference in set(ASSET_REFERENCE.findall(text)):
+            graph.setdefault(reference, set()).add(filepath.name)
+    for reference, records in data_refs.items():
+        graph.setdefault(reference, set()).update(f"{kind}/{slug}" for kind, slug in records)
+    return graph
+
+
+def duplicate_groups(assets, graph, data_refs=None):
+    """
+    مجموعات الملفات المتطابقة محتوىً، والنسخة المعتمدة أولاً في كل مجموعة
+
+    الأولوية للملف الذي تشير إليه بيانات المحتوى، ثم ما في images/، ثم
+    الملف المستخدم في الصفحات، ثم الترتيب الأبجدي.
+    """
+    data_refs = data_refs or {}
+    by_hash = {}
+    for path, digest in assets.items():
+        by_hash.setdefault(digest, []).append(path)
+    groups = []
+    for paths in by_hash.values():
+        if len(paths) > 1:
+            paths.sort(key=lambda p: (p not in data_refs, not p.startswith('images/'), p not in graph, p))
+            groups.append(paths)
+    return sorted(groups)
+
+
+def unreferenced(assets, graph):
+    """الملفات التي لا تشير إليها أي صفحة أو سجل"""
+    return [path for path in assets if path not in graph]
+
+
+def missing(assets, graph):
+    """مراجع لملفات غير موجودة"""
+    return sorted(reference for reference in graph if reference not in assets)
+
+
+def rewrite_references(base_dir, replacements):
+    """استبدال مراجع الملفات المكررة بالنسخة المعتمدة في ملفات HTML/CSS/JS؛ يعيد أسماء الملفات المعدلة"""
+    if not replacements:
+        return []
+    changed = []
+    for filepath in referencing_files(base_dir):
+        text = filepath.read_text(encoding='utf-8', errors='replace')
+        updated = ASSET_REFERENCE.sub(
+            lambda m: m.group(0).replace(m.group(1), replacements.get(m.group(1), m.group(1))), text)
+        if updated != text:
+            filepath.write_text(updated, encoding='utf-8')
+            changed.append(filepath.name)
+    return changed
+
+
+def size_of(base_dir, paths):
+    return sum((Path(base_dir) / path).stat().st_size for path in paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="دمج ملفات الوسائط المكررة وحذف غير المستخدمة")
+    parser.add_argument('--dedupe', action='store_true', help="دمج الملفات المتطابقة وتحديث المراجع")
+    parser.add_argument('--prune', action='store_true', help="حذف الملفات غير المستخدمة")
+    parser.add_argument('--base-dir', default='.')
+    args = parser.parse_args()
+    
+    from content_manager import ContentManager
+    setup_logging()
+    manager = ContentManager(args.base_dir)
+    manager.assets_report()
+    if args.dedupe:
+        manager.dedupe_assets()
+    if args.prune:
+        manager.prune_assets()
+
+
+if __name__ == "__main__":
+    main()
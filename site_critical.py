@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSS الحرج لكل نوع صفحة في منصة ديوان الانفراد
+Critical CSS Extraction and Unused-CSS Pruning for Diwan Al-Infirad Platform
+
+يُستخدم في مرحلة النشر (site_minify). لكل نوع صفحة (مصطلح، مقال، مجال،
+قائمة، الرئيسية، وغيرها) تُجمع أسماء الأصناف والمعرفات والوسوم من جميع
+صفحات ذلك النوع ومن ملفات JS (التي تضيف أصنافاً أثناء التشغيل)، ثم:
+    - تُكتب نسخة مقلصة من styles.css فيها القواعد المستخدمة فقط
+      (styles-term.css، styles-article.css، ...)
+    - تُضمَّن القواعد التي يحتاجها الجزء الأول من الصفحة (الترويسة وأول
+      قسم) في <style> داخل <head>، وتُحمَّل النسخة المقلصة دون أن تعطل العرض
+
+أوراق الأنماط الخارجية (Bootstrap و Font Awesome من CDN) لا يمكن تقليصها
+دون نسخة محلية: إذا وُضعت نسخة منها في assets/vendor/ باسم الملف نفسه
+تُعامل مثل styles.css، وإلا يبقى Bootstrap معطلاً للعرض (تخطيط الصفحة
+يعتمد عليه) وتُؤجَّل أوراق الأيقونات والخطوط.
+
+المطابقة تقريبية ومحافظة: يُبقى المحدد إذا وُجدت جميع أصنافه ومعرفاته
+ووسومه في صفحات النوع، بغض النظر عن ترتيبها.
+
+مجموعة المحددات المستخدمة لكل نوع تُحفظ بين البناءات ولا تنقص: الصفحة
+الجديدة تضيف إليها فقط ما لم يُستخدم من قبل، فتبقى الورقة المقلصة (واسمها
+ذو البصمة وصفحات النوع المشيرة إليها) كما هي في الحالة المعتادة. تُعاد
+المجموعة من الصفر فقط عند تغير أوراق الأنماط أو ملفات JS.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+STYLESHEET = 'styles.css'
+VENDOR_DIR = 'assets/vendor'
+
+# أوراق أنماط خارجية لا تؤثر في التخطيط، فتُحمَّل بعد العرض الأول
+DEFERRABLE = ('font-awesome', 'fonts.googleapis.com')
+
+# الأجزاء التي تكون دائماً في الشاشة الأولى: كل شيء حتى نهاية أول <section>
+FOLD_END = re.compile(r'</section\s*>', re.I)
+FOLD_FALLBACK = 12000
+
+HTML_TAG = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)')
+TOKEN = re.compile(r'[A-Za-z_][\w-]*')
+
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+SELECTOR_PARTS = re.compile(r'([.#]?)(-?[_a-zA-Z][\w-]*)')
+# الأصناف الزائفة والعناصر الزائفة ومحددات الخصائص لا تدخل في المطابقة
+SELECTOR_NOISE = re.compile(r'::?[\w-]+(\([^)]*\))?|\[[^\]]*\]')
+
+# المحددات الجذرية التي تلزم كل صفحة
+ALWAYS = {'*', 'html', 'body', ':root'}
+
+
+def page_type(filename):
+    """نوع الصفحة من اسم ملفها"""
+    if filename.startswith('term-'):
+        return 'term'
+    if filename.startswith('article-'):
+        return 'article'
+    if filename.startswith('category-'):
+        return 'category'
+    if filename.startswith(('terms-list', 'articles')):
+        return 'listing'
+    if filename == 'index.html':
+        return 'home'
+    return 'page'
+
+
+# ------------------------------------------------------------------
+# تحليل CSS
+# ------------------------------------------------------------------
+
+def parse_css(text):
+    """
+    تحليل CSS إلى قواعد: [(المحدد أو القاعدة @، المحتوى)]
+
+    محتوى @media و @supports قائمة قواعد متداخلة، ومحتوى غيرها نص التصريحات.
+    """
+    text = CSS_COMMENT.sub('', text)
+    rules, _ = _parse_block(text, 0)
+    return rules
+
+
+def _parse_block(text, i):
+    rules = []
+    n = len(text)
+    while i < n:
+        start = i
+        while i < n and text[i] not in '{}':
+            if text[i] in '"\'':
+                i = _skip_string(text, i)
+            else:
+                i += 1
+        if i >= n or text[i] == '}':
+            return rules, i + 1
+        prelude = text[start:i].strip()
+        if prelude.startswith(('@media', '@supports')):
+            body, i = _parse_block(text, i + 1)
+        else:
+            end = i + 1
+            depth = 1
+            while end < n and depth:
+                if text[end] in '"\'':
+                    end = _skip_string(text, end)
+                    continue
+                depth += {'{': 1, '}': -1}.get(text[end], 0)
+                end += 1
+            body = text[i + 1:end - 1].strip()
+            i = end
+        rules.append((prelude, body))
+    return rules, i
+
+
+def _skip_string(text, i):
+    quote = text[i]
+    i += 1
+    while i < len(text) and text[i] != quote:
+        i += 2 if text[i] == '\\' else 1
+    return i + 1
+
+
+def serialize_css(rules):
+    out = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            if body:
+                out.append(f"{prelude}{{{serialize_css(body)}}}")
+        else:
+            out.append(f"{prelude}{{{body}}}")
+    return ''.join(out)
+
+
+# ------------------------------------------------------------------
+# المطابقة
+# ------------------------------------------------------------------
+
+def page_tokens(html):
+    """الأصناف والمعرفات ونصوص الصفحة (مجموعة الكلمات) والوسوم المستخدمة"""
+    return set(TOKEN.findall(html)), {tag.lower() for tag in HTML_TAG.findall(html)}
+
+
+def selector_used(selector, words, tags):
+    """هل يمكن أن يطابق المحدد عنصراً في الصفحات (تقريبياً)"""
+    selector = selector.strip()
+    if selector in ALWAYS:
+        return True
+    for prefix, name in SELECTOR_PARTS.findall(SELECTOR_NOISE.sub(' ', selector)):
+        if prefix and name not in words:
+            return False
+        if not prefix and name.lower() not in tags and name.lower() not in ALWAYS:
+            return False
+    return True
+
+
+def used_selectors(rules, words, tags):
+    """المحددات (نصوصها) التي يمكن أن تطابق الصفحات في جميع القواعد"""
+    used = set()
+    for prelude, body in rules:
+        if isinstance(body, list):
+            used |= used_selectors(body, words, tags)
+        elif not prelude.startswith('@'):
+            used.update(s.strip() for s in prelude.split(',') if selector_used(s, words, tags))
+    return used
+
+
+def prune_rules(rules, used):
+    """القواعد التي تقع محدداتها في used (مع حذف المحددات غير المستخدمة من كل قائمة)"""
+    kept = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            kept.append((prelude, prune_rules(body, used)))
+        elif prelude.startswith('@'):
+            kept.append((prelude, body))
+        else:
+            selectors = [s.strip() for s in prelude.split(',') if s.strip() in used]
+            if selectors:
+                kept.append((','.join(selectors), body))
+    # @keyframes التي لا تستخدمها أي قاعدة باقية
+    used = serialize_css([rule for rule in kept if not rule[0].startswith('@keyframes')])
+    return [(prelude, body) for prelude, body in kept
+            if not prelude.startswith('@keyframes') or prelude.split()[-1] in used]
+
+
+def above_the_fold(html):
+    """الجزء الأول من الصفحة: حتى نهاية أول <section> (أو أول FOLD_FALLBACK حرف)"""
+    match = FOLD_END.search(html)
+    return html[:match.end()] if match else html[:FOLD_FALLBACK]
+
+
+# ------------------------------------------------------------------
+# أوراق الأنماط لكل نوع صفحة
+# ------------------------------------------------------------------
+
+def local_stylesheets(base_dir, html):
+    """أوراق الأنماط المحلية في الصفحة: {href: المسار}، بما فيها النسخ المحلية لأوراق CDN"""
+    sheets = {}
+    for href in re.findall(r'<link\b[^>]*rel="stylesheet"[^>]*>', html):
+        href = re.search(r'href="([^"]+)"', href).group(1)
+        path = _sheet_path(base_dir, href)
+        if path:
+            sheets[href] = path
+    return sheets
+
+
+def _sheet_path(base_dir, href):
+    """مسار الورقة المحلية لعنوان href، أو None"""
+    base_dir = Path(base_dir)
+    if href == STYLESHEET:
+        return base_dir / STYLESHEET
+    if href.startswith('http'):
+        vendor = base_dir / VENDOR_DIR / href.split('?')[0].rsplit('/', 1)[-1]
+        if vendor.exists():
+            return vendor
+    return None
+
+
+def sheet_name(kind):
+    """اسم الورقة المقلصة لنوع الصفحة"""
+    return f"styles-{kind}.css"
+
+
+def styles_basis(base_dir, scripts=''):
+    """بصمة المدخلات المشتركة بين صفحات كل نوع: أوراق الأنماط المحلية وملفات JS"""
+    base_dir = Path(base_dir)
+    digest = hashlib.sha256(scripts.encode('utf-8'))
+    for path in [base_dir / STYLESHEET, *sorted((base_dir / VENDOR_DIR).glob('*.css'))]:
+        if path.exists():
+            digest.update(path.name.encode('utf-8'))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def page_styles(base_dir, pages, scripts='', previous=None):
+    """
+    CSS الحرج والمقلص لكل نوع صفحة
+
+    pages: {اسم الملف: نص HTML}. scripts: نص ملفات JS (للأصناف المضافة
+    أثناء التشغيل). previous: {النوع: الحالة المحفوظة من البناء السابق}،
+    تُضاف إليها محددات pages بدل حسابها من جديد ما دامت أوراق الأنماط
+    وملفات JS لم تتغير. يعيد {النوع: {'href': الملف المقلص، 'css': محتواه،
+    'critical': CSS الحرج، 'replaces': عناوين الأوراق التي يحل محلها}}
+    ومعها الحالة التي تُحفظ للبناء التالي ('basis' و 'selectors' و
+    'fold_selectors').
+    """
+    basis = styles_basis(base_dir, scripts)
+    previous = previous or {}
+    by_type = {}
+    for filename, html in pages.items():
+        by_type.setdefault(page_type(filename), []).append(html)
+    script_words, script_tags = page_tokens(scripts)
+    
+    parsed = {}
+    styles = {}
+    for kind in sorted(set(by_type) | set(previous)):
+        state = previous.get(kind)
+        if not state or state.get('basis') != basis:
+            state = {'replaces': [], 'selectors': [], 'fold_selectors': []}
+        htmls = by_type.get(kind, [])
+        sheets = {}
+        for html in htmls:
+            sheets.update(local_stylesheets(base_dir, html))
+        for href in state['replaces']:
+            path = _sheet_path(base_dir, href)
+            if path:
+                sheets[href] = path
+        if not sheets:
+            continue
+        
+        rules = []
+        for href, path in sorted(sheets.items()):
+            if path not in parsed:
+                parsed[path] = parse_css(path.read_text(encoding='utf-8'))
+            rules.extend(parsed[path])
+        selectors = set(state['selectors'])
+        fold_selectors = set(state['fold_selectors'])
+        if htmls:
+            words, tags = page_tokens(' '.join(htmls))
+            selectors |= used_selectors(rules, words | script_words, tags | script_tags)
+            fold_words, fold_tags = page_tokens(' '.join(above_the_fold(html) for html in htmls))
+            fold_selectors |= used_selectors(rules, fold_words, fold_tags)
+        fold_selectors &= selectors
+        pruned = prune_rules(rules, selectors)
+        # قواعد الشاشة الأولى فقط (بدون الحركات لأنها لا تلزم العرض الأول)
+        critical = [rule for rule in prune_rules(pruned, fold_selectors)
+                    if not rule[0].startswith('@keyframes')]
+        styles[kind] = {
+            'href': sheet_name(kind),
+            'css': serialize_css(pruned),
+            'critical': serialize_css(critical),
+            'replaces': sorted(sheets),
+            'basis': basis,
+            'selectors': sorted(selectors),
+            'fold_selectors': sorted(fold_selectors),
+        }
+    return styles
+
+
+def apply_styles(html, style):
+    """
+    تضمين CSS الحرج في <head> وتحميل الورقة المقلصة دون تعطيل العرض
+
+    تُحذف روابط الأوراق التي حلت محلها الورقة المقلصة، وتُؤجَّل أوراق
+    الأيقونات والخطوط.
+    """
+    def replace_link(match):
+        tag = match.group(0)
+        href = re.search(r'href="([^"]+)"', tag).group(1)
+        if href in style['replaces']:
+            return ''
+        if any(marker in href for marker in DEFERRABLE):
+            return _deferred(href)
+        return tag
+    
+    html = re.sub(r'<link\b[^>]*rel="stylesheet"[^>]*>', replace_link, html)
+    head = (f'<style>{style["critical"]}</style>'
+            + _deferred(style['href']))
+    return html.replace('</head>', head + '</head>', 1)
+
+
+def _deferred(href):
+    """ورقة أنماط تُحمَّل دون تعطيل العرض (مع بديل لمتصفح بدون JavaScript)"""
+    return (f'<link rel="preload" as="style" href="{href}" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+أسماء ملفات مشتقة من المحتوى لمنصة ديوان الانفراد
+Content-Hashed Asset Filenames for Diwan Al-Infirad Platform
+
+يُستخدم في مرحلة النشر (site_minify). ملفات CSS و JS و search-data.json
+تُنشر في dist/ بأسماء تحتوي بصمة محتواها (styles.3f9a1c0b2d.css)، وتُستبدل
+المراجع إليها في الصفحات وملفات JS. الاسم يتغير مع كل تغيير في المحتوى،
+فيمكن تخزين هذه الملفات في ذاكرة المتصفح لمدة سنة دون خطر نسخ قديمة.
+
+dist/asset-manifest.json يربط كل اسم منطقي باسمه المنشور، و dist/_headers
+يحدد مدة التخزين لكل ملف (صيغة Netlify و Cloudflare Pages). بصمة كل صفحة
+تشمل أسماء الملفات التي تشير إليها فقط، و search.js يقرأ اسم
+search-data.json المنشور من asset-manifest.json عند التشغيل، فلا يغير
+تحديث بيانات البحث أي صفحة.
+"""
+
+import re
+from pathlib import Path
+
+ASSET_MANIFEST = 'asset-manifest.json'
+HEADERS_FILE = '_headers'
+
+# الملفات في الجذر التي تُنشر بأسماء مشتقة من المحتوى
+FINGERPRINTED_SUFFIXES = ('.css', '.js')
+FINGERPRINTED_FILES = ('search-data.json',)
+
+HASH_LENGTH = 10
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# asset-manifest.json يتغير مع كل نشر، فيُتحقق منه عند كل طلب
+SHORT_LIVED = 'public, max-age=0, must-revalidate'
+
+# قيمة كاملة بين علامتي اقتباس أو داخل url(...) دون مسار، مع لاحقة ?v=... أو #...
+REFERENCE = re.compile(r'''(?<=["'(])(?:\./)?([^"'()?#/\s]+)(?=[?#"')])''')
+
+
+def fingerprinted(relative):
+    """هل يُنشر الملف باسم مشتق من محتواه"""
+    return '/' not in relative and (relative.endswith(FINGERPRINTED_SUFFIXES) or relative in FINGERPRINTED_FILES)
+
+
+def hashed_name(relative, digest):
+    """styles.css ← styles.<بصمة>.css"""
+    path = Path(relative)
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def asset_references(text, runtime=False):
+    """
+    الأسماء المنطقية للملفات ذات البصمة التي يشير إليها النص (مرتبة)
+
+    runtime=True يستثني الملفات التي تُقرأ أسماؤها من asset-manifest.json
+    عند التشغيل (search-data.json في search.js).
+    """
+    names = {name for name in REFERENCE.findall(text) if fingerprinted(name)}
+    if runtime:
+        names -= set(FINGERPRINTED_FILES)
+    return sorted(names)
+
+
+def rewrite_assets(text, assets):
+    """
+    استبدال المراجع إلى الأسماء المنطقية بالأسماء المنشورة
+
+    يُستبدل الاسم فقط حين يكون قيمة كاملة بين علامتي اقتباس أو داخل
+    url(...)، مع السماح بلاحقة ?v=... أو #...، فلا تتأثر أسماء أطول تحتويه.
+    """
+    if not assets:
+        return text
+    names = '|'.join(re.escape(name) for name in sorted(assets, key=len, reverse=True))
+    pattern = re.compile(rf'''(?<=["'(])(?:\./)?({names})(?=[?#"')])''')
+    return pattern.sub(lambda m: assets[m.group(1)], text)
+
+
+def headers(assets):
+    """
+    محتوى dist/_headers: تخزين دائم للملفات ذات البصمة
+
+    الملفات الأخرى تبقى على إعداد المضيف الافتراضي (يدمج المضيف عناوين
+    جميع القواعد المطابقة، فلا تُكتب قاعدة عامة /* تتعارض معها).
+    """
+    lines = [f'/{ASSET_MANIFEST}', f'  Cache-Control: {SHORT_LIVED}', '']
+    for name in sorted(assets.values()):
+        lines += [f'/{name}', f'  Cache-Control: {IMMUTABLE}', '']
+    # النسخ المحولة من الصور تحمل بصمة المحتوى أيضاً (انظر site_images)
+    lines += ['/images/variants/*', f'  Cache-Control: {IMMUTABLE}', '']
+    return '\n'.join(lines)
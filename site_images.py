@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+معالجة الصور لمنصة ديوان الانفراد
+Responsive Image Pipeline for Diwan Al-Infirad Platform
+
+ينشئ لكل صورة JPG/PNG في images/ نسخاً مصغرة بصيغتي WebP و AVIF في
+images/variants/ بعروض VARIANT_WIDTHS (دون تكبير الصورة الأصلية). اسم كل
+نسخة يحتوي بصمة محتوى الصورة الأصلية، لذا لا تُحوَّل الصورة مرة أخرى
+ما لم يتغير محتواها، ويمكن تخزين النسخ في ذاكرة المتصفح دون انتهاء.
+
+البناء يمرر الصور التي تشير إليها حقول image في السجلات فقط، لأن صفحاتها
+وحدها تستخدم <picture>. الملف الذي ليس محتواه JPEG أو PNG (مثل SVG باسم
+.jpg) يُتخطى دون تحذير. الترميز (AVIF خاصة) موزع على عمليات متوازية، مهمة
+لكل صورة وصيغة.
+
+data/image-manifest.json يحفظ لكل صورة بصمتها وأبعادها ونسخها، فتكتب
+الصفحات <picture> مع srcset والأبعاد الحقيقية دون فتح الصور. ويحفظ أيضاً
+وقت تعديل كل صورة وحجمها، فلا تُقرأ الصور التي لم تُلمس لحساب بصمتها.
+
+Pillow اختياري: إذا لم يكن مثبتاً تُستخدم الصورة الأصلية مع
+loading="lazy" فقط.
+"""
+
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from content_metrics import metrics
+from content_storage import file_signature
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow غير مثبت
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+VARIANT_DIR = 'variants'
+VARIANT_WIDTHS = (480, 960, 1440)
+RASTER_SUFFIXES = ('.jpg', '.jpeg', '.png')
+# بداية محتوى ملفات JPEG و PNG (الامتداد وحده لا يكفي)
+RASTER_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n')
+
+# إعدادات الترميز لكل صيغة (AVIF أبطأ ترميزاً لكنه أصغر حجماً)
+FORMATS = {
+    'avif': {'quality': 50, 'speed': 6},
+    'webp': {'quality': 80, 'method': 4},
+}
+
+
+def available_formats():
+    """الصيغ التي يدعمها Pillow المثبت، بترتيب الأفضلية في <picture>"""
+    if Image is None:
+        return ()
+    return tuple(name for name in FORMATS if features.check(name))
+
+
+def file_hash(filepath):
+    """بصمة محتوى الملف (أول 12 حرفاً من SHA-256)"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def is_raster(filepath):
+    """هل محتوى الملف صورة JPEG أو PNG"""
+    with open(filepath, 'rb') as f:
+        header = f.read(8)
+    return header.startswith(RASTER_SIGNATURES)
+
+
+def variant_widths(width):
+    """العروض المطلوبة لصورة عرضها width (بدون تكبير، والعرض الأصلي إن كان أصغر من الأكبر)"""
+    widths = [w for w in VARIANT_WIDTHS if w < width]
+    if min(width, VARIANT_WIDTHS[-1]) not in widths:
+        widths.append(min(width, VARIANT_WIDTHS[-1]))
+    return widths
+
+
+def convert_image(images_dir, name, digest, formats):
+    """
+    إنشاء نسخ صورة واحدة (تُستدعى داخل عمليات المعالجة المتوازية)
+
+    يتخطى النسخ الموجودة مسبقاً. يعيد مدخل البيان أو None إذا تعذر فتح الصورة.
+    """
+    images_dir = Path(images_dir)
+    try:
+        with Image.open(images_dir / name) as image:
+            image = ImageOps.exif_transpose(image)
+            width, height = image.size
+            if image.mode not in ('RGB', 'RGBA'):
+                has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')
+            
+            stem = Path(name).stem
+            variants = {}
+            for fmt in formats:
+                variants[fmt] = []
+                for target in variant_widths(width):
+                    relative = f"{VARIANT_DIR}/{stem}-{digest}-{target}.{fmt}"
+                    output = images_dir / relative
+                    if not output.exists():
+                        resized = image
+                        if target != width:
+                            resized = image.resize((target, round(height * target / width)), Image.LANCZOS)
+                        tmp = output.with_name(output.name + '.tmp')
+                        resized.save(tmp, format=fmt.upper(), **FORMATS[fmt])
+                        os.replace(tmp, output)
+                        metrics.wrote(output)
+                    variants[fmt].append([target, relative])
+    except (OSError, ValueError):
+        return None
+    return {'hash': digest, 'width': width, 'height': height, 'variants': variants}
+
+
+def _up_to_date(images_dir, entry, digest, formats):
+    """هل نسخ الصورة موجودة لنفس المحتوى وبجميع الصيغ المتاحة"""
+    if not entry or entry['hash'] != digest:
+        return False
+    if entry.get('invalid'):
+        return True
+    if set(entry['variants']) != set(formats):
+        return False
+    # قد تكون بعض النسخ حُذفت (مثلاً بواسطة site_assets --prune)
+    return all((images_dir / relative).exists() for variants in entry['variants'].values() for _, relative in variants)
+
+
+def _merge_entries(entries):
+    """مدخل الصورة من نتائج مهام صيغها (None إذا فشلت إحداها)"""
+    if any(entry is None for entry in entries):
+        return None
+    merged = dict(entries[0], variants={})
+    for entry in entries:
+        merged['variants'].update(entry['variants'])
+    return merged
+
+
+def process_images(images_dir, manifest, names=None, workers=None, prune=False):
+    """
+    مرحلة الصور في البناء
+
+    names: أسماء الصور (نسبة إلى images_dir)؛ الافتراضي جميع صور JPG/PNG.
+    prune=True: names هي جميع الصور المستخدمة، فتُحذف غيرها من البيان.
+    الصور التي لم يتغير محتواها منذ البناء السابق تُتخطى. workers عدد
+    عمليات الترميز (الافتراضي: عدد أنوية المعالج). يعيد (البيان الجديد،
+    عدد الصور التي حُوِّلت).
+    """
+    formats = available_formats()
+    if not formats:
+        return manifest, 0
+    
+    images_dir = Path(images_dir)
+    (images_dir / VARIANT_DIR).mkdir(exist_ok=True)
+    scan_all = names is None
+    prune = prune or scan_all
+    if scan_all:
+        names = sorted(
+            path.relative_to(images_dir).as_posix() for path in images_dir.rglob('*')
+            if path.suffix.lower() in RASTER_SUFFIXES and VARIANT_DIR not in path.relative_to(images_dir).parts
+        )
+    
+    manifest = dict(manifest)
+    pending = []
+    for name in names:
+        path = images_dir / name
+        signature = file_signature(path)
+        if signature is None:
+            manifest.pop(name, None)
+            continue
+        entry = manifest.get(name)
+        # الملف لم يُلمس منذ البناء السابق: لا حاجة لقراءته وحساب بصمته
+        if entry and entry.get('signature') == list(signature) and _up_to_date(images_dir, entry, entry['hash'], formats):
+            continue
+        digest = file_hash(path)
+        if _up_to_date(images_dir, entry, digest, formats):
+            manifest[name] = {**entry, 'signature': list(signature)}
+        elif not is_raster(path):
+            # مثل SVG باسم .jpg: تُستخدم الصورة الأصلية كما هي دون تحذير
+            logger.debug("تخطي ملف ليس JPEG أو PNG: %s", name)
+            manifest[name] = {'hash': digest, 'signature': list(signature), 'invalid': True}
+        else:
+            pending.append((name, digest, list(signature)))
+    if prune:
+        # صور حُذفت أو لم تعد مستخدمة منذ البناء السابق
+        for name in set(manifest) - set(names):
+            del manifest[name]
+    
+    # مهمة لكل صورة وصيغة: ترميز AVIF لصورة واحدة أبطأ بكثير من WebP
+    tasks = [(images_dir, name, digest, (fmt,)) for name, digest, _ in pending for fmt in formats]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) < 2:
+        results = [convert_image(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(convert_image, *zip(*tasks)))
+    
+    converted = 0
+    for index, (name, digest, signature) in enumerate(pending):
+        entry = _merge_entries(results[index * len(formats):(index + 1) * len(formats)])
+        if entry is None:
+            # يُحفظ الملف المعطوب ببصمته حتى لا تُعاد محاولة تحويله في كل بناء
+            logger.warning("⚠️ تعذر تحويل الصورة: %s", name)
+            manifest[name] = {'hash': digest, 'signature': signature, 'invalid': True}
+            continue
+        manifest[name] = {**entry, 'signature': signature}
+        converted += 1
+    return manifest, converted
+
+
+def picture_html(name, alt, entry=None, css_class='img-fluid rounded', sizes='100vw'):
+    """
+    وسم <picture> لصورة مع srcset لكل صيغة والأبعاد الحقيقية
+
+    entry: مدخل الصورة من البيان؛ بدونه يُكتب <img> عادي مع loading="lazy".
+    """
+    src = f"images/{name}"
+    if not entry or entry.get('invalid'):
+        return f'<img src="{src}" alt="{alt}" class="{css_class}" loading="lazy" decoding="async">'
+    
+    sources = ''.join(
+        f'<source type="image/{fmt}" srcset="'
+        + ', '.join(f"images/{relative} {width}w" for width, relative in variants)
+        + f'" sizes="{sizes}">'
+        for fmt, variants in entry['variants'].items()
+    )
+    return (f'<picture>{sources}<img src="{src}" alt="{alt}" class="{css_class}" '
+            f'width="{entry["width"]}" height="{entry["height"]}" loading="lazy" decoding="async"></picture>')
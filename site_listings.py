@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+صفحات القوائم المقسمة لمنصة ديوان الانفراد
+Paginated Listing Pages for Diwan Al-Infirad Platform
+
+صفحات القوائم (category-*.html و terms-list.html و articles.html) مكتوبة
+يدوياً، والجزء المولد منها محصور بين العلامتين LISTING_START و
+LISTING_END. الصفحة الأولى هي الملف نفسه، والصفحات التالية
+(terms-list-2.html، terms-list-3.html، ...) تُكتب بنفس غلاف الصفحة
+الأولى مع شريحة أخرى من القائمة.
+
+كل صفحة تحتوي PAGE_SIZE عنصراً. بصمة كل صفحة تُحفظ في
+data/listing-manifest.json، فلا يُعاد كتابة إلا الصفحات التي تغيرت
+شريحتها (أو روابط التنقل فيها).
+"""
+
+import hashlib
+from pathlib import Path
+
+from content_metrics import metrics
+from content_search import article_entry, normalize_arabic, term_entry
+from content_storage import iso_date
+from site_stats import strip_stats
+from site_templates import (
+    ARTICLE_CARD, ARTICLES_GRID, CATEGORY_GRID, CATEGORY_TERM_CARD, EMPTY_LISTING,
+    PAGE_LINK, PAGE_LINK_DISABLED, PAGINATION, TERM_CARD, TERMS_GRID,
+)
+
+PAGE_SIZE = 24
+
+LISTING_START = '<!-- diwan:listing:start -->'
+LISTING_END = '<!-- diwan:listing:end -->'
+
+# تخطيط كل نوع من القوائم: (الشبكة، البطاقة، رسالة القائمة الفارغة)
+LAYOUTS = {
+    'terms': (TERMS_GRID, TERM_CARD, 'لا توجد مصطلحات حالياً'),
+    'category': (CATEGORY_GRID, CATEGORY_TERM_CARD, 'لا توجد مصطلحات في هذا المجال حالياً'),
+    'articles': (ARTICLES_GRID, ARTICLE_CARD, 'لا توجد مقالات حالياً'),
+}
+
+
+def listing_entries(kind, records, categories):
+    """مدخلات القائمة من سجلات المحتوى (بصيغة search-data.json مع تاريخ ISO)"""
+    make_entry = term_entry if kind == 'terms' else article_entry
+    return [{**make_entry(record, categories), 'date': iso_date(record.get('date'))} for record in records]
+
+
+def sort_entries(entries, order='title'):
+    """
+    ترتيب المدخلات حسب العنوان (أبجدياً بعد التطبيع) أو التاريخ (الأحدث أولاً)
+
+    المدخلات المكتوبة يدوياً ليس لها تاريخ فتأتي بعد المؤرخة عند الترتيب بالتاريخ.
+    """
+    if order == 'title':
+        return sorted(entries, key=lambda e: (normalize_arabic(e['title']), e['url']))
+    if order == 'date':
+        dated = sorted((e for e in entries if e.get('date')), key=lambda e: (e['date'], e['url']), reverse=True)
+        undated = sort_entries([e for e in entries if not e.get('date')], 'title')
+        return dated + undated
+    raise ValueError(f"ترتيب غير معروف: {order}")
+
+
+def page_filename(filename, number):
+    """اسم ملف الصفحة رقم number (الصفحة الأولى هي الملف نفسه)"""
+    if number == 1:
+        return filename
+    return f"{filename[:-len('.html')]}-{number}.html"
+
+
+def paginate(entries, page_size=PAGE_SIZE):
+    """تقسيم المدخلات إلى شرائح: (رقم الصفحة، الشريحة). القائمة الفارغة صفحة واحدة فارغة"""
+    if not entries:
+        yield 1, []
+        return
+    for start in range(0, len(entries), page_size):
+        yield start // page_size + 1, entries[start:start + page_size]
+
+
+def read_shell(filepath):
+    """غلاف صفحة القائمة: النص قبل علامة البداية (شاملة) وبعد علامة النهاية (شاملة)"""
+    content = Path(filepath).read_text(encoding='utf-8')
+    start = content.find(LISTING_START)
+    end = content.find(LISTING_END)
+    if start < 0 or end < start:
+        raise ValueError(f"علامات القائمة غير موجودة في {filepath}")
+    return content[:start + len(LISTING_START)], content[end:]
+
+
+def _pagination(filename, number, has_next):
+    """روابط السابق والتالي (لا شيء إذا كانت القائمة صفحة واحدة)"""
+    if number == 1 and not has_next:
+        return ''
+    if number > 1:
+        previous = PAGE_LINK.render({'href': page_filename(filename, number - 1), 'label': 'السابق'})
+    else:
+        previous = PAGE_LINK_DISABLED.render({'label': 'السابق'})
+    if has_next:
+        following = PAGE_LINK.render({'href': page_filename(filename, number + 1), 'label': 'التالي'})
+    else:
+        following = PAGE_LINK_DISABLED.render({'label': 'التالي'})
+    return PAGINATION.render({'previous': previous, 'number': str(number), 'next': following})
+
+
+def _cards(card, entries, categories):
+    for entry in entries:
+        category = entry['categorySlug']
+        yield card.render({
+            'category': category,
+            'category_ar': categories[category]['ar'],
+            'color': categories[category]['color'],
+            'title': entry['title'],
+            'text': entry.get('definition') or entry.get('summary', ''),
+            'url': entry['url'],
+            'reading_time': entry.get('readingTime', ''),
+        })
+
+
+def render_region(layout, filename, number, entries, has_next, categories):
+    """الجزء المولد من صفحة واحدة"""
+    grid, card, empty_message = LAYOUTS[layout]
+    if entries:
+        cards = ''.join(_cards(card, entries, categories))
+    else:
+        cards = EMPTY_LISTING.render({'message': empty_message})
+    return grid.render({'cards': cards, 'pagination': _pagination(filename, number, has_next)})
+
+
+def write_listing(base_dir, filename, layout, entries, categories, fingerprints=None, page_size=PAGE_SIZE):
+    """
+    كتابة صفحات قائمة مقسمة
+
+    entries: المدخلات مرتبة. fingerprints: بصمات الصفحات من البناء السابق.
+    تُكتب الصفحة فقط إذا تغيرت بصمتها أو لم يكن ملفها موجوداً، وتُحذف
+    الصفحات الزائدة إذا تقلصت القائمة. يعيد (البصمات الجديدة، عدد الصفحات المكتوبة).
+    """
+    base_dir = Path(base_dir)
+    before, after = read_shell(base_dir / filename)
+    # العدادات تُحدَّث في مكانها في جميع الصفحات (site_stats) فلا تدخل في البصمة
+    shell_hash = hashlib.sha256(strip_stats(f"{before}{after}").encode('utf-8')).hexdigest()
+    old = fingerprints or []
+    pages = max(1, -(-len(entries) // page_size))
+    
+    new = []
+    written = 0
+    for number, chunk in paginate(entries, page_size):
+        region = render_region(layout, filename, number, chunk, number < pages, categories)
+        fingerprint = hashlib.sha256(f"{shell_hash}{region}".encode('utf-8')).hexdigest()
+        new.append(fingerprint)
+        target = base_dir / page_filename(filename, number)
+        if number <= len(old) and old[number - 1] == fingerprint and target.exists():
+            continue
+        with open(target, 'w', encoding='utf-8') as f:
+            f.write(before)
+            f.write(region)
+            f.write(after)
+        metrics.wrote(target)
+        written += 1
+    
+    for number in range(pages + 1, len(old) + 1):
+        (base_dir / page_filename(filename, number)).unlink(missing_ok=True)
+    return new, written
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مرحلة النشر لمنصة ديوان الانفراد: التصغير والضغط المسبق
+Minification and Pre-compression Stage for Diwan Al-Infirad Platform
+
+تكتب نسخة الموقع المنشورة في dist/:
+    - صفحات HTML وملفات CSS و JS و JSON مصغرة، ومعها نسخ .gz و .br
+      ليخدمها المضيف مباشرة دون ضغط عند كل طلب
+    - CSS الحرج مضمناً في كل صفحة وورقة أنماط مقلصة لكل نوع صفحة
+      (انظر site_critical)
+    - نسخ من ملفات CSS و JS و search-data.json بأسماء مشتقة من محتواها،
+      تشير إليها الصفحات (انظر site_fingerprint)
+    - ملفات images/ و assets/ كما هي
+
+التصغير محافظ: يُمس فقط المسافات البيضاء ASCII والتعليقات، فلا تتغير
+المسافة غير القاطعة ولا علامات الاتجاه (U+200F وغيرها) في النص العربي،
+ولا محتوى <pre> و <textarea> والنصوص بين علامات الاقتباس في CSS/JS.
+
+data/dist-manifest.json يحفظ بصمة كل ملف مصدر، فلا يُعاد تصغير أو ضغط
+إلا ما تغير، ولا تُفحص أصناف إلا الصفحات التي تغير مصدرها. brotli اختياري: إذا لم يكن مثبتاً تُكتب نسخ .gz فقط.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from content_metrics import metrics
+from site_critical import STYLESHEET, apply_styles, page_styles, page_type, sheet_name, styles_basis
+from site_fingerprint import (
+    ASSET_MANIFEST, HEADERS_FILE, asset_references, fingerprinted, hashed_name, headers, rewrite_assets,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli غير مثبت
+    brotli = None
+
+DIST_DIR = 'dist'
+
+# يتغير عند تعديل قواعد التصغير ليُعاد بناء جميع الملفات
+MINIFY_VERSION = 1
+
+MINIFIED_SUFFIXES = ('.html', '.css', '.js', '.json')
+COPIED_ROOTS = ('images', 'assets')
+# ملفات في الجذر تُنشر كما هي (خريطة الموقع وخلاصة Atom، انظر site_sitemap)
+COPIED_SUFFIXES = ('.xml',)
+# ملفات نصية غير مصغرة تُضغط مسبقاً أيضاً
+COMPRESSIBLE_SUFFIXES = MINIFIED_SUFFIXES + ('.svg', '.xml')
+
+# حالة الورقة المقلصة لكل نوع صفحة التي تُحفظ في البيان للبناء التالي (انظر site_critical)
+STYLE_STATE = ('basis', 'replaces', 'selectors', 'fold_selectors')
+
+# ملفات المصدر في الجذر التي لا تُنشر
+EXCLUDED_FILES = {'package.json', 'package-lock.json'}
+
+# المسافات البيضاء ASCII فقط (\s يطابق المسافة غير القاطعة وعلامات يونيكود أخرى)
+WHITESPACE = re.compile(r'[ \t\r\n\f]+')
+
+# ------------------------------------------------------------------
+# HTML
+# ------------------------------------------------------------------
+
+# عناصر يُحفظ محتواها كما هو أو يُصغر بقواعد لغته
+RAW_ELEMENTS = re.compile(r'(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+HTML_COMMENT = re.compile(r'<!--(?!\[if|<!\[endif)(.*?)-->', re.S)
+
+# العناصر الكتلية: المسافات حولها لا تظهر، فتُحذف بالكامل
+BLOCK_ELEMENTS = (
+    'html|head|body|title|meta|link|script|style|noscript|header|footer|nav|main|section|article|aside|'
+    'div|p|h[1-6]|ul|ol|li|dl|dt|dd|table|thead|tbody|tfoot|tr|th|td|form|fieldset|legend|'
+    'figure|figcaption|picture|source|blockquote|hr|br|select|option|button|!doctype'
+)
+SPACE_BEFORE_BLOCK = re.compile(rf'[ \t\r\n\f]+(?=</?(?:{BLOCK_ELEMENTS})\b)', re.I)
+SPACE_AFTER_BLOCK = re.compile(rf'(<(?:/?(?:{BLOCK_ELEMENTS}))\b[^>]*>)[ \t\r\n\f]+', re.I)
+
+
+def minify_html(text):
+    """
+    تصغير صفحة HTML
+
+    تُحذف التعليقات (عدا التعليقات الشرطية)، وتُختصر المسافات إلى مسافة
+    واحدة، وتُحذف المسافات المجاورة للعناصر الكتلية فقط لأن المسافة بين
+    عنصرين سطريين (مثل <span> و <a>) تظهر في الصفحة.
+    """
+    preserved = []
+    
+    def keep(match):
+        opening, tag, body, closing = match.groups()
+        tag = tag.lower()
+        if tag == 'script' and 'src=' not in opening.lower() and body.strip():
+            body = minify_js(body)
+        elif tag == 'style':
+            body = minify_css(body)
+        preserved.append(WHITESPACE.sub(' ', opening) + body + closing)
+        # script و style عناصر كتلية (\x01)، و pre و textarea سطرية (\x00)
+        marker = '\x01' if tag in ('script', 'style') else '\x00'
+        return f'{marker}{len(preserved) - 1}{marker}'
+    
+    text = RAW_ELEMENTS.sub(keep, text)
+    text = HTML_COMMENT.sub('', text)
+    text = WHITESPACE.sub(' ', text)
+    text = SPACE_BEFORE_BLOCK.sub('', text)
+    text = SPACE_AFTER_BLOCK.sub(r'\1', text)
+    text = re.sub(r' ?\x01(\d+)\x01 ?', lambda m: preserved[int(m.group(1))], text)
+    text = re.sub(r'\x00(\d+)\x00', lambda m: preserved[int(m.group(1))], text)
+    return text.strip()
+
+
+# ------------------------------------------------------------------
+# CSS
+# ------------------------------------------------------------------
+
+CSS_TOKENS = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/''', re.S)
+CSS_SPACE_AROUND = re.compile(r' ?([{};,]) ?')
+
+
+def minify_css(text):
+    """
+    تصغير ملف CSS: حذف التعليقات واختصار المسافات
+
+    لا تُحذف المسافة قبل ':' لأنها تغير معنى المحدد (div :hover ≠ div:hover)،
+    ولا يُمس محتوى النصوص المقتبسة (مثل content: '•').
+    """
+    strings = []
+    out = []
+    position = 0
+    for match in CSS_TOKENS.finditer(text):
+        out.append(text[position:match.start()])
+        if match.group(1):
+            strings.append(match.group(1))
+            out.append(f'\x00{len(strings) - 1}\x00')
+        else:
+            out.append(' ')
+        position = match.end()
+    out.append(text[position:])
+    
+    text = WHITESPACE.sub(' ', ''.join(out))
+    text = CSS_SPACE_AROUND.sub(r'\1', text)
+    text = re.sub(r'([{;]) ?([\w-]+) ?: ?', r'\1\2:', text)
+    text = text.replace(';}', '}')
+    text = re.sub(r'\x00(\d+)\x00', lambda m: strings[int(m.group(1))], text)
+    return text.strip()
+
+
+# ------------------------------------------------------------------
+# JavaScript
+# ------------------------------------------------------------------
+
+# ما يسبق '/' عندما تبدأ تعبيراً نمطياً (وليس قسمة)
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = re.compile(r'\b(?:return|typeof|case|do|else|in|of|throw|new|delete|void)$')
+
+# لا حاجة لمسافة بجانب هذه الرموز (+ و - مستثناة: a + +b ≠ a++b)
+JS_PUNCTUATION = set('{}()[];,=:<>&|?!*%')
+
+
+def minify_js(text):
+    """
+    تصغير JavaScript بحذف التعليقات واختصار المسافات
+
+    تُحفظ نهايات الأسطر (إلا بعد { و ; و ,) لأن JavaScript يضيف الفواصل
+    المنقوطة تلقائياً عندها، ولا يُمس محتوى النصوص (بما فيها القوالب
+    `...`) والتعبيرات النمطية.
+    """
+    out = []
+    tail = ''  # آخر ما كُتب (لتمييز التعبير النمطي عن القسمة)
+    pending = None  # مسافة معلقة: ' ' أو '\n'
+    i = 0
+    n = len(text)
+    
+    def emit(token):
+        nonlocal tail, pending
+        if pending and tail:
+            if pending == '\n' and tail[-1] not in '{;,' and token[0] != '}':
+                out.append('\n')
+            elif pending == ' ' and tail[-1] not in JS_PUNCTUATION and token[0] not in JS_PUNCTUATION:
+                out.append(' ')
+        pending = None
+        out.append(token)
+        tail = (tail + token)[-12:]
+    
+    while i < n:
+        char = text[i]
+        if char in ' \t\r\n\f':
+            end = i
+            while end < n and text[end] in ' \t\r\n\f':
+                end += 1
+            pending = '\n' if pending == '\n' or '\n' in text[i:end] else ' '
+            i = end
+        elif text.startswith('//', i):
+            end = text.find('\n', i)
+            i = n if end < 0 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            pending = '\n' if pending == '\n' or '\n' in text[i:end] else pending or ' '
+            i = end
+        elif char in '"\'`':
+            end = i + 1
+            while end < n and text[end] != char:
+                end += 2 if text[end] == '\\' else 1
+            emit(text[i:end + 1])
+            i = end + 1
+        elif char == '/' and (not tail or tail[-1] in REGEX_PRECEDERS or REGEX_KEYWORDS.search(tail)):
+            end = i + 1
+            in_class = False
+            while end < n and (in_class or text[end] != '/') and text[end] != '\n':
+                if text[end] == '\\':
+                    end += 1
+                elif text[end] == '[':
+                    in_class = True
+                elif text[end] == ']':
+                    in_class = False
+                end += 1
+            while end + 1 < n and text[end + 1].isalpha():  # الأعلام: /.../g
+                end += 1
+            emit(text[i:end + 1])
+            i = end + 1
+        else:
+            end = i + 1
+            if char.isalnum() or char in '_$':
+                while end < n and (text[end].isalnum() or text[end] in '_$'):
+                    end += 1
+            emit(text[i:end])
+            i = end
+    return ''.join(out)
+
+
+# ------------------------------------------------------------------
+# المرحلة
+# ------------------------------------------------------------------
+
+def source_files(base_dir):
+    """ملفات المصدر المنشورة: (المسار النسبي، هل يُصغر)"""
+    base_dir = Path(base_dir)
+    for path in sorted(base_dir.iterdir()):
+        if not path.is_file() or path.name in EXCLUDED_FILES:
+            continue
+        if path.suffix in MINIFIED_SUFFIXES:
+            yield path.name, True
+        elif path.suffix in COPIED_SUFFIXES:
+            yield path.name, False
+    for root in COPIED_ROOTS:
+        for path in sorted((base_dir / root).rglob('*')):
+            if path.is_file() and not path.name.endswith('.tmp'):
+                yield path.relative_to(base_dir).as_posix(), False
+
+
+def file_digest(filepath):
+    """بصمة محتوى ملف المصدر وحده"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hash(digest, extra=''):
+    """بصمة الناتج: بصمة المصدر مع إصدار قواعد التصغير وأي مدخل إضافي (مثل CSS الحرج للصفحة)"""
+    return hashlib.sha256(f"{MINIFY_VERSION}{extra}{digest}".encode('utf-8')).hexdigest()
+
+
+def minify_json(text):
+    return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.css': minify_css,
+    '.js': minify_js,
+    '.json': minify_json,
+}
+
+
+def _write(path, data):
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    metrics.wrote(path, len(data))
+
+
+def outputs(relative, entry=None):
+    """
+    نواتج ملف في dist/: الملف نفسه ونسخته ذات البصمة ونسخهما المضغوطة
+
+    الأوراق المقلصة المولدة لا تُنشر إلا باسمها ذي البصمة.
+    """
+    names = []
+    if not (entry and entry.get('generated')):
+        names.append(relative)
+    if entry and entry.get('hashed'):
+        names.append(entry['hashed'])
+    if Path(relative).suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+        return names
+    siblings = ('.gz',) if brotli is None else ('.gz', '.br')
+    return names + [f"{name}{sibling}" for name in names for sibling in siblings]
+
+
+def _write_outputs(target, data, suffix):
+    """كتابة الملف ونسخه المضغوطة؛ يعيد أحجامها"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    _write(target, data)
+    sizes = {'output': len(data)}
+    if suffix in COMPRESSIBLE_SUFFIXES:
+        # mtime=0 ليكون الناتج متطابقاً بين البناءات
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        _write(target.with_name(target.name + '.gz'), gz)
+        sizes['gz'] = len(gz)
+        if brotli is not None:
+            br = brotli.compress(data, quality=11)
+            _write(target.with_name(target.name + '.br'), br)
+            sizes['br'] = len(br)
+    return sizes
+
+
+def publish_file(base_dir, dist_dir, relative, minify, style=None, assets=None, hashed=None):
+    """
+    كتابة ملف واحد ونسخه المضغوطة في dist/ (تُستدعى داخل عمليات المعالجة المتوازية)
+
+    style: CSS الحرج والورقة المقلصة لنوع الصفحة (انظر site_critical).
+    assets: الأسماء المنشورة للملفات ذات البصمة التي يشير إليها الملف،
+    تُستبدل بها المراجع في صفحات HTML وملفات JS. hashed: اسم نسخة الملف
+    ذات البصمة إن وُجد.
+    يعيد الأحجام بالبايت: {'source', 'output', 'gz', 'br'}.
+    """
+    source = Path(base_dir) / relative
+    suffix = source.suffix.lower()
+    if minify:
+        text = source.read_text(encoding='utf-8')
+        if style:
+            text = apply_styles(text, style)
+        if suffix in ('.html', '.js'):
+            text = rewrite_assets(text, assets)
+        data = MINIFIERS[suffix](text).encode('utf-8')
+    else:
+        data = source.read_bytes()
+    sizes = _write_outputs(Path(dist_dir) / relative, data, suffix)
+    if hashed:
+        _write_outputs(Path(dist_dir) / hashed, data, suffix)
+    sizes['source'] = source.stat().st_size
+    return sizes
+
+
+def _up_to_date(dist_dir, relative, entry, old_entry):
+    return (old_entry and all(old_entry.get(key) == entry.get(key) for key in ('hash', 'hashed', *STYLE_STATE))
+            and all((dist_dir / output).exists() for output in outputs(relative, entry)))
+
+
+def publish(base_dir, manifest, workers=1):
+    """
+    مرحلة النشر في البناء
+
+    manifest: بيان البناء السابق (data/dist-manifest.json). الملفات التي لم
+    يتغير محتواها ولا تزال نواتجها موجودة تُتخطى، ونواتج الملفات المحذوفة
+    تُحذف من dist/. صفحات HTML تُكتب مع CSS الحرج لنوعها، وتُكتب ورقة
+    أنماط مقلصة لكل نوع صفحة، وتُنشر ملفات CSS و JS و search-data.json
+    بأسماء مشتقة من محتواها (انظر site_fingerprint). يعيد (البيان الجديد،
+    الملفات المكتوبة).
+    """
+    base_dir = Path(base_dir)
+    dist_dir = base_dir / DIST_DIR
+    dist_dir.mkdir(exist_ok=True)
+    
+    sources = dict(source_files(base_dir))
+    digests = {relative: file_digest(base_dir / relative) for relative in sources}
+    html_files = [relative for relative in sources if relative.endswith('.html')]
+    scripts = {relative: (base_dir / relative).read_text(encoding='utf-8')
+               for relative in sources if relative.endswith('.js') and '/' not in relative}
+    
+    # محددات كل نوع من البناء السابق (تحفظ في بيان الورقة المقلصة): تُقرأ
+    # وتُفحص فقط الصفحات التي تغير مصدرها، أو جميع صفحات النوع إذا تغيرت
+    # أوراق الأنماط أو ملفات JS
+    basis = styles_basis(base_dir, ''.join(scripts.values()))
+    previous = {}
+    for kind in {page_type(relative) for relative in html_files}:
+        entry = manifest.get(sheet_name(kind))
+        if entry and entry.get('generated'):
+            previous[kind] = {key: entry[key] for key in STYLE_STATE if key in entry}
+    pages = {}
+    for relative in html_files:
+        old_entry = manifest.get(relative) or {}
+        state = previous.get(page_type(relative)) or {}
+        if (old_entry.get('source') != digests[relative] or 'assets' not in old_entry
+                or state.get('basis') != basis):
+            pages[relative] = (base_dir / relative).read_text(encoding='utf-8')
+    styles = page_styles(base_dir, pages, ''.join(scripts.values()), previous)
+    
+    # الملفات ذات البصمة التي يشير إليها كل ملف: تدخل أسماؤها المنشورة وحدها
+    # في بصمته، فلا يغير تحديث search-data.json (الذي يقرأ search.js اسمه عند
+    # التشغيل) أي صفحة
+    references = {relative: asset_references(text, runtime=True) for relative, text in scripts.items()}
+    for relative in html_files:
+        references[relative] = (asset_references(pages[relative]) if relative in pages
+                                else manifest[relative]['assets'])
+    
+    # البصمات بالترتيب: الأوراق المقلصة، ثم CSS و JSON، ثم JS، ثم الصفحات
+    # التي تشير إلى كل ما سبق
+    entries = {}
+    assets = {}
+    for style in styles.values():
+        relative = style['href']
+        digest = hashlib.sha256(f"{MINIFY_VERSION}{style['css']}".encode('utf-8')).hexdigest()
+        style['href'] = hashed_name(relative, digest)
+        entries[relative] = {'hash': digest, 'hashed': style['href'], 'generated': True,
+                             **{key: style[key] for key in STYLE_STATE}}
+        assets[relative] = style['href']
+    styles = {kind: {key: style[key] for key in ('href', 'css', 'critical', 'replaces')}
+              for kind, style in styles.items()}
+    for relative in sorted(sources, key=lambda r: (r.endswith('.html'), r.endswith('.js'))):
+        extra = ''
+        if relative in references:
+            extra = json.dumps({name: assets.get(name) for name in references[relative]}, sort_keys=True)
+        style = styles.get(page_type(relative)) if relative.endswith('.html') else None
+        if style:
+            extra += json.dumps({k: v for k, v in style.items() if k != 'css'}, sort_keys=True)
+        entry = {'hash': source_hash(digests[relative], extra), 'source': digests[relative]}
+        if relative.endswith('.html'):
+            entry['assets'] = references[relative]
+        if fingerprinted(relative):
+            entry['hashed'] = hashed_name(relative, entry['hash'])
+            assets[relative] = entry['hashed']
+        entries[relative] = entry
+    
+    new_manifest = {}
+    pending = []
+    written = []
+    for relative, entry in entries.items():
+        old_entry = manifest.get(relative)
+        if _up_to_date(dist_dir, relative, entry, old_entry):
+            new_manifest[relative] = old_entry
+            continue
+        # نواتج سابقة لم تعد مستخدمة (مثل نسخة ذات بصمة قديمة)
+        if old_entry:
+            for output in set(outputs(relative, old_entry)) - set(outputs(relative, entry)):
+                (dist_dir / output).unlink(missing_ok=True)
+        if entry.get('generated'):
+            style = next(style for style in styles.values() if style['href'] == entry['hashed'])
+            sizes = _write_outputs(dist_dir / entry['hashed'], minify_css(style['css']).encode('utf-8'), '.css')
+            sizes['source'] = sum((base_dir / STYLESHEET).stat().st_size for href in style['replaces']
+                                  if href == STYLESHEET)
+            new_manifest[relative] = {**entry, 'sizes': sizes}
+            written.append(relative)
+        else:
+            pending.append(relative)
+    
+    for relative in set(manifest) - set(entries):
+        for output in outputs(relative, manifest[relative]):
+            (dist_dir / output).unlink(missing_ok=True)
+    
+    jobs = [(base_dir, dist_dir, relative, sources[relative],
+             styles.get(page_type(relative)) if relative.endswith('.html') else None,
+             {name: assets[name] for name in references.get(relative, ()) if name in assets},
+             entries[relative].get('hashed')) for relative in pending]
+    if workers <= 1 or len(jobs) < 2:
+        results = [publish_file(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(publish_file, *zip(*jobs)))
+        # الكتابة تمت في عمليات أخرى: تُحسب هنا من الأحجام المعادة
+        for job, sizes in zip(jobs, results):
+            copies = 2 if job[-1] else 1
+            metrics.wrote(nbytes=copies * sum(sizes.get(key, 0) for key in ('output', 'gz', 'br')),
+                          files=copies * (1 + ('gz' in sizes) + ('br' in sizes)))
+    
+    for relative, sizes in zip(pending, results):
+        new_manifest[relative] = {**entries[relative], 'sizes': sizes}
+    
+    if written or pending or not (dist_dir / ASSET_MANIFEST).exists():
+        _write(dist_dir / ASSET_MANIFEST, json.dumps(assets, ensure_ascii=False, indent=2, sort_keys=True).encode('utf-8'))
+        _write(dist_dir / HEADERS_FILE, headers(assets).encode('utf-8'))
+    return new_manifest, written + pending
+
+
+def savings_by_type(manifest, names=None):
+    """
+    مجموع الأحجام لكل نوع ملف نصي: {'.html': {'files', 'source', 'output', 'gz', 'br'}}
+
+    names: حصر المجموع في ملفات معينة (مثل الملفات المكتوبة في هذا البناء).
+    """
+    totals = {}
+    for relative, entry in manifest.items():
+        suffix = Path(relative).suffix.lower()
+        if suffix not in COMPRESSIBLE_SUFFIXES or (names is not None and relative not in names):
+            continue
+        total = totals.setdefault(suffix, {'files': 0, 'source': 0, 'output': 0, 'gz': 0, 'br': 0})
+        total['files'] += 1
+        for key, size in entry['sizes'].items():
+            total[key] += size
+    return totals
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+المحتوى ذو الصلة لصفحات المصطلحات والمقالات في منصة ديوان الانفراد
+Related Content for Term and Article Pages
+
+يتحول عنوان كل سجل وتعريفه (أو مقدمته) وشرحه وكلماته المفتاحية إلى
+متجه TF-IDF من كلمات مطبّعة ومجذّعة (content_search.analyze)، ويُختار
+لكل سجل أقرب RELATED_COUNT سجلاً بتشابه جيب التمام.
+
+الحساب بالمصفوفات المتناثرة: يُبنى فهرس مقلوب (كلمة ← سجلاتها) ثم تُحسب
+درجات كتلة من السجلات مع السجلات التي تشاركها كلمات دفعة واحدة بـ NumPy
+(ترتيب الأزواج وجمعها بـ reduceat ثم ترتيبها لأعلى k). حجم الكتلة يُحدد
+بعدد الأزواج (PAIR_BUDGET) فتبقى الذاكرة محدودة مهما كبر المحتوى. الكلمات الشائعة جداً
+(في أكثر من MAX_DOCUMENT_FREQUENCY من السجلات) لا تميز بين السجلات فتُحذف،
+وهي التي كانت ستجعل الحساب تربيعياً. بدون NumPy تُحسب نفس الدرجات بالقواميس.
+
+النتائج تُحفظ في data/related.json مع بصمة الحقول المستخدمة لكل سجل. في
+البناء التالي يُعاد الحساب للسجلات التي تغيرت بصمتها فقط، ولسجلات كانت
+تشير إليها أو دخلت هي في قائمتها الجديدة. أوزان IDF وحد الكلمات الشائعة
+تعتمد على المحتوى كله، فقوائم السجلات التي لم يُعد حسابها قد تختلف قليلاً
+عن الحساب الكامل. لذلك يُحسب الجميع من جديد عندما يتجاوز عدد السجلات
+المضافة والمعدلة والمحذوفة منذ آخر حساب كامل RELATED_DRIFT من عددها
+(أو مع full=True)، فتطابق القوائم الحساب الكامل بعده.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+from collections import Counter, defaultdict
+
+try:
+    import numpy as np
+except ImportError:  # numpy غير مثبت: الحساب بالقواميس (أبطأ)
+    np = None
+
+from content_metrics import metrics
+from content_search import analyze
+from content_storage import CONTENT_TYPES, TITLE_FIELDS
+
+# يتغير عند تعديل الحقول أو الأوزان أو طريقة الحساب ليُعاد حساب الجميع
+RELATED_VERSION = 1
+RELATED_COUNT = 5
+
+# الحقول المستخدمة ووزن كل منها
+RELATED_FIELDS = {
+    'terms': {'title_ar': 3.0, 'keywords': 2.0, 'definition': 1.5, 'explanation': 1.0},
+    'articles': {'title': 3.0, 'keywords': 2.0, 'intro': 1.5},
+}
+
+MIN_SCORE = 0.05
+MAX_DOCUMENT_FREQUENCY = 0.1
+# لا تُحذف كلمات شائعة من المحتوى الصغير (حد أدنى لعدد السجلات)
+MIN_DOCUMENT_LIMIT = 100
+
+# نسبة السجلات المتغيرة منذ آخر حساب كامل التي يُعاد بعدها حساب الجميع
+RELATED_DRIFT = 0.02
+
+# أقصى عدد أزواج (كلمة مشتركة بين سجلين) في الكتلة الواحدة
+PAIR_BUDGET = 4_000_000
+
+
+def related_hash(kind, record):
+    """بصمة ما يؤثر في المحتوى ذي الصلة: الحقول المستخدمة والمجال"""
+    fields = {field: record.get(field) for field in RELATED_FIELDS[kind]}
+    payload = json.dumps([kind, record.get('category'), fields], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def record_tokens(kind, record):
+    """أوزان كلمات السجل (مجموع أوزان الحقول التي ظهرت فيها كل كلمة)"""
+    counts = Counter()
+    for field, weight in RELATED_FIELDS[kind].items():
+        value = record.get(field)
+        if isinstance(value, list):
+            value = ' '.join(str(item) for item in value)
+        for token in analyze(value or ''):
+            if len(token) > 1:
+                counts[token] += weight
+    return counts
+
+
+class Vectors:
+    """
+    متجهات TF-IDF مطبّعة لجميع السجلات بصيغة CSR
+
+    rows[i]: أزواج (رقم الكلمة، الوزن) للسجل i، و terms عدد الكلمات.
+    """
+    
+    def __init__(self, token_counts):
+        self.size = len(token_counts)
+        frequency = Counter(token for counts in token_counts for token in counts)
+        limit = max(MIN_DOCUMENT_LIMIT, MAX_DOCUMENT_FREQUENCY * self.size)
+        vocabulary = {}
+        self.rows = []
+        for counts in token_counts:
+            row = []
+            for token, tf in counts.items():
+                df = frequency[token]
+                # كلمة في سجل واحد لا تربطه بغيره، والشائعة جداً لا تميز
+                if df < 2 or df > limit:
+                    continue
+                row.append((vocabulary.setdefault(token, len(vocabulary)),
+                            (1 + math.log(tf)) * math.log(self.size / df)))
+            norm = math.sqrt(sum(weight * weight for _, weight in row)) or 1.0
+            self.rows.append([(term, weight / norm) for term, weight in row])
+        self.terms = len(vocabulary)
+
+
+def _ranges(starts, lengths):
+    """دمج النطاقات [start, start + length) في مصفوفة واحدة"""
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(int(lengths.sum()))
+
+
+def _nearest_numpy(vectors, rows, k, incoming):
+    n = vectors.size
+    lengths = np.fromiter((len(row) for row in vectors.rows), dtype=np.int64, count=n)
+    doc_ptr = np.concatenate(([0], np.cumsum(lengths)))
+    doc_terms = np.fromiter((term for row in vectors.rows for term, _ in row), dtype=np.int64, count=int(doc_ptr[-1]))
+    doc_weights = np.fromiter((weight for row in vectors.rows for _, weight in row), dtype=np.float64,
+                              count=int(doc_ptr[-1]))
+    # الفهرس المقلوب (CSC): السجلات مرتبة حسب الكلمة
+    order = np.argsort(doc_terms, kind='stable')
+    post_docs = np.repeat(np.arange(n), lengths)[order]
+    post_weights = doc_weights[order]
+    df = np.bincount(doc_terms, minlength=vectors.terms)
+    term_ptr = np.concatenate(([0], np.cumsum(df)))
+    # عدد الأزواج التي يولدها كل سجل
+    cost = np.bincount(np.repeat(np.arange(n), lengths), weights=df[doc_terms], minlength=n)
+    
+    rows = np.asarray(rows, dtype=np.int64)
+    block_cost = np.cumsum(cost[rows])
+    start = 0
+    while start < len(rows):
+        # كتلة بحد أقصى PAIR_BUDGET زوجاً (سجل واحد على الأقل)
+        offset = block_cost[start - 1] if start else 0
+        end = max(start + 1, int(np.searchsorted(block_cost, offset + PAIR_BUDGET, side='right')))
+        block = rows[start:end]
+        start = end
+        
+        counts = lengths[block]
+        nonzero = _ranges(doc_ptr[block], counts)
+        local = np.repeat(np.arange(len(block)), counts)
+        terms = doc_terms[nonzero]
+        postings = _ranges(term_ptr[terms], df[terms])
+        keys = np.repeat(local, df[terms]) * n + post_docs[postings]
+        values = np.repeat(doc_weights[nonzero], df[terms]) * post_weights[postings]
+        
+        if not keys.size:
+            # لا كلمات مشتركة بين سجلات الكتلة وغيرها
+            for doc in block:
+                yield int(doc), []
+            continue
+        
+        # جمع أزواج نفس السجلين: الدرجات متناثرة فلا تُبنى مصفوفة كثيفة
+        order = np.argsort(keys)
+        keys = keys[order]
+        first = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+        scores = np.add.reduceat(values[order], first)
+        local, other = np.divmod(keys[first], n)
+        keep = (other != block[local]) & (scores >= MIN_SCORE)
+        local, other, scores = local[keep], other[keep], scores[keep]
+        if incoming is not None:
+            np.maximum.at(incoming, other, scores)
+        
+        # ترتيب كل سجل تنازلياً بالدرجة ثم أخذ أول k (الدرجة في [0، 1] والأزواج
+        # مرتبة بالسجل فالترتيب المستقر يُبقي المتساويين بترتيب أرقامهم)
+        order = np.argsort(local * 2.0 - scores, kind='stable')
+        local, other, scores = local[order], other[order], scores[order]
+        bounds = np.searchsorted(local, np.arange(len(block) + 1))
+        for i, doc in enumerate(block):
+            top = slice(bounds[i], min(bounds[i + 1], bounds[i] + k))
+            yield int(doc), list(zip(other[top].tolist(), scores[top].tolist()))
+
+
+def _nearest_python(vectors, rows, k, incoming):
+    postings = [[] for _ in range(vectors.terms)]
+    for doc, row in enumerate(vectors.rows):
+        for term, weight in row:
+            postings[term].append((doc, weight))
+    for doc in rows:
+        scores = defaultdict(float)
+        for term, weight in vectors.rows[doc]:
+            for other, other_weight in postings[term]:
+                scores[other] += weight * other_weight
+        scores.pop(doc, None)
+        if incoming is not None:
+            for other, score in scores.items():
+                incoming[other] = max(incoming[other], score)
+        top = heapq.nlargest(k, ((score, -other) for other, score in scores.items() if score >= MIN_SCORE))
+        yield doc, [(-other, score) for score, other in top]
+
+
+def nearest(vectors, rows, k=RELATED_COUNT, incoming=None):
+    """
+    أقرب k سجلاً لكل سجل في rows: (السجل، [(السجل المشابه، الدرجة)]) بالترتيب
+
+    incoming: مصفوفة بطول عدد السجلات تُسجل فيها أعلى درجة لكل سجل مع
+    سجلات rows (لمعرفة السجلات التي قد تدخل rows في قائمتها). كل سجل في
+    rows له نتيجة، ولو قائمة فارغة.
+    """
+    if not rows:
+        return iter(())
+    if vectors.size < 2:
+        return ((doc, []) for doc in rows)
+    k = min(k, vectors.size - 1)
+    if np is not None:
+        return _nearest_numpy(vectors, rows, k, incoming)
+    return _nearest_python(vectors, rows, k, incoming)
+
+
+def _incoming_array(size):
+    return np.zeros(size) if np is not None else [0.0] * size
+
+
+def related_content(records, cache, k=RELATED_COUNT, full=False):
+    """
+    تحديث المحتوى ذي الصلة
+
+    records: ثلاثيات (المفتاح kind/slug، النوع، السجل). cache: محتوى
+    data/related.json السابق (أو {}). full=True يعيد حساب الجميع. يعيد
+    (الذاكرة الجديدة، عدد السجلات التي حُسبت قوائمها).
+    """
+    fresh = not full and cache.get('version') == RELATED_VERSION and cache.get('count') == k
+    old = cache.get('records', {}) if fresh else {}
+    keys = [key for key, _, _ in records]
+    hashes = [related_hash(kind, record) for _, kind, record in records]
+    titles = {key: [record.get(TITLE_FIELDS[kind]), record.get('category')] for key, kind, record in records}
+    
+    changed = [i for i, key in enumerate(keys) if key not in old or old[key][0] != hashes[i]]
+    removed = set(old) - set(keys)
+    if not changed and not removed:
+        return cache, 0
+    
+    with metrics.stage('vectors'):
+        vectors = Vectors([record_tokens(kind, record) for _, kind, record in records])
+    
+    # تغيرات كثيرة منذ آخر حساب كامل: IDF ابتعد عن أوزان القوائم المحفوظة
+    drift = cache.get('drift', 0) + len(changed) + len(removed) if old else 0
+    if drift > RELATED_DRIFT * cache.get('size', 0):
+        old, drift = {}, 0
+        changed, removed = list(range(len(records))), set()
+    
+    related = {}
+    with metrics.stage('nearest'):
+        incoming = _incoming_array(len(records)) if len(changed) < len(records) else None
+        for doc, neighbours in nearest(vectors, changed, k, incoming):
+            related[doc] = neighbours
+        
+        # سجلات لم تتغير لكن قائمتها تشير إلى سجل تغير أو حُذف، أو قد يدخلها سجل تغير
+        stale = {keys[i] for i in changed} | removed
+        dirty = []
+        if incoming is not None:
+            changed_set = set(changed)
+            for i, key in enumerate(keys):
+                if i in changed_set:
+                    continue
+                neighbours = old[key][1]
+                lowest = neighbours[-1][1] if len(neighbours) >= k else MIN_SCORE
+                if incoming[i] >= lowest or any(other in stale for other, _ in neighbours):
+                    dirty.append(i)
+        for doc, neighbours in nearest(vectors, dirty, k):
+            related[doc] = neighbours
+    
+    entries = {}
+    for i, key in enumerate(keys):
+        if i in related:
+            entries[key] = [hashes[i], [[keys[other], round(score, 4)] for other, score in related[i]]]
+        else:
+            entries[key] = old[key]
+    return {'version': RELATED_VERSION, 'count': k, 'size': len(records) if not old else cache['size'],
+            'drift': drift, 'records': entries, 'titles': titles}, len(related)
+
+
+def related_links(cache, key):
+    """روابط المحتوى ذي الصلة بالسجل: قواميس فيها url و title و category"""
+    entry = cache.get('records', {}).get(key)
+    if not entry:
+        return []
+    links = []
+    for other, _ in entry[1]:
+        if other not in cache['titles']:
+            continue
+        kind, slug = other.split('/', 1)
+        title, category = cache['titles'][other]
+        links.append({'url': f"{CONTENT_TYPES[kind]}-{slug}.html", 'title': title, 'category': category})
+    return links
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+خريطة الموقع وخلاصة Atom لمنصة ديوان الانفراد
+Incremental sitemap.xml and Atom Feed for Diwan Al-Infirad Platform
+
+لكل رابط في خريطة الموقع بصمة محتوى (بصمة السجل من البناء التدريجي،
+أو بصمة صفحة القائمة، أو محتوى الصفحة المكتوبة يدوياً). lastmod لا
+يتغير إلا عندما تتغير البصمة، فلا تعيد محركات البحث جلب صفحات لم تتغير.
+
+حتى MAX_URLS رابط تكون الخريطة ملف sitemap.xml واحداً، وبعدها تُقسم إلى
+sitemap-1.xml، sitemap-2.xml، ... ويصبح sitemap.xml فهرساً لها. الرابط
+يبقى في نفس الجزء ما دام موجوداً، والروابط الجديدة تملأ أول جزء فيه مكان،
+وبصمة كل جزء تُحفظ في data/sitemap-manifest.json فلا يُعاد كتابة إلا
+الأجزاء التي تغيرت روابطها أو تواريخها.
+
+feed.xml خلاصة Atom بأحدث FEED_SIZE مصطلحاً ومقالاً، تُكتب فقط إذا تغيرت.
+"""
+
+import hashlib
+from collections import Counter
+from pathlib import Path
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from content_metrics import metrics
+
+# عنوان الموقع المنشور (GitHub Pages)؛ الروابط في الخريطة والخلاصة مطلقة
+SITE_URL = 'https://alhuwaidias-arch.github.io/Diwan-Al-Maarifa'
+SITE_TITLE = 'ديوان الانفراد'
+
+SITEMAP_FILE = 'sitemap.xml'
+FEED_FILE = 'feed.xml'
+
+# صفحات مكتوبة يدوياً خارج القوائم وسجلات المحتوى
+STATIC_PAGES = ('index.html', 'categories.html', 'about.html')
+
+# حد بروتوكول sitemaps لعدد الروابط في الملف الواحد
+MAX_URLS = 50000
+FEED_SIZE = 50
+
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+def absolute_url(site_url, path):
+    """رابط مطلق للصفحة (الأسماء العربية بترميز النسبة المئوية)"""
+    return f"{site_url.rstrip('/')}/{quote(path)}"
+
+
+def _xml(text):
+    return escape(str(text), {'"': '&quot;'})
+
+
+def _fingerprint(*parts):
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def shard_filename(number, shards):
+    """اسم ملف الجزء (الخريطة غير المقسمة هي sitemap.xml نفسه)"""
+    return SITEMAP_FILE if shards == 1 else f"sitemap-{number}.xml"
+
+
+def render_urlset(entries, site_url):
+    """ملف خريطة بروابط entries: [(المسار، lastmod)]"""
+    urls = ''.join(
+        f"<url><loc>{_xml(absolute_url(site_url, path))}</loc><lastmod>{lastmod}</lastmod></url>\n"
+        for path, lastmod in entries
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n{urls}</urlset>\n'
+
+
+def render_index(shards, site_url):
+    """فهرس الخرائط: shards = [(اسم الملف، أحدث lastmod)]"""
+    sitemaps = ''.join(
+        f"<sitemap><loc>{_xml(absolute_url(site_url, name))}</loc><lastmod>{lastmod}</lastmod></sitemap>\n"
+        for name, lastmod in shards
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n{sitemaps}</sitemapindex>\n'
+
+
+def _write(filepath, text):
+    Path(filepath).write_text(text, encoding='utf-8')
+    metrics.wrote(filepath)
+
+
+def assign_urls(pages, old_urls, today, max_urls=MAX_URLS):
+    """
+    lastmod وجزء الخريطة لكل رابط: {المسار: [البصمة، lastmod، رقم الجزء]}
+
+    pages: {المسار: (البصمة، التاريخ)}. الرابط الجديد يأخذ تاريخ سجله (أو
+    today)، والرابط الذي تغيرت بصمته يأخذ today.
+    """
+    urls = {}
+    sizes = Counter()
+    new = []
+    for path, (digest, date) in pages.items():
+        old = old_urls.get(path)
+        if old is None:
+            new.append((path, digest, date or today))
+            continue
+        urls[path] = [digest, old[1] if old[0] == digest else today, old[2]]
+        sizes[old[2]] += 1
+    
+    shard = 0
+    for path, digest, lastmod in new:
+        while sizes[shard] >= max_urls:
+            shard += 1
+        urls[path] = [digest, lastmod, shard]
+        sizes[shard] += 1
+    return urls
+
+
+def write_sitemap(base_dir, pages, manifest, today, site_url=SITE_URL, max_urls=MAX_URLS):
+    """
+    كتابة أجزاء الخريطة التي تغيرت (وفهرسها عند التقسيم)
+
+    manifest: بيان البناء السابق (أو {}). يعيد (البيان الجديد، عدد الملفات المكتوبة).
+    """
+    base_dir = Path(base_dir)
+    urls = assign_urls(pages, manifest.get('urls', {}), today, max_urls)
+    count = max((shard for _, _, shard in urls.values()), default=0) + 1
+    shards = [[] for _ in range(count)]
+    for path, (_, lastmod, shard) in urls.items():
+        shards[shard].append((path, lastmod))
+    
+    old_fingerprints = manifest.get('shards', [])
+    fingerprints = []
+    written = 0
+    for number, entries in enumerate(shards, start=1):
+        entries.sort()
+        name = shard_filename(number, count)
+        fingerprint = _fingerprint(site_url, name, *(f"{path} {lastmod}" for path, lastmod in entries))
+        fingerprints.append(fingerprint)
+        if (number <= len(old_fingerprints) and old_fingerprints[number - 1] == fingerprint
+                and (base_dir / name).exists()):
+            continue
+        _write(base_dir / name, render_urlset(entries, site_url))
+        written += 1
+    
+    index = None
+    if count > 1:
+        index_entries = [(shard_filename(number, count), max((lastmod for _, lastmod in entries), default=today))
+                         for number, entries in enumerate(shards, start=1)]
+        index = _fingerprint(site_url, *(f"{name} {lastmod}" for name, lastmod in index_entries))
+        if index != manifest.get('index') or not (base_dir / SITEMAP_FILE).exists():
+            _write(base_dir / SITEMAP_FILE, render_index(index_entries, site_url))
+            written += 1
+    
+    # أجزاء لم تعد موجودة (تقلصت الخريطة أو عادت ملفاً واحداً)
+    for number in range(count + 1 if count > 1 else 1, len(old_fingerprints) + 1):
+        (base_dir / f"sitemap-{number}.xml").unlink(missing_ok=True)
+    return {'urls': urls, 'shards': fingerprints, 'index': index}, written
+
+
+def _atom_time(date):
+    return f"{date}T00:00:00Z"
+
+
+def render_feed(entries, site_url, updated):
+    """
+    خلاصة Atom
+
+    entries: قواميس فيها path و title و summary و category و category_label
+    و published و updated (تواريخ ISO).
+    """
+    items = ''.join(
+        "<entry>\n"
+        f"<id>{_xml(absolute_url(site_url, entry['path']))}</id>\n"
+        f"<title>{_xml(entry['title'])}</title>\n"
+        f"<link href=\"{_xml(absolute_url(site_url, entry['path']))}\"/>\n"
+        f"<published>{_atom_time(entry['published'])}</published>\n"
+        f"<updated>{_atom_time(entry['updated'])}</updated>\n"
+        f"<category term=\"{_xml(entry['category'])}\" label=\"{_xml(entry['category_label'])}\"/>\n"
+        f"<summary>{_xml(entry['summary'])}</summary>\n"
+        "</entry>\n"
+        for entry in entries
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="ar">\n'
+        f"<id>{_xml(site_url.rstrip('/'))}/</id>\n"
+        f"<title>{_xml(SITE_TITLE)}</title>\n"
+        f"<link href=\"{_xml(site_url.rstrip('/'))}/\"/>\n"
+        f"<link rel=\"self\" href=\"{_xml(absolute_url(site_url, FEED_FILE))}\"/>\n"
+        f"<updated>{_atom_time(updated)}</updated>\n"
+        f"{items}</feed>\n"
+    )
+
+
+def write_feed(base_dir, entries, fingerprint=None, site_url=SITE_URL, today=None):
+    """كتابة feed.xml إذا تغير محتواه؛ يعيد (البصمة الجديدة، هل كُتب)"""
+    filepath = Path(base_dir) / FEED_FILE
+    updated = max((entry['updated'] for entry in entries), default=today)
+    text = render_feed(entries, site_url, updated)
+    new = _fingerprint(text)
+    if new == fingerprint and filepath.exists():
+        return new, False
+    _write(filepath, text)
+    return new, True
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+إحصائيات منصة ديوان الانفراد
+Site Statistics for Diwan Al-Infirad Platform
+
+data/stats.json يحفظ عدد المصطلحات والمقالات (الإجمالي ولكل مجال) وأحدث
+الإضافات، ويُحدَّث تدريجياً مع كل إضافة أو تعديل أو حذف بدلاً من عد
+جميع السجلات في كل مرة.
+
+العدادات في الصفحات محصورة بين علامتين ثابتتين:
+    <!-- diwan:stat:terms -->14 مصطلح<!-- /diwan:stat -->
+    <!-- diwan:stat:articles:physics -->0 مقالات<!-- /diwan:stat -->
+وتُستبدل قيمها في مكانها دون إعادة إنشاء الصفحة.
+"""
+
+import re
+from pathlib import Path
+
+from content_metrics import metrics
+from content_storage import TITLE_FIELDS
+
+STAT_MARKER = re.compile(r'(<!-- diwan:stat:([\w:-]+) -->)(.*?)(<!-- /diwan:stat -->)')
+
+# عدد أحدث الإضافات المحفوظة لكل نوع
+LATEST_SIZE = 5
+
+# صيغتا المفرد والجمع لكل عداد
+LABELS = {
+    'terms': ('مصطلح', 'مصطلحات'),
+    'articles': ('مقال', 'مقالات'),
+    'categories': ('مجال', 'مجالات'),
+}
+
+
+def empty_stats(categories):
+    """إحصائيات فارغة بنفس صيغة data/stats.json"""
+    stats = {kind: {'total': 0, 'categories': {c: 0 for c in categories}} for kind in ('terms', 'articles')}
+    stats['latest'] = {'terms': [], 'articles': []}
+    return stats
+
+
+def latest_entry(kind, record):
+    """مدخل في قائمة أحدث الإضافات"""
+    return {
+        'slug': record['slug'],
+        'title': record[TITLE_FIELDS[kind]],
+        'url': record['filename'],
+        'date': record.get('date'),
+    }
+
+
+def count(stats, kind, category, delta):
+    """تعديل عدد نوع ما في مجال ما (والإجمالي)"""
+    stats[kind]['total'] += delta
+    categories = stats[kind]['categories']
+    categories[category] = categories.get(category, 0) + delta
+
+
+def apply_change(stats, kind, added=(), removed=(), new=()):
+    """
+    تحديث الإحصائيات بعد تغيير في المحتوى
+
+    removed: السجلات قبل التغيير (المحذوفة أو قبل تعديلها)
+    added: السجلات بعد التغيير (الجديدة أو بعد تعديلها)
+    new: السجلات الجديدة فعلاً (تُضاف إلى أحدث الإضافات)
+
+    يعيد False إذا حُذف سجل من أحدث الإضافات، وعندها يجب إعادة حساب
+    القائمة من التخزين (انظر latest_from_records).
+    """
+    for record in removed:
+        count(stats, kind, record['category'], -1)
+    for record in added:
+        count(stats, kind, record['category'], 1)
+    
+    latest = stats['latest'][kind]
+    updated = {record['slug']: record for record in added}
+    removed_slugs = {record['slug'] for record in removed} - set(updated)
+    complete = not any(entry['slug'] in removed_slugs for entry in latest)
+    
+    latest[:] = [latest_entry(kind, updated[entry['slug']]) if entry['slug'] in updated else entry
+                 for entry in latest if entry['slug'] not in removed_slugs]
+    new_entries = [latest_entry(kind, record) for record in reversed(list(new))]
+    latest[:] = (new_entries + latest)[:LATEST_SIZE]
+    return complete
+
+
+def latest_from_records(kind, records):
+    """أحدث الإضافات من السجلات المخزنة (مرتبة حسب وقت الإضافة)"""
+    return [latest_entry(kind, record) for record in reversed(records[-LATEST_SIZE:])]
+
+
+def count_label(number, kind):
+    """العدد مع اسم المعدود: 1 مصطلح، 3 مصطلحات، 14 مصطلح"""
+    singular, plural = LABELS[kind]
+    return f"{number} {plural if number == 0 or 3 <= number <= 10 else singular}"
+
+
+def stat_values(stats):
+    """قيم العلامات: terms و articles و categories، و terms:<مجال> و articles:<مجال>"""
+    values = {'categories': count_label(len(stats['terms']['categories']), 'categories')}
+    for kind in ('terms', 'articles'):
+        values[kind] = count_label(stats[kind]['total'], kind)
+        for category, number in stats[kind]['categories'].items():
+            values[f"{kind}:{category}"] = count_label(number, kind)
+    return values
+
+
+def strip_stats(content):
+    """المحتوى بدون قيم العدادات (لمقارنة أغلفة الصفحات دون تأثير العدادات)"""
+    return STAT_MARKER.sub(r'\1\4', content)
+
+
+def patch_stats(filepath, values):
+    """
+    استبدال قيم العدادات في ملف في مكانها
+
+    يكتب الملف فقط إذا تغيرت قيمة؛ يعيد True عندها.
+    """
+    filepath = Path(filepath)
+    if not filepath.exists():
+        return False
+    content = filepath.read_text(encoding='utf-8')
+    patched = STAT_MARKER.sub(lambda m: m.group(1) + values.get(m.group(2), m.group(3)) + m.group(4), content)
+    if patched == content:
+        return False
+    filepath.write_text(patched, encoding='utf-8')
+    metrics.wrote(filepath)
+    return True
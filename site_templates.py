@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قوالب الصفحات المولدة لمنصة ديوان الانفراد
+Page Templates for Diwan Al-Infirad Platform
+
+صيغة القوالب بسيطة:
+    {{name}}   - حقل يُملأ من قاموس السياق عند العرض
+    {{> name}} - جزء مشترك (head, header, footer, scripts) يُدمج عند الترجمة
+
+يُترجم كل قالب مرة واحدة عند تحميل الوحدة إلى قائمة من الأجزاء الثابتة
+المرمزة مسبقاً كـ bytes وأسماء الحقول. الأجزاء المشتركة تُكتب مرة واحدة
+هنا وتُرمَّز مرة واحدة ثم تُدمج في قالبي المصطلح والمقال. العرض يكتب
+الأجزاء مباشرة في ملف الناتج دون بناء الصفحة كاملة كنص وسيط.
+"""
+
+import io
+import re
+
+from content_metrics import metrics
+
+PLACEHOLDER = re.compile(r'\{\{(>?)\s*(\w+)\s*\}\}')
+
+
+class Template:
+    """قالب مترجم: أجزاء ثابتة (bytes) وأسماء حقول (str) بالترتيب"""
+    
+    def __init__(self, source, fragments=None):
+        self.parts = self._compile(source, fragments or {})
+    
+    @staticmethod
+    def _compile(source, fragments):
+        parts = []
+        position = 0
+        for match in PLACEHOLDER.finditer(source):
+            if match.start() > position:
+                parts.append(source[position:match.start()].encode('utf-8'))
+            is_fragment, name = match.groups()
+            if is_fragment:
+                parts.extend(fragments[name].parts)
+            else:
+                parts.append(name)
+            position = match.end()
+        if position < len(source):
+            parts.append(source[position:].encode('utf-8'))
+        
+        # دمج الأجزاء الثابتة المتجاورة لتقليل عدد عمليات الكتابة
+        merged = []
+        for part in parts:
+            if merged and isinstance(part, bytes) and isinstance(merged[-1], bytes):
+                merged[-1] += part
+            else:
+                merged.append(part)
+        return merged
+    
+    def render_to(self, f, context):
+        """
+        كتابة القالب في ملف مفتوح بنمط ثنائي
+
+        قيمة الحقل إما نص، أو مجموعة نصوص (مثل generator) تُكتب بالتتابع.
+        """
+        write = f.write
+        for part in self.parts:
+            if isinstance(part, bytes):
+                write(part)
+                continue
+            value = context[part]
+            if isinstance(value, str):
+                write(value.encode('utf-8'))
+            else:
+                for chunk in value:
+                    write(chunk.encode('utf-8'))
+    
+    def render_file(self, filepath, context):
+        """كتابة القالب في ملف"""
+        with open(filepath, 'wb') as f:
+            self.render_to(f, context)
+        metrics.wrote(filepath)
+    
+    def render(self, context):
+        """عرض القالب كنص (للاختبار والمقارنة)"""
+        buffer = io.BytesIO()
+        self.render_to(buffer, context)
+        return buffer.getvalue().decode('utf-8')
+
+
+# ----------------------------------------------------------------------
+# الأجزاء المشتركة
+# ----------------------------------------------------------------------
+
+HEAD = Template("""<!DOCTYPE html>
+<html lang="ar" dir="rtl">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{page_title}} - ديوان الانفراد</title>
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/css/bootstrap.rtl.min.css">
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.2/css/all.min.css">
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Tajawal:wght@400;500;700;900&display=swap" rel="stylesheet">
+    <link rel="stylesheet" href="styles.css">
+</head>
+""")
+
+
+def _header(active):
+    """ترويسة الموقع مع تمييز رابط القسم الحالي"""
+    links = [
+        ('index.html', 'الرئيسية'),
+        ('about.html', 'عن المنصة'),
+        ('categories.html', 'المجالات العلمية'),
+        ('terms-list.html', 'المصطلحات'),
+        ('articles.html', 'المقالات'),
+    ]
+    items = ''.join(f"""
+                        <li class="nav-item">
+                            <a class="nav-link{' active' if href == active else ''}" href="{href}">{label}</a>
+                        </li>""" for href, label in links)
+    return Template(f"""<body>
+    <!-- Header -->
+    <header class="bg-white shadow-sm sticky-top">
+        <nav class="navbar navbar-expand-lg">
+            <div class="container">
+                <a class="navbar-brand d-flex align-items-center" href="index.html">
+                    <img src="images/logos/logo_ar.PNG" alt="ديوان الانفراد" style="height: 50px;">
+                    <span class="fw-bold fs-3" style="color: #0a2351; margin-right: 120px;">ديوان الانفراد</span>
+                </a>
+                <button class="navbar-toggler" type="button" data-bs-toggle="collapse" data-bs-target="#navbarNav">
+                    <span class="navbar-toggler-icon"></span>
+                </button>
+                <div class="collapse navbar-collapse" id="navbarNav">
+                    <ul class="navbar-nav ms-auto">{items}
+                    </ul>
+                    <div class="d-flex gap-2">
+                        <button class="btn btn-outline-primary" data-bs-toggle="modal" data-bs-target="#newsletterModal">
+                            <i class="fas fa-envelope"></i> انضم إلينا
+                        </button>
+                        <button class="btn btn-primary" data-bs-toggle="modal" data-bs-target="#knowledgeModal">
+                            <i class="fas fa-share-alt"></i> شارك معرفتك
+                        </button>
+                    </div>
+                </div>
+            </div>
+        </nav>
+    </header>
+""")
+
+
+FOOTER = Template("""
+    <!-- Footer -->
+    <footer class="bg-dark text-white py-5">
+        <div class="container">
+            <div class="row">
+                <div class="col-md-4 mb-4">
+                    <h5 class="fw-bold mb-3">ديوان الانفراد</h5>
+                    <p>منصة علمية متخصصة في توحيد وتوثيق المصطلحات العلمية باللغة العربية</p>
+                </div>
+                <div class="col-md-4 mb-4">
+                    <h5 class="fw-bold mb-3">روابط سريعة</h5>
+                    <ul class="list-unstyled">
+                        <li><a href="index.html" class="text-white-50 text-decoration-none">الرئيسية</a></li>
+                        <li><a href="about.html" class="text-white-50 text-decoration-none">عن المنصة</a></li>
+                        <li><a href="categories.html" class="text-white-50 text-decoration-none">المجالات العلمية</a></li>
+                        <li><a href="terms-list.html" class="text-white-50 text-decoration-none">المصطلحات</a></li>
+                    </ul>
+                </div>
+                <div class="col-md-4 mb-4">
+                    <h5 class="fw-bold mb-3">تواصل معنا</h5>
+                    <p class="text-white-50">info@infiradeng.com</p>
+                </div>
+            </div>
+            <hr class="my-4 bg-white-50">
+            <div class="text-center">
+                <p class="mb-0">&copy; ٢٠٢٥ ديوان الانفراد. جميع الحقوق محفوظة.</p>
+            </div>
+        </div>
+    </footer>
+""")
+
+SCRIPTS = Template("""
+    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist/js/bootstrap.bundle.min.js"></script>
+    <script src="script.js"></script>
+
+    <script>
+    function copyPageLink() {
+        const url = window.location.href;
+        navigator.clipboard.writeText(url).then(function() {
+            const btn = event.target.closest('button');
+            const originalHTML = btn.innerHTML;
+            btn.innerHTML = '<i class="fas fa-check"></i> تم النسخ!';
+            btn.classList.add('btn-success');
+            btn.classList.remove('btn-light');
+
+            setTimeout(function() {
+                btn.innerHTML = originalHTML;
+                btn.classList.remove('btn-success');
+                btn.classList.add('btn-light');
+            }, 2000);
+        }, function(err) {
+            alert('فشل نسخ الرابط. الرجاء المحاولة مرة أخرى.');
+        });
+    }
+    </script>
+</body>
+</html>
+""")
+
+FRAGMENTS = {
+    'head': HEAD,
+    'header_terms': _header('terms-list.html'),
+    'header_articles': _header('articles.html'),
+    'footer': FOOTER,
+    'scripts': SCRIPTS,
+}
+
+
+# ----------------------------------------------------------------------
+# قوالب الصفحات
+# ----------------------------------------------------------------------
+
+TERM_PAGE = Template("""{{> head}}{{> header_terms}}
+    <!-- Term Header -->
+    <section class="term-page-header">
+        <div class="container">
+            <nav aria-label="breadcrumb">
+                <ol class="breadcrumb">
+                    <li class="breadcrumb-item"><a href="index.html" class="text-white">الرئيسية</a></li>
+                    <li class="breadcrumb-item"><a href="category-{{category}}.html" class="text-white">{{category_ar}}</a></li>
+                    <li class="breadcrumb-item active text-white-50" aria-current="page">{{title}}</li>
+                </ol>
+            </nav>
+            <div class="row align-items-center">
+                <div class="col-md-8">
+                    <span class="badge bg-light text-primary mb-2">{{category_ar}}</span>
+                    <h1 class="term-page-title">{{title}}</h1>
+                </div>
+                <div class="col-md-4 text-md-end mt-3 mt-md-0">
+                    <button class="btn btn-light" onclick="copyPageLink()"><i class="fas fa-share-alt"></i> نسخ الرابط</button>
+                </div>
+            </div>
+        </div>
+    </section>
+
+    <!-- Term Content -->
+    <section class="py-5">
+        <div class="container">
+            <div class="row">
+                <div class="col-lg-8">
+                    <!-- Basic Definition -->
+                    <div class="term-section">
+                        <h2 class="term-section-title">التعريف العلمي</h2>
+                        <p>{{definition}}</p>{{image}}
+                    </div>
+
+                    <!-- Detailed Explanation -->
+                    <div class="term-section">
+                        <h2 class="term-section-title">شرح مبسط</h2>
+                        <p>{{explanation}}</p>
+                    </div>
+
+                    <!-- Examples and Illustrations -->
+                    <div class="term-section">
+                        <h2 class="term-section-title">أمثلة للتوضيح</h2>
+                        {{examples}}
+                    </div>
+                </div>
+
+                <div class="col-lg-4">
+                    <!-- Term Info Card -->
+                    <div class="term-section mb-4">
+                        <h3 class="term-section-title">معلومات المصطلح</h3>
+                        <table class="table">
+                            <tbody>
+                                <tr>
+                                    <th>المجال</th>
+                                    <td>{{category_ar}}</td>
+                                </tr>
+                                <tr>
+                                    <th>تاريخ الإضافة</th>
+                                    <td>{{date}}</td>
+                                </tr>
+                            </tbody>
+                        </table>
+                    </div>{{related}}
+                </div>
+            </div>
+        </div>
+    </section>
+{{> footer}}{{> scripts}}""", FRAGMENTS)
+
+ARTICLE_PAGE = Template("""{{> head}}{{> header_articles}}
+    <!-- Article Header -->
+    <section class="term-page-header">
+        <div class="container">
+            <nav aria-label="breadcrumb">
+                <ol class="breadcrumb">
+                    <li class="breadcrumb-item"><a href="index.html" class="text-white">الرئيسية</a></li>
+                    <li class="breadcrumb-item"><a href="articles.html" class="text-white">المقالات</a></li>
+                    <li class="breadcrumb-item"><a href="category-{{category}}.html" class="text-white">{{category_ar}}</a></li>
+                    <li class="breadcrumb-item active text-white-50" aria-current="page">{{title}}</li>
+                </ol>
+            </nav>
+            <div class="row align-items-center">
+                <div class="col-md-8">
+                    <span class="badge bg-light text-{{category_color}} mb-2">{{category_ar}}</span>
+                    <h1 class="term-page-title">{{title}}</h1>
+                </div>
+                <div class="col-md-4 text-md-end mt-3 mt-md-0">
+                    <button class="btn btn-light" onclick="copyPageLink()"><i class="fas fa-share-alt"></i> نسخ الرابط</button>
+                </div>
+            </div>
+        </div>
+    </section>
+
+    <!-- Article Content -->
+    <section class="py-5">
+        <div class="container">
+            <div class="row">
+                <div class="col-lg-8 mx-auto">
+                    <article class="article-content">
+                        <h2 class="fw-bold mb-4">مقدمة</h2>
+                        <p class="lead">{{intro}}</p>
+{{sections}}
+                    </article>{{related}}
+                </div>
+            </div>
+        </div>
+    </section>
+{{> footer}}{{> scripts}}""", FRAGMENTS)
+
+
+# المحتوى ذو الصلة (انظر site_related): قسم في صفحة المصطلح والمقال، ورابط لكل سجل
+RELATED_SECTION = Template("""
+                    <div class="term-section mb-4">
+                        <h3 class="term-section-title">محتوى ذو صلة</h3>
+                        <ul class="list-unstyled mb-0">{{links}}
+                        </ul>
+                    </div>""")
+
+RELATED_LINK = Template("""
+                            <li class="mb-2"><a href="{{url}}">{{title}}</a> <span class="badge bg-{{color}}">{{category_ar}}</span></li>""")
+
+# ----------------------------------------------------------------------
+# قوائم المحتوى (تُدرج بين علامتي site_listings في الصفحات المكتوبة يدوياً)
+# ----------------------------------------------------------------------
+
+TERM_CARD = Template("""
+                <div class="col-md-6" data-category="{{category}}">
+                    <div class="card border-0 shadow-sm h-100 term-card">
+                        <div class="card-body">
+                            <span class="badge bg-{{color}} mb-3">{{category_ar}}</span>
+                            <h5 class="fw-bold">{{title}}</h5>
+                            <p class="text-muted">{{text}}</p>
+                            <a href="{{url}}" class="btn btn-outline-{{color}} btn-sm">اقرأ المزيد</a>
+                        </div>
+                    </div>
+                </div>
+""")
+
+CATEGORY_TERM_CARD = Template("""
+                <div class="col-md-4 mb-4">
+                    <div class="card h-100">
+                        <div class="card-body">
+                            <h5 class="card-title fw-bold">{{title}}</h5>
+                            <span class="badge bg-{{color}} mb-2">{{category_ar}}</span>
+                            <p class="card-text">{{text}}</p>
+                            <a href="{{url}}" class="btn btn-outline-{{color}}">اقرأ المزيد</a>
+                        </div>
+                    </div>
+                </div>
+""")
+
+ARTICLE_CARD = Template("""
+                <div class="col-md-4" data-category="{{category}}">
+                    <div class="card border-0 shadow-sm h-100 article-card">
+                        <div class="card-body">
+                            <span class="badge bg-{{color}} mb-3">{{category_ar}}</span>
+                            <h5 class="fw-bold">{{title}}</h5>
+                            <p class="text-muted">{{text}}</p>
+                            <div class="d-flex justify-content-between align-items-center mt-3">
+                                <small class="text-muted"><i class="fas fa-clock me-1"></i>{{reading_time}}</small>
+                                <a href="{{url}}" class="btn btn-outline-primary btn-sm">اقرأ المزيد</a>
+                            </div>
+                        </div>
+                    </div>
+                </div>
+""")
+
+EMPTY_LISTING = Template("""
+                <div class="col-12">
+                    <p class="text-muted text-center">{{message}}</p>
+                </div>
+""")
+
+TERMS_GRID = Template("""
+            <div class="row g-4" id="termsGrid">{{cards}}            </div>
+{{pagination}}            """)
+
+CATEGORY_GRID = Template("""
+            <div class="row">{{cards}}            </div>
+{{pagination}}            """)
+
+ARTICLES_GRID = Template("""
+            <div class="row g-4" id="articlesGrid">{{cards}}            </div>
+{{pagination}}            """)
+
+PAGINATION = Template("""            <nav aria-label="التنقل بين الصفحات" class="mt-4">
+                <ul class="pagination justify-content-center">
+                    {{previous}}
+                    <li class="page-item active" aria-current="page"><span class="page-link">{{number}}</span></li>
+                    {{next}}
+                </ul>
+            </nav>
+""")
+
+PAGE_LINK = Template("""<li class="page-item"><a class="page-link" href="{{href}}">{{label}}</a></li>""")
+PAGE_LINK_DISABLED = Template("""<li class="page-item disabled"><span class="page-link">{{label}}</span></li>""")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+أدوات مشتركة للاختبارات: موقع مؤقت بالصفحات المكتوبة يدوياً وسجلات صغيرة
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# الصفحات والملفات المكتوبة يدوياً التي يحتاجها البناء والنشر
+SITE_FILES = ('*.html', 'styles.css', 'script.js', 'search.js', 'forms.js')
+
+
+def make_site(base_dir):
+    """نسخ الصفحات المكتوبة يدوياً إلى base_dir"""
+    base_dir = Path(base_dir)
+    for pattern in SITE_FILES:
+        for path in ROOT.glob(pattern):
+            shutil.copy(path, base_dir / path.name)
+    (base_dir / 'data').mkdir(exist_ok=True)
+    manual = ROOT / 'data' / 'search-manual.json'
+    if manual.exists():
+        shutil.copy(manual, base_dir / 'data' / manual.name)
+    (base_dir / 'images').mkdir(exist_ok=True)
+    return base_dir
+
+
+class SiteTestCase:
+    """خليط unittest: self.base_dir موقع مؤقت يُحذف بعد الاختبار"""
+    
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base_dir = make_site(tmp.name)
+
+
+def term(slug, title, definition='تعريف', category='physics', **fields):
+    return {'slug': slug, 'title_ar': title, 'category': category, 'definition': definition,
+            'explanation': 'شرح', 'date': '2025-01-01', **fields}
+
+
+def article(slug, title, intro='مقدمة', category='energy', **fields):
+    return {'slug': slug, 'title': title, 'category': category, 'intro': intro,
+            'date': '2025-01-01', **fields}
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار أوامر add_content: rebuild --force --no-publish، والتحقق دون كتابة في data/
+
+    python3 -m pytest tests/
+"""
+
+import unittest
+
+from helpers import SiteTestCase, term
+
+from add_content import parse_args, run
+from content_manager import ContentManager
+
+
+class RebuildCommandTest(SiteTestCase, unittest.TestCase):
+    def test_force_respects_no_publish(self):
+        ContentManager(self.base_dir).add_term(term('gravity', 'الجاذبية'))
+        args = parse_args(['rebuild', '--force', '--no-publish', '--workers', '1', '--base-dir', str(self.base_dir)])
+        self.assertEqual(run(args), 0)
+        self.assertTrue((self.base_dir / 'term-الجاذبية.html').exists())
+        self.assertFalse((self.base_dir / 'dist').exists())
+
+
+class ValidateRecordsTest(SiteTestCase, unittest.TestCase):
+    def test_validate_writes_nothing(self):
+        manager = ContentManager(self.base_dir)
+        slug_index = self.base_dir / 'data' / 'slug-index.json'
+        slug_index.unlink(missing_ok=True)
+        rows = [(1, term('x', 'الكتلة')), (2, term('x', 'الكتلة'))]
+        errors = list(manager.validate_records('terms', rows))
+        self.assertEqual([number for number, _ in errors], [2])
+        self.assertFalse(slug_index.exists())
+    
+    def test_validate_leaves_index_untouched(self):
+        manager = ContentManager(self.base_dir)
+        manager.add_term(term('gravity', 'الجاذبية'))
+        rows = [(1, term('x', 'الكتلة'))]
+        self.assertEqual(list(manager.validate_records('terms', rows)), [])
+        # العناوين المسجلة أثناء التحقق لا تبقى في الفهرس المحمل
+        self.assertEqual(list(manager.validate_records('terms', rows)), [])
+        manager.add_term(term('x', 'الكتلة'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار تخزين SQLite: استيراد data/*.json مرة واحدة فقط
+
+    python3 -m pytest tests/
+"""
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from helpers import term
+
+from content_manager import CATEGORIES
+from content_storage import SqliteStorage
+
+
+class SqliteImportTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+        records = [term('gravity', 'الجاذبية'), term('heat', 'الحرارة')]
+        (self.data_dir / 'terms.json').write_text(json.dumps(records, ensure_ascii=False), encoding='utf-8')
+    
+    def open(self):
+        storage = SqliteStorage(self.data_dir, CATEGORIES)
+        self.addCleanup(storage.close)
+        return storage
+    
+    def test_import_once(self):
+        storage = self.open()
+        self.assertEqual(storage.count('terms'), 2)
+        self.assertEqual(storage.count('articles'), 0)
+        for slug in ('gravity', 'heat'):
+            storage.remove('terms', slug)
+        
+        # القاعدة الفارغة بعد الحذف لا تُملأ من JSON مرة أخرى
+        self.assertEqual(self.open().count('terms'), 0)
+    
+    def test_existing_database_is_not_reimported(self):
+        # قاعدة من إصدار سابق: فيها محتوى دون علامة الاستيراد
+        self.open()
+        conn = sqlite3.connect(self.data_dir / 'diwan.sqlite3')
+        conn.execute("PRAGMA user_version = 0")
+        conn.close()
+        self.assertEqual(self.open().count('terms'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار مزامنة المحتوى مع قاعدة SQLite (إضافة، حذف، مزامنة كاملة وتدريجية)
+
+    python3 -m pytest tests/
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from content_manager import CATEGORIES
+from content_sync import sync_content
+
+
+def term(slug, title, definition='تعريف'):
+    return {'slug': slug, 'title_ar': title, 'category': 'physics', 'definition': definition,
+            'explanation': 'شرح', 'date': '2025-01-01'}
+
+
+class SqliteSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        base = Path(self.tmp.name)
+        self.db = base / 'sync.db'
+        self.target = f"sqlite:///{self.db}"
+        self.state = base / 'sync-state.json'
+        self.records = {'terms': [term('gravity', 'الجاذبية'), term('heat', 'الحرارة')], 'articles': []}
+    
+    def sync(self, full=False):
+        return sync_content(lambda kind: self.records[kind], self.target, CATEGORIES, self.state, full=full)
+    
+    def active(self):
+        conn = sqlite3.connect(self.db)
+        try:
+            return dict(conn.execute("SELECT slug, is_active FROM published_content").fetchall())
+        finally:
+            conn.close()
+    
+    def test_add_and_incremental(self):
+        report = self.sync()
+        self.assertEqual((report['sent'], report['deactivated']), (2, 0))
+        self.assertEqual(self.active(), {'term-gravity': 1, 'term-heat': 1})
+        
+        self.assertEqual(self.sync()['sent'], 0)
+        self.records['terms'][0] = term('gravity', 'الجاذبية', 'تعريف جديد')
+        self.records['terms'].append(term('atom', 'الذرة'))
+        report = self.sync()
+        self.assertEqual((report['sent'], report['unchanged']), (2, 1))
+        self.assertEqual(len(self.active()), 3)
+    
+    def test_delete_incremental(self):
+        self.sync()
+        del self.records['terms'][1]
+        report = self.sync()
+        self.assertEqual((report['sent'], report['deactivated']), (0, 1))
+        self.assertEqual(self.active(), {'term-gravity': 1, 'term-heat': 0})
+    
+    def test_full_sync_deactivates_and_keeps_state(self):
+        self.sync()
+        del self.records['terms'][1]
+        report = self.sync(full=True)
+        self.assertEqual((report['sent'], report['deactivated']), (1, 1))
+        self.assertEqual(self.active(), {'term-gravity': 1, 'term-heat': 0})
+        
+        # حذف بعد مزامنة كاملة يُعطَّل في المزامنة التدريجية التالية
+        del self.records['terms'][0]
+        report = self.sync()
+        self.assertEqual((report['sent'], report['deactivated']), (0, 1))
+        self.assertEqual(self.active(), {'term-gravity': 0, 'term-heat': 0})
+    
+    def test_readd_reactivates(self):
+        self.sync()
+        removed = self.records['terms'].pop()
+        self.sync()
+        self.records['terms'].append(removed)
+        self.assertEqual(self.sync()['sent'], 1)
+        self.assertEqual(self.active()['term-heat'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار مراقبة خادم التطوير: تجاهل ما يكتبه البناء نفسه، وتسجيل فشل البناء
+
+    python3 -m pytest tests/
+"""
+
+import unittest
+
+from helpers import SiteTestCase
+
+from dev_server import LiveReload, Watcher, _relevant, _safe_build
+
+
+class RelevantTest(SiteTestCase, unittest.TestCase):
+    def relevant(self, relative):
+        return _relevant(self.base_dir.resolve(), self.base_dir / relative)
+    
+    def test_build_outputs_are_ignored(self):
+        for relative in ('term-الجاذبية.html', 'article-x.html', 'category-physics-2.html', 'terms-list.html',
+                         'articles-3.html', 'search-data.json', 'sitemap-2.xml', 'feed.xml', 'dist/index.html',
+                         'data/build-manifest.json', 'data/image-manifest.json', 'data/related.json'):
+            self.assertFalse(self.relevant(relative), relative)
+    
+    def test_sources_are_watched(self):
+        for relative in ('index.html', 'about.html', 'styles.css', 'search.js', 'data/terms.json',
+                         'images/a.jpg', 'site_templates.py'):
+            self.assertTrue(self.relevant(relative), relative)
+
+
+class WatcherTest(SiteTestCase, unittest.TestCase):
+    def test_patched_page_event_after_build_is_ignored(self):
+        watcher = Watcher(self.base_dir)
+        watcher.mode = 'watchdog'
+        index = watcher.base_dir / 'index.html'
+        watcher.resync()
+        # حدث متأخر لكتابة البناء: الملف لم يتغير منذ resync
+        watcher.notify(index)
+        self.assertEqual(watcher.drain(), set())
+        
+        with open(index, 'a', encoding='utf-8') as f:
+            f.write('\n<!-- تعديل يدوي -->\n')
+        watcher.notify(index)
+        self.assertEqual(watcher.drain(), {'index.html'})
+
+
+class SafeBuildTest(unittest.TestCase):
+    def test_failure_is_logged_and_sent(self):
+        livereload = LiveReload()
+        
+        def broken():
+            raise ValueError('سجل غير صالح')
+        
+        with self.assertLogs('dev_server', level='ERROR') as logs:
+            self.assertEqual(_safe_build(livereload, 'data/terms.json', broken), (False, None))
+        self.assertIn('سجل غير صالح', logs.output[0])
+        self.assertIn('سجل غير صالح', livereload.error)
+
+
+if __name__ == '__main__':
+    unittest.main()
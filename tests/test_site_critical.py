@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار CSS الحرج والأوراق المقلصة: بدون صفحات، صفحة واحدة، والثبات بين البناءات
+
+    python3 -m pytest tests/
+"""
+
+import json
+import shutil
+import unittest
+
+from helpers import SiteTestCase
+
+from site_critical import page_styles, sheet_name
+from site_fingerprint import ASSET_MANIFEST
+from site_minify import DIST_DIR, publish
+
+
+class PageStylesTest(SiteTestCase, unittest.TestCase):
+    def read(self, name):
+        return (self.base_dir / name).read_text(encoding='utf-8')
+    
+    def test_no_pages(self):
+        self.assertEqual(page_styles(self.base_dir, {}), {})
+    
+    def test_single_page(self):
+        styles = page_styles(self.base_dir, {'term-atom.html': self.read('term-atom.html')})
+        self.assertEqual(set(styles), {'term'})
+        style = styles['term']
+        self.assertEqual((style['href'], style['replaces']), (sheet_name('term'), ['styles.css']))
+        self.assertIn('.term-section{', style['css'])
+        self.assertNotIn('.hero-section', style['css'])
+        self.assertIn('.navbar', style['critical'])
+        self.assertLessEqual(set(style['fold_selectors']), set(style['selectors']))
+    
+    def test_selectors_only_grow(self):
+        pages = {'term-atom.html': self.read('term-atom.html')}
+        first = page_styles(self.base_dir, pages)['term']
+        hero = {'term-hero.html': pages['term-atom.html'].replace('<body>', '<body><div class="hero-section"></div>')}
+        grown = page_styles(self.base_dir, hero, previous={'term': first})['term']
+        self.assertIn('.hero-section', grown['css'])
+        
+        # الصفحة التي لم تعد تستخدم الصنف لا تحذفه من الورقة
+        again = page_styles(self.base_dir, pages, previous={'term': grown})['term']
+        self.assertEqual(again['css'], grown['css'])
+        
+        # تغير styles.css يعيد حساب المحددات من الصفحات المعطاة فقط
+        with open(self.base_dir / 'styles.css', 'a', encoding='utf-8') as f:
+            f.write('\n.unused-rule { color: red; }\n')
+        fresh = page_styles(self.base_dir, pages, previous={'term': grown})['term']
+        self.assertNotIn('.hero-section', fresh['css'])
+        self.assertNotEqual(fresh['basis'], grown['basis'])
+
+
+class PublishStylesTest(SiteTestCase, unittest.TestCase):
+    def sheet(self):
+        assets = json.loads((self.base_dir / DIST_DIR / ASSET_MANIFEST).read_text(encoding='utf-8'))
+        return assets[sheet_name('term')]
+    
+    def test_new_page_keeps_type_sheet(self):
+        manifest, _ = publish(self.base_dir, {})
+        sheet = self.sheet()
+        self.assertTrue((self.base_dir / DIST_DIR / sheet).exists())
+        
+        shutil.copy(self.base_dir / 'term-atom.html', self.base_dir / 'term-copy.html')
+        manifest, written = publish(self.base_dir, manifest)
+        self.assertEqual(self.sheet(), sheet)
+        self.assertEqual([name for name in written if name.endswith('.html')], ['term-copy.html'])
+        
+        self.assertEqual(publish(self.base_dir, manifest)[1], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
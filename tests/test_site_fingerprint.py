@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار الأسماء ذات البصمة: المراجع لكل صفحة، و search-data.json عبر asset-manifest.json
+
+    python3 -m pytest tests/
+"""
+
+import json
+import unittest
+
+from helpers import SiteTestCase
+
+from site_fingerprint import ASSET_MANIFEST, HEADERS_FILE, SHORT_LIVED, asset_references, rewrite_assets
+from site_minify import DIST_DIR, publish
+
+
+class ReferencesTest(unittest.TestCase):
+    def test_references(self):
+        html = '<link href="./styles.css?v=2"><script src="script.js"></script><a href="term-x.html">'
+        self.assertEqual(asset_references(html), ['script.js', 'styles.css'])
+        self.assertEqual(asset_references('<p>لا مراجع</p>'), [])
+        self.assertEqual(asset_references("fetch('search-data.json')", runtime=True), [])
+    
+    def test_rewrite_only_exact_names(self):
+        text = '<script src="search.js"></script><script src="advanced-search.js"></script>'
+        self.assertEqual(rewrite_assets(text, {'search.js': 'search.1.js'}),
+                         '<script src="search.1.js"></script><script src="advanced-search.js"></script>')
+
+
+class PublishAssetsTest(SiteTestCase, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_search_data([])
+    
+    def write_search_data(self, terms):
+        data = {'terms': terms, 'articles': []}
+        (self.base_dir / 'search-data.json').write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    
+    def assets(self):
+        return json.loads((self.base_dir / DIST_DIR / ASSET_MANIFEST).read_text(encoding='utf-8'))
+    
+    def test_search_data_update_keeps_pages(self):
+        manifest, _ = publish(self.base_dir, {})
+        before = self.assets()
+        search = (self.base_dir / DIST_DIR / before['search.js']).read_text(encoding='utf-8')
+        self.assertIn("'search-data.json'", search)
+        self.assertIn(ASSET_MANIFEST, search)
+        
+        self.write_search_data([{'title': 'الجاذبية'}])
+        manifest, written = publish(self.base_dir, manifest)
+        self.assertEqual(written, ['search-data.json'])
+        after = self.assets()
+        self.assertNotEqual(after['search-data.json'], before['search-data.json'])
+        self.assertEqual(after['search.js'], before['search.js'])
+        self.assertIn(f'/{ASSET_MANIFEST}\n  Cache-Control: {SHORT_LIVED}',
+                      (self.base_dir / DIST_DIR / HEADERS_FILE).read_text(encoding='utf-8'))
+    
+    def test_script_change_republishes_referencing_pages(self):
+        manifest, _ = publish(self.base_dir, {})
+        self.assertEqual(manifest['term-atom.html']['assets'], sorted(manifest['term-atom.html']['assets']))
+        self.assertNotIn('forms.js', manifest['term-atom.html']['assets'])
+        
+        with open(self.base_dir / 'forms.js', 'a', encoding='utf-8') as f:
+            f.write('\nconsole.log("forms");\n')
+        manifest, written = publish(self.base_dir, manifest)
+        pages = {name for name in written if name.endswith('.html')}
+        self.assertIn('index.html', pages)
+        self.assertNotIn('term-atom.html', pages)
+        page = (self.base_dir / DIST_DIR / 'index.html').read_text(encoding='utf-8')
+        self.assertIn(self.assets()['forms.js'], page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار نسخ الصور: التحويل، التخطي التدريجي، الملفات غير النقطية وصور السجلات فقط
+
+    python3 -m pytest tests/
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from helpers import SiteTestCase, term
+
+from content_manager import ContentManager
+from site_images import VARIANT_WIDTHS, available_formats, is_raster, picture_html, process_images, variant_widths
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow غير مثبت
+    Image = None
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"></svg>'
+
+
+def save_image(path, width=1000, height=500, color=(200, 30, 30)):
+    Image.new('RGB', (width, height), color).save(path)
+
+
+@unittest.skipUnless(available_formats(), "Pillow غير مثبت أو بدون WebP/AVIF")
+class ProcessImagesTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.images = Path(tmp.name)
+    
+    def test_no_images(self):
+        self.assertEqual(process_images(self.images, {}, names=[], prune=True), ({}, 0))
+    
+    def test_variants_and_incremental(self):
+        save_image(self.images / 'wide.jpg')
+        manifest, converted = process_images(self.images, {}, ['wide.jpg'], workers=1)
+        self.assertEqual(converted, 1)
+        entry = manifest['wide.jpg']
+        self.assertEqual((entry['width'], entry['height']), (1000, 500))
+        self.assertEqual(set(entry['variants']), set(available_formats()))
+        for variants in entry['variants'].values():
+            self.assertEqual([width for width, _ in variants], [480, 960, 1000])
+            for _, relative in variants:
+                self.assertTrue((self.images / relative).exists())
+        
+        again, converted = process_images(self.images, manifest, ['wide.jpg'], workers=1)
+        self.assertEqual((again, converted), (manifest, 0))
+        
+        save_image(self.images / 'wide.jpg', color=(0, 0, 200))
+        changed, converted = process_images(self.images, manifest, ['wide.jpg'], workers=1)
+        self.assertEqual(converted, 1)
+        self.assertNotEqual(changed['wide.jpg']['hash'], entry['hash'])
+    
+    def test_svg_named_jpg_is_skipped_quietly(self):
+        (self.images / 'vector.jpg').write_text(SVG, encoding='utf-8')
+        self.assertFalse(is_raster(self.images / 'vector.jpg'))
+        with self.assertNoLogs('site_images', level='WARNING'):
+            manifest, converted = process_images(self.images, {}, ['vector.jpg'], workers=1)
+        self.assertEqual(converted, 0)
+        self.assertTrue(manifest['vector.jpg']['invalid'])
+        self.assertNotIn('<picture>', picture_html('vector.jpg', 'x', manifest['vector.jpg']))
+    
+    def test_prune_unreferenced(self):
+        save_image(self.images / 'a.png', 300, 200)
+        save_image(self.images / 'b.png', 300, 200)
+        manifest, _ = process_images(self.images, {}, ['a.png', 'b.png'], workers=1)
+        pruned, converted = process_images(self.images, manifest, ['a.png'], workers=1, prune=True)
+        self.assertEqual((set(pruned), converted), ({'a.png'}, 0))
+    
+    def test_pool_matches_serial(self):
+        save_image(self.images / 'a.png', 600, 300)
+        serial, _ = process_images(self.images, {}, ['a.png'], workers=1)
+        for path in (self.images / 'variants').iterdir():
+            path.unlink()
+        pooled, _ = process_images(self.images, {}, ['a.png'], workers=2)
+        self.assertEqual(pooled, serial)
+
+
+class VariantWidthsTest(unittest.TestCase):
+    def test_no_upscaling(self):
+        self.assertEqual(variant_widths(300), [300])
+        self.assertEqual(variant_widths(5000), list(VARIANT_WIDTHS))
+
+
+@unittest.skipUnless(available_formats(), "Pillow غير مثبت أو بدون WebP/AVIF")
+class BuildImagesTest(SiteTestCase, unittest.TestCase):
+    def test_only_record_images_are_converted(self):
+        images = self.base_dir / 'images'
+        save_image(images / 'used.jpg', 600, 300)
+        save_image(images / 'unused-old.jpg', 600, 300)
+        manager = ContentManager(self.base_dir)
+        manager.build(publish=False)
+        self.assertFalse((self.base_dir / 'data' / 'image-manifest.json').exists())
+        
+        manager.add_term(term('gravity', 'الجاذبية', image='used.jpg'))
+        manager.build(publish=False)
+        manifest = json.loads((self.base_dir / 'data' / 'image-manifest.json').read_text(encoding='utf-8'))
+        self.assertEqual(set(manifest), {'used.jpg'})
+        self.assertIn('<picture>', (self.base_dir / 'term-الجاذبية.html').read_text(encoding='utf-8'))
+        self.assertEqual(manager.build_images(['used.jpg']), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار مرحلة النشر: التصغير، النسخ المضغوطة، والنشر التدريجي دون فحص الصفحات التي لم تتغير
+
+    python3 -m pytest tests/
+"""
+
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from helpers import SiteTestCase
+
+import site_minify
+from site_minify import DIST_DIR, minify_css, minify_html, minify_js, publish
+
+
+class MinifyTest(unittest.TestCase):
+    def test_html_keeps_arabic_spacing(self):
+        html = '<p>\n  نص عربي‏ <span>أ</span> <a href="#">ب</a>\n</p>\n<pre>  كما   هو </pre>'
+        self.assertEqual(minify_html(html), '<p>نص عربي‏ <span>أ</span> <a href="#">ب</a></p><pre>  كما   هو </pre>')
+    
+    def test_css_and_js(self):
+        self.assertEqual(minify_css("/* x */ a :hover { content: ' • ' ; }"), "a :hover{content:' • '}")
+        self.assertEqual(minify_js("const a = 1; // تعليق\nreturn /a b/g.test(s)"), "const a=1;return /a b/g.test(s)")
+
+
+class PublishTest(SiteTestCase, unittest.TestCase):
+    def test_empty_site(self):
+        with tempfile.TemporaryDirectory() as empty:
+            manifest, written = publish(empty, {})
+            self.assertEqual((manifest, written), ({}, []))
+            self.assertTrue((Path(empty) / DIST_DIR / 'asset-manifest.json').exists())
+    
+    def test_compressed_copies(self):
+        manifest, written = publish(self.base_dir, {})
+        self.assertIn('term-atom.html', written)
+        page = self.base_dir / DIST_DIR / 'term-atom.html'
+        self.assertEqual(gzip.decompress(page.with_name(page.name + '.gz').read_bytes()), page.read_bytes())
+        self.assertEqual(page.with_name(page.name + '.br').exists(), site_minify.brotli is not None)
+        sizes = manifest['term-atom.html']['sizes']
+        self.assertLess(sizes['output'], sizes['source'])
+    
+    def test_only_changed_pages_are_scanned(self):
+        manifest, _ = publish(self.base_dir, {})
+        scanned = []
+        
+        def page_styles(base_dir, pages, *args):
+            scanned.append(sorted(pages))
+            return real(base_dir, pages, *args)
+        
+        real = site_minify.page_styles
+        with mock.patch.object(site_minify, 'page_styles', page_styles):
+            manifest, written = publish(self.base_dir, manifest)
+            self.assertEqual(written, [])
+            
+            page = self.base_dir / 'term-atom.html'
+            page.write_text(page.read_text(encoding='utf-8').replace('الذرة', 'الذرّة'), encoding='utf-8')
+            manifest, written = publish(self.base_dir, manifest)
+        self.assertEqual(scanned, [[], ['term-atom.html']])
+        self.assertEqual(written, ['term-atom.html'])
+        
+        # تغير styles.css يعيد فحص جميع الصفحات
+        with open(self.base_dir / 'styles.css', 'a', encoding='utf-8') as f:
+            f.write('\n.new-rule { color: red; }\n')
+        with mock.patch.object(site_minify, 'page_styles', page_styles):
+            publish(self.base_dir, manifest)
+        self.assertIn('index.html', scanned[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار المحتوى ذي الصلة: سجل واحد، سجلات بلا كلمات مشتركة، والتحديث التدريجي
+
+    python3 -m pytest tests/
+"""
+
+import json
+import unittest
+from unittest import mock
+
+from helpers import SiteTestCase, term
+
+import site_related
+from content_manager import ContentManager
+from site_related import related_content, related_links
+
+
+def rows(*records):
+    return [(f"terms/{record['slug']}", 'terms', record) for record in records]
+
+
+def neighbours(cache, key):
+    return [other for other, _ in cache['records'][key][1]]
+
+
+# مجموعة صغيرة: المصطلحات الثلاثة الأولى تشترك في كلمات، والرابع منفصل
+CORPUS = [
+    term('kinetic', 'الطاقة الحركية', 'طاقة الجسم بسبب حركته وسرعته', keywords=['طاقة', 'حركة']),
+    term('potential', 'الطاقة الكامنة', 'طاقة الجسم بسبب موضعه وارتفاعه', keywords=['طاقة', 'موضع']),
+    term('velocity', 'السرعة المتجهة', 'معدل تغير موضع الجسم مع الزمن', keywords=['حركة', 'زمن']),
+    term('cell', 'الخلية', 'وحدة بناء الكائنات الحية', category='biology', keywords=['أحياء']),
+]
+
+
+class RelatedContentTest(unittest.TestCase):
+    def test_single_record(self):
+        cache, computed = related_content(rows(CORPUS[0]), {})
+        self.assertEqual(computed, 1)
+        self.assertEqual(cache['records']['terms/kinetic'][1], [])
+        self.assertEqual(related_links(cache, 'terms/kinetic'), [])
+    
+    def test_no_shared_words(self):
+        first = term('kinetic', 'الطاقة الحركية', 'حركة الأجسام', explanation='سرعة')
+        second = term('cell', 'الخلية', 'وحدة الكائنات', explanation='نواة', category='biology')
+        cache, _ = related_content(rows(first, second), {})
+        self.assertEqual(neighbours(cache, 'terms/kinetic'), [])
+        self.assertEqual(neighbours(cache, 'terms/cell'), [])
+    
+    def test_neighbours_and_links(self):
+        cache, _ = related_content(rows(*CORPUS), {})
+        self.assertIn('terms/potential', neighbours(cache, 'terms/kinetic'))
+        self.assertNotIn('terms/cell', neighbours(cache, 'terms/kinetic'))
+        self.assertNotIn('terms/kinetic', neighbours(cache, 'terms/kinetic'))
+        link = related_links(cache, 'terms/kinetic')[0]
+        self.assertEqual(set(link), {'url', 'title', 'category'})
+        self.assertTrue(link['url'].startswith('term-'))
+    
+    def test_python_fallback_matches_numpy(self):
+        if site_related.np is None:
+            self.skipTest("numpy غير مثبت")
+        expected, _ = related_content(rows(*CORPUS), {})
+        with mock.patch.object(site_related, 'np', None):
+            fallback, _ = related_content(rows(*CORPUS), {})
+        for key in expected['records']:
+            self.assertEqual(neighbours(fallback, key), neighbours(expected, key))
+    
+    def test_unchanged_corpus_uses_cache(self):
+        cache, _ = related_content(rows(*CORPUS), {})
+        again, computed = related_content(rows(*CORPUS), cache)
+        self.assertEqual(computed, 0)
+        self.assertIs(again, cache)
+    
+    def test_incremental_change_without_shared_words(self):
+        cache, _ = related_content(rows(*CORPUS), {})
+        isolated = term('cell', 'الخلية', 'مصطلح منفصل تماماً', category='biology', explanation='نواة')
+        # بدون حد التغيرات يُحسب السجل المتغير وحده (وليس الجميع)
+        with mock.patch.object(site_related, 'RELATED_DRIFT', 1.0):
+            updated, computed = related_content(rows(*CORPUS[:3], isolated), cache)
+        self.assertLess(computed, len(CORPUS))
+        self.assertEqual(neighbours(updated, 'terms/cell'), [])
+        self.assertEqual(neighbours(updated, 'terms/kinetic'), neighbours(cache, 'terms/kinetic'))
+    
+    def test_drift_forces_full_recompute(self):
+        cache, _ = related_content(rows(*CORPUS), {})
+        edited = term('cell', 'الخلية', 'وحدة الحياة', category='biology')
+        with mock.patch.object(site_related, 'RELATED_DRIFT', 0.0):
+            updated, computed = related_content(rows(*CORPUS[:3], edited), cache)
+        self.assertEqual((computed, updated['drift']), (len(CORPUS), 0))
+    
+    def test_removed_record_leaves_lists(self):
+        cache, _ = related_content(rows(*CORPUS), {})
+        updated, _ = related_content(rows(CORPUS[0], *CORPUS[2:]), cache)
+        self.assertNotIn('terms/potential', updated['records'])
+        for key in updated['records']:
+            self.assertNotIn('terms/potential', neighbours(updated, key))
+    
+    def test_incremental_matches_full_after_edit(self):
+        cache, _ = related_content(rows(*CORPUS), {})
+        edited = term('velocity', 'السرعة المتجهة', 'طاقة حركة الجسم', keywords=['طاقة'])
+        records = rows(*CORPUS[:2], edited, CORPUS[3])
+        incremental, _ = related_content(records, cache)
+        full, _ = related_content(records, {})
+        self.assertEqual(incremental['records'], full['records'])
+
+
+class BuildRelatedTest(SiteTestCase, unittest.TestCase):
+    def test_first_term_then_build(self):
+        # البيانات الافتراضية فارغة: أول مصطلح ثم بناء (كانت KeyError)
+        manager = ContentManager(self.base_dir)
+        manager.add_term(term('طاقة-حركية', 'طاقة حركية'))
+        report = manager.build(publish=False)
+        self.assertGreaterEqual(report['rebuilt'], 1)
+        related = json.loads((self.base_dir / 'data' / 'related.json').read_text(encoding='utf-8'))
+        self.assertEqual(related['records']['terms/طاقة-حركية'][1], [])
+    
+    def test_related_section_and_incremental_build(self):
+        manager = ContentManager(self.base_dir)
+        for record in CORPUS:
+            manager.add_term(dict(record))
+        manager.build(publish=False)
+        page = (self.base_dir / 'term-الطاقة-الحركية.html').read_text(encoding='utf-8')
+        self.assertIn('محتوى ذو صلة', page)
+        self.assertIn('الطاقة الكامنة', page)
+        self.assertEqual(manager.build(publish=False)['rebuilt'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
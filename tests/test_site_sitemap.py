@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار خريطة الموقع التدريجية: بدون روابط، رابط واحد، التقسيم والتحديث التدريجي
+
+    python3 -m pytest tests/
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from helpers import SiteTestCase, term
+
+from content_manager import ContentManager
+from site_sitemap import FEED_FILE, SITE_URL, SITEMAP_FILE, absolute_url, write_feed, write_sitemap
+
+TODAY = '2025-06-01'
+
+
+class WriteSitemapTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base_dir = Path(tmp.name)
+    
+    def read(self, name):
+        return (self.base_dir / name).read_text(encoding='utf-8')
+    
+    def test_no_pages(self):
+        manifest, written = write_sitemap(self.base_dir, {}, {}, TODAY)
+        self.assertEqual((manifest['urls'], written), ({}, 1))
+        self.assertNotIn('<url>', self.read(SITEMAP_FILE))
+        self.assertEqual(write_sitemap(self.base_dir, {}, manifest, TODAY)[1], 0)
+        
+        _, feed_written = write_feed(self.base_dir, [], today=TODAY)
+        self.assertTrue(feed_written)
+        self.assertIn(f'<updated>{TODAY}T00:00:00Z</updated>', self.read(FEED_FILE))
+    
+    def test_single_page(self):
+        manifest, _ = write_sitemap(self.base_dir, {'term-ذرة.html': ('a', '2025-01-01')}, {}, TODAY)
+        self.assertEqual(manifest['urls'], {'term-ذرة.html': ['a', '2025-01-01', 0]})
+        sitemap = self.read(SITEMAP_FILE)
+        self.assertIn('<lastmod>2025-01-01</lastmod>', sitemap)
+        self.assertIn(absolute_url(SITE_URL, 'term-ذرة.html'), sitemap)
+    
+    def test_incremental_shards(self):
+        pages = {'a.html': ('1', '2025-01-01'), 'b.html': ('1', '2025-01-02'), 'c.html': ('1', '2025-01-03')}
+        manifest, written = write_sitemap(self.base_dir, pages, {}, TODAY, max_urls=2)
+        self.assertEqual(written, 3)
+        self.assertIn('sitemap-2.xml', self.read(SITEMAP_FILE))
+        first = self.read('sitemap-1.xml')
+        
+        manifest, written = write_sitemap(self.base_dir, pages, manifest, TODAY, max_urls=2)
+        self.assertEqual(written, 0)
+        
+        # تغير رابط في الجزء الثاني يعيد كتابته مع الفهرس فقط
+        pages['c.html'] = ('2', '2025-01-03')
+        manifest, written = write_sitemap(self.base_dir, pages, manifest, TODAY, max_urls=2)
+        self.assertEqual(written, 2)
+        self.assertEqual(manifest['urls']['c.html'][1], TODAY)
+        self.assertEqual(self.read('sitemap-1.xml'), first)
+        
+        # عودة إلى ملف واحد تحذف الأجزاء
+        del pages['c.html']
+        manifest, written = write_sitemap(self.base_dir, pages, manifest, TODAY, max_urls=2)
+        self.assertFalse((self.base_dir / 'sitemap-1.xml').exists())
+        self.assertFalse((self.base_dir / 'sitemap-2.xml').exists())
+        self.assertIn('<urlset', self.read(SITEMAP_FILE))
+
+
+class BuildSitemapTest(SiteTestCase, unittest.TestCase):
+    def test_first_term_then_incremental(self):
+        manager = ContentManager(self.base_dir)
+        manager.add_term(term('gravity', 'الجاذبية', date='2025-03-01'))
+        manager.build(publish=False)
+        sitemap = (self.base_dir / SITEMAP_FILE).read_text(encoding='utf-8')
+        record = manager.storage.load('terms')[0]
+        self.assertIn(absolute_url(manager.site_url, record['filename']), sitemap)
+        self.assertEqual(manager.build_sitemap(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()